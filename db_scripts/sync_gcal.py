@@ -415,6 +415,7 @@ def sync_company(company_id: int, db, dry_run: bool = False,
         )
         stats['pull_skipped'] += pull_skipped_filter
 
+        new_bookings = []
         for rec in records:
             gcal_id = rec['gcal_id']
             print(f"      IMPORT  \"{rec['service_type']}\" → customer=\"{rec['customer_name']}\"  "
@@ -432,29 +433,32 @@ def sync_company(company_id: int, db, dry_run: bool = False,
                         name=rec['customer_name'], phone=rec['phone'] or None,
                         email=rec['import_email'], company_id=company_id
                     )
-                    booking_id = db.add_booking(
-                        client_id=client_id, calendar_event_id=gcal_id,
-                        appointment_time=rec['start_dt'].strftime('%Y-%m-%d %H:%M:%S'),
-                        service_type=rec['service_type'],
-                        phone_number=rec['phone'] or None,
-                        email=rec['import_email'] if not rec['phone'] else None,
-                        company_id=company_id, duration_minutes=rec['duration'],
-                        address=rec['address'] or None
-                    )
-                    if booking_id:
-                        known_gcal_ids.add(gcal_id)
-                        stats['pull_imported'] += 1
-                    else:
-                        stats['pull_skipped'] += 1
+                    new_bookings.append({
+                        'client_id': client_id, 'calendar_event_id': gcal_id,
+                        'appointment_time': rec['start_dt'].strftime('%Y-%m-%d %H:%M:%S'),
+                        'service_type': rec['service_type'],
+                        'phone_number': rec['phone'] or None,
+                        'email': rec['import_email'] if not rec['phone'] else None,
+                        'duration_minutes': rec['duration'],
+                        'address': rec['address'] or None,
+                    })
                 except Exception as e:
-                    if 'UniqueViolation' in type(e).__name__ or 'unique constraint' in str(e).lower():
-                        stats['pull_skipped'] += 1
-                    else:
-                        print(f"      ERROR: {e}")
-                        stats['pull_errors'] += 1
+                    print(f"      ERROR: {e}")
+                    stats['pull_errors'] += 1
             else:
                 stats['pull_imported'] += 1
 
+        # Insert the whole import in one transaction; rows whose event id
+        # already exists are skipped by the insert itself, and rows that
+        # fail come back with a None booking id
+        if new_bookings:
+            imported = db.add_bookings_bulk(new_bookings, company_id=company_id)
+            failed = [gcal_id for gcal_id, booking_id in imported.items() if booking_id is None]
+            known_gcal_ids.update(gcal_id for gcal_id, booking_id in imported.items() if booking_id)
+            stats['pull_imported'] += len(imported) - len(failed)
+            stats['pull_errors'] += len(failed)
+            stats['pull_skipped'] += len(new_bookings) - len(imported)
+
     return stats
 
 
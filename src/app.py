@@ -2178,8 +2178,16 @@ def employee_dashboard():
     if not employee:
         return jsonify({"error": "Employee not found"}), 404
 
+    # Primary, not the replica: the dashboard refetches straight after the
+    # employee updates a job and must show that change
     jobs = db.get_employee_jobs(employee_id, include_completed=True, company_id=company_id)
-    schedule = db.get_employee_schedule(employee_id)
+    # The schedule is the non-cancelled jobs (same order, fewer fields) - cut
+    # from the list above rather than a second bookings/clients join. NULL
+    # status is left out too, as get_employee_schedule's status != 'cancelled'
+    # does in SQL
+    schedule_fields = ('id', 'appointment_time', 'client_name', 'service_type', 'status',
+                       'address', 'duration_minutes', 'charge', 'eircode', 'phone_number')
+    schedule = [{k: job.get(k) for k in schedule_fields} for job in jobs if job.get('status') not in (None, 'cancelled')]
 
     return jsonify({
         "success": True,
@@ -7433,9 +7441,12 @@ def bookings_api():
             if conflicting_bookings and requested_employee_ids:
                 # Employees are assigned — only block if one of THOSE employees is on a conflicting booking
                 employee_conflict = None
+                assigned_by_booking = db.get_job_employees_bulk(
+                    [cb['id'] for cb in conflicting_bookings], company_id=company_id
+                )
                 for wid in requested_employee_ids:
                     for cb in conflicting_bookings:
-                        assigned = db.get_job_employees(cb['id'])
+                        assigned = assigned_by_booking.get(cb['id'], [])
                         if any(w['id'] == wid for w in assigned):
                             employee_conflict = (wid, cb)
                             break
@@ -7585,15 +7596,21 @@ def bookings_api():
             
             # Assign employee(s) — reuse the employee_ids parsed earlier for conflict checking
             assigned_employee_ids_for_notif = []
+            valid_employee_ids = []
             for wid in requested_employee_ids:
                 try:
-                    employee = db.get_employee(wid, company_id=company_id)
-                    if employee:
-                        db.assign_employee_to_job(booking_id, wid)
-                        assigned_employee_ids_for_notif.append(wid)
-                        print(f"[INFO] Employee {wid} assigned to booking {booking_id}")
+                    if db.get_employee(wid, company_id=company_id):
+                        valid_employee_ids.append(wid)
                 except Exception as e:
                     print(f"[WARNING] Could not assign employee {wid}: {e}")
+            if valid_employee_ids:
+                # One insert + commit for all of them
+                assignment = db.assign_employees_bulk([(booking_id, wid) for wid in valid_employee_ids])
+                if assignment.get('success'):
+                    assigned_employee_ids_for_notif.extend(valid_employee_ids)
+                    print(f"[INFO] Employees {valid_employee_ids} assigned to booking {booking_id}")
+                else:
+                    print(f"[WARNING] Could not assign employees {valid_employee_ids}: {assignment.get('error')}")
             
             # Auto-assign an available employee if requested (from "Any available employee" mode)
             if data.get('auto_assign_employee') and not requested_employee_ids:
@@ -9957,6 +9974,7 @@ def convert_lead_to_client(lead_id):
             WHERE id = %s AND company_id = %s
         """, (existing_client_id, lead_id, company_id))
         conn.commit()
+        db.invalidate_client_cache(existing_client_id)
         return jsonify({"client_id": existing_client_id, "message": "Lead converted to customer"})
     except Exception as e:
         conn.rollback()
@@ -9987,6 +10005,7 @@ def update_client_tags(client_id):
             (tags, client_id, company_id)
         )
         conn.commit()
+        db.invalidate_client_cache(client_id)
         return jsonify({"message": "Tags updated"})
     except Exception as e:
         conn.rollback()
@@ -11823,6 +11842,7 @@ def employee_work_schedule_api(employee_id):
             conn.commit()
         finally:
             db.return_connection(conn)
+        db.invalidate_employee_cache(employee_id)
         return jsonify({"success": True, "work_schedule": work_schedule, "weekly_hours_expected": total_hours})
 
 
@@ -14446,6 +14466,7 @@ def google_calendar_callback():
                     records, _skip_count = process_gcal_pull_events(
                         gcal_events, known_gcal_ids, int(company_id), db
                     )
+                    new_bookings = []
                     for rec in records:
                         try:
                             existing = db.get_booking_by_calendar_event_id(rec['gcal_id'])
@@ -14456,20 +14477,22 @@ def google_calendar_callback():
                                 name=rec['customer_name'], phone=rec['phone'] or None,
                                 email=rec['import_email'], company_id=int(company_id)
                             )
-                            booking_id = db.add_booking(
-                                client_id=client_id, calendar_event_id=rec['gcal_id'],
-                                appointment_time=rec['start_dt'].strftime('%Y-%m-%d %H:%M:%S'),
-                                service_type=rec['service_type'],
-                                phone_number=rec['phone'] or None,
-                                email=rec['import_email'] if not rec['phone'] else None,
-                                company_id=int(company_id), duration_minutes=rec['duration'],
-                                address=rec['address'] or None
-                            )
-                            if booking_id:
-                                known_gcal_ids.add(rec['gcal_id'])
-                                pull_imported += 1
+                            new_bookings.append({
+                                'client_id': client_id, 'calendar_event_id': rec['gcal_id'],
+                                'appointment_time': rec['start_dt'].strftime('%Y-%m-%d %H:%M:%S'),
+                                'service_type': rec['service_type'],
+                                'phone_number': rec['phone'] or None,
+                                'email': rec['import_email'] if not rec['phone'] else None,
+                                'duration_minutes': rec['duration'],
+                                'address': rec['address'] or None,
+                            })
                         except Exception:
                             pass
+                    # One transaction for the whole import
+                    imported = db.add_bookings_bulk(new_bookings, company_id=int(company_id))
+                    imported = [gcal_id for gcal_id, booking_id in imported.items() if booking_id]
+                    known_gcal_ids.update(imported)
+                    pull_imported += len(imported)
                 except Exception:
                     pass
 
@@ -14567,6 +14590,9 @@ def google_calendar_sync():
     company = db.get_company(company_id)
     invite_employees = company.get('gcal_invite_employees', False) if company else False
 
+    # Assigned employees for every booking in one query, not one per booking
+    employees_by_booking = db.get_job_employees_bulk([b.get('id') for b in all_bookings], company_id=company_id)
+
     for booking in all_bookings:
         existing_event_id = booking.get('calendar_event_id', '')
         has_real_gcal = existing_event_id and not str(existing_event_id).startswith('db_')
@@ -14620,7 +14646,7 @@ def google_calendar_sync():
 
         # Build employee info for description and attendees
         bid = booking.get('id')
-        job_employees = db.get_job_employees(bid, company_id=company_id) if bid else []
+        job_employees = employees_by_booking.get(bid, []) if bid else []
         employee_lines = ''
         if job_employees:
             employee_names = [f"{w['name']}{' (' + w['trade_specialty'] + ')' if w.get('trade_specialty') else ''}" for w in job_employees]
@@ -14756,12 +14782,10 @@ def google_calendar_sync():
     jobs_without_employees = 0
     try:
         all_bookings_check = db.get_all_bookings(company_id=company_id)
-        for b in all_bookings_check:
-            if b.get('status') in ('completed', 'paid', 'cancelled'):
-                continue
-            employees = db.get_job_employees(b['id'], company_id=company_id)
-            if not employees:
-                jobs_without_employees += 1
+        active_ids = [b['id'] for b in all_bookings_check
+                      if b.get('status') not in ('completed', 'paid', 'cancelled')]
+        employees_by_booking = db.get_job_employees_bulk(active_ids, company_id=company_id)
+        jobs_without_employees = sum(1 for employees in employees_by_booking.values() if not employees)
     except Exception:
         pass
 
@@ -770,7 +770,7 @@ async def media_handler(ws):
                 try:
                     from src.services.database import get_database
                     _db = get_database()
-                    _company = _db.get_company(int(company_id))
+                    _company = await asyncio.to_thread(_db.get_company, int(company_id))
                     if _company and _company.get('company_name'):
                         biz_name = _company['company_name']
                     # Set industry type on call state for tool execution
@@ -863,7 +863,9 @@ async def media_handler(ws):
                     try:
                         from src.services.database import get_database
                         _lookup_db = get_database()
-                        _existing_client = _lookup_db.find_client_by_phone(caller_phone, company_id=int(company_id))
+                        # DB calls run off the event loop so other live calls keep streaming
+                        _existing_client = await asyncio.to_thread(
+                            _lookup_db.find_client_by_phone, caller_phone, company_id=int(company_id))
                         if _existing_client:
                             caller_is_returning = True
                             caller_customer_name = _existing_client.get('name', '')
@@ -878,7 +880,8 @@ async def media_handler(ws):
                             # Also get last address from bookings if not on client record
                             if not caller_customer_info.get('address') and not caller_customer_info.get('eircode'):
                                 try:
-                                    _bookings = _lookup_db.get_client_bookings(_existing_client['id'], company_id=int(company_id))
+                                    _bookings = await asyncio.to_thread(
+                                        _lookup_db.get_client_bookings, _existing_client['id'], company_id=int(company_id))
                                     if _bookings:
                                         for _b in _bookings:
                                             if _b.get('address') or _b.get('eircode'):
@@ -898,7 +901,7 @@ async def media_handler(ws):
                         from src.services.database import get_database
                         from src.utils.industry_config import get_address_capture_config
                         _ind_db = get_database()
-                        _ind_company = _ind_db.get_company(int(company_id))
+                        _ind_company = await asyncio.to_thread(_ind_db.get_company, int(company_id))
                         if _ind_company:
                             call_state.industry_type = _ind_company.get('industry_type', 'trades')
                         _addr_cfg = get_address_capture_config(call_state.industry_type)
@@ -1807,7 +1810,7 @@ async def media_handler(ws):
                     if recording_url and call_log_id:
                         from src.services.database import get_database
                         db = get_database()
-                        db.update_call_log(call_log_id, recording_url=recording_url)
+                        await asyncio.to_thread(db.update_call_log, call_log_id, recording_url=recording_url)
                         print(f"🎙️ [RECORDING] ✅ Saved ({audio_duration:.1f}s): {recording_url}")
                     elif recording_url:
                         print(f"🎙️ [RECORDING] ✅ Uploaded but no call_log_id to attach to")
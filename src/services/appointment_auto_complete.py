@@ -26,16 +26,18 @@ def auto_complete_overdue_appointments() -> int:
     print(f"[AUTO-COMPLETE] Checking for overdue appointments...")
     print(f"[AUTO-COMPLETE] Cutoff time: {cutoff_str}")
     
-    conn = db.get_connection()
+    conn = db.get_connection(autocommit=True)
     cursor = conn.cursor()
     
     try:
+        # has_notes comes back with each booking rather than a notes query per booking
         query = """
-            SELECT id, client_id, company_id, appointment_time, service_type 
-            FROM bookings 
-            WHERE status != %s 
-            AND appointment_time < %s
-            ORDER BY appointment_time ASC
+            SELECT b.id, b.client_id, b.company_id, b.appointment_time, b.service_type,
+                   EXISTS (SELECT 1 FROM appointment_notes an WHERE an.booking_id = b.id) AS has_notes
+            FROM bookings b
+            WHERE b.status != %s 
+            AND b.appointment_time < %s
+            ORDER BY b.appointment_time ASC
         """
         
         cursor.execute(query, ('completed', cutoff_str))
@@ -54,15 +56,12 @@ def auto_complete_overdue_appointments() -> int:
     completed_count = 0
     
     for booking in overdue_bookings:
-        booking_id, client_id, booking_company_id, appt_time, service_type = booking
+        booking_id, client_id, booking_company_id, appt_time, service_type, has_notes = booking
         
         try:
             print(f"\n  [BOOKING] Booking {booking_id}: {appt_time} ({service_type or 'General'})")
             
-            # Check if appointment has notes
-            notes = db.get_appointment_notes(booking_id)
-            
-            if not notes or len(notes) == 0:
+            if not has_notes:
                 print(f"  [WARNING] Skipping (no notes) - adding auto-note")
                 # Add a system note indicating it was auto-completed
                 db.add_appointment_note(
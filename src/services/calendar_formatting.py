@@ -12,7 +12,7 @@ import re
 logger = logging.getLogger(__name__)
 
 
-def fuzzy_match_name(spoken_name: str, candidate_names: list) -> tuple:
+def fuzzy_match_name(spoken_name: str, candidate_names: list, stop_at: int = None) -> tuple:
     """
     Fuzzy match a spoken name against a list of candidate names.
     Handles common speech-to-text variations and partial matches.
@@ -20,6 +20,8 @@ def fuzzy_match_name(spoken_name: str, candidate_names: list) -> tuple:
     Args:
         spoken_name: The name the caller said (may be partial or have STT errors)
         candidate_names: List of actual customer names from bookings
+        stop_at: Optional confidence at which to stop scanning and accept the
+            best match so far (exact matches always return immediately)
         
     Returns:
         Tuple of (best_match_name, confidence_score 0-100, matched_booking_index)
@@ -41,7 +43,16 @@ def fuzzy_match_name(spoken_name: str, candidate_names: list) -> tuple:
     
     spoken_parts = spoken_lower.split()
     
+    if stop_at is not None:
+        # Stopping early could settle on a first+last name hit (95) that
+        # comes before an exact match, so look for the exact match first
+        for idx, candidate in enumerate(candidate_names):
+            if candidate and strip_accents(candidate.lower().strip()) == spoken_lower:
+                return (candidate, 100, idx)
+    
     for idx, candidate in enumerate(candidate_names):
+        if stop_at is not None and best_score >= stop_at:
+            break
         if not candidate:
             continue
         candidate_lower = strip_accents(candidate.lower().strip())
@@ -5,9 +5,13 @@ ARCHITECTURE: Hybrid Approach
 - TOOLS: Check availability (queries) - fast, maintains context.
 - CALLBACKS: Booking/cancellation/rescheduling - uses existing verification flow.
 """
-
+import json
 import logging
 import re
+import sys
+import time as time_module
+from collections import defaultdict
+from datetime import datetime, timedelta
 
 # Set up logger for this module
 logger = logging.getLogger(__name__)
@@ -20,10 +24,14 @@ from src.utils.address_validator import (
     is_address_incomplete,
     get_address_completion_prompt
 )
+from src.utils.config import config
+from src.utils.date_parser import parse_datetime
 from src.utils.duration_utils import format_duration
 from src.utils.security import normalize_phone_for_comparison
 
-CALENDAR_TOOLS = [
+# Tuple so the shared schema can't be mutated by a caller. The entries stay
+# plain dicts because the OpenAI SDK JSON-encodes them as-is.
+CALENDAR_TOOLS = (
     {
         "type": "function",
         "function": {
@@ -246,6 +254,10 @@ CALENDAR_TOOLS = [
                         "type": "string",
                         "description": "Customer name (from phone lookup or conversation)"
                     },
+                    "customer_id": {
+                        "type": "integer",
+                        "description": "Only when a previous call returned ambiguous matches: the id of the match the customer confirmed"
+                    },
                     "new_address": {
                         "type": "string",
                         "description": "New address if customer wants to change it"
@@ -279,6 +291,10 @@ CALENDAR_TOOLS = [
                         "type": "string",
                         "description": "Customer name (provide AFTER user confirms the booking lookup)"
                     },
+                    "event_id": {
+                        "type": "string",
+                        "description": "event_id returned by the confirmation lookup - pass it back unchanged so the booking isn't searched for again"
+                    },
                     "new_address": {
                         "type": "string",
                         "description": "New job address or eircode if customer wants to change location"
@@ -346,8 +362,8 @@ CALENDAR_TOOLS = [
                 "required": []
             }
         }
-    }
-]
+    },
+)
 
 
 
@@ -385,6 +401,67 @@ from src.services.service_matcher import (
 )
 
 
+# Slot times only ever land on quarter hours, so the spoken ("9 am",
+# "2:30 pm") and clock ("09:00 AM") labels are precomputed once instead of
+# running strftime/lstrip/lower on every slot.
+_SPOKEN_TIME = {
+    (h, m): (f"{h % 12 or 12} " if m == 0 else f"{h % 12 or 12}:{m:02d} ") + ('am' if h < 12 else 'pm')
+    for h in range(24) for m in (0, 15, 30, 45)
+}
+_CLOCK_TIME = {
+    (h, m): f"{h % 12 or 12:02d}:{m:02d} {'AM' if h < 12 else 'PM'}"
+    for h in range(24) for m in (0, 15, 30, 45)
+}
+
+
+def _spoken_time(t) -> str:
+    """Format a slot time for speech, e.g. '9 am' or '2:30 pm'."""
+    label = _SPOKEN_TIME.get((t.hour, t.minute))
+    if label is None:
+        label = t.strftime('%I:%M %p').lstrip('0').lower()
+    return label
+
+
+def _clock_time(t) -> str:
+    """Format a slot time like strftime('%I:%M %p'), e.g. '09:00 AM'."""
+    return _CLOCK_TIME.get((t.hour, t.minute)) or t.strftime('%I:%M %p')
+
+
+# Customer name in event titles of the form "... between <name> and ..."
+_BETWEEN_RE = re.compile(r'between\s+([^and]+)\s+and', re.IGNORECASE)
+
+
+def _booking_for_event_id(db, event_id, appointment_time: datetime, company_id=None):
+    """
+    Resolve a calendar event_id straight to its booking row.
+    
+    Handles both calendar backends: Google events are stored in
+    bookings.calendar_event_id, database-calendar events use the booking id.
+    Returns None unless the booking is still active and at appointment_time
+    (5 minute tolerance, same as find_appointment_by_details), so a stale or
+    mismatched event_id falls back to a normal search.
+    """
+    event_id = str(event_id)
+    booking = db.get_booking_by_calendar_event_id(event_id, company_id=company_id)
+    if not booking and event_id.isdigit():
+        booking = db.get_booking(int(event_id), company_id=company_id)
+    if not booking or booking.get('status') in ('cancelled', 'completed'):
+        return None
+    
+    booked_at = booking.get('appointment_time')
+    if isinstance(booked_at, str):
+        try:
+            booked_at = datetime.fromisoformat(booked_at)
+        except ValueError:
+            return None
+    if not isinstance(booked_at, datetime):
+        return None
+    diff = booked_at.replace(tzinfo=None) - appointment_time.replace(tzinfo=None)
+    if abs(diff.total_seconds()) >= 300:
+        return None
+    return booking
+
+
 def execute_tool_call(tool_name: str, arguments: dict, services: dict) -> dict:
     """
     Execute a tool call and return the result.
@@ -401,15 +478,13 @@ def execute_tool_call(tool_name: str, arguments: dict, services: dict) -> dict:
     Returns:
         Dictionary with success status and result data
     """
-    import time as time_module
-    from datetime import datetime, timedelta
-    from ..utils.date_parser import parse_datetime
-    from src.utils.config import config
-    
+    # Tool names arrive from parsed LLM JSON; interning them lets the
+    # tool_name == "..." dispatch below short-circuit on identity.
+    tool_name = sys.intern(tool_name)
     tool_start_time = time_module.time()
     logger.info(f"[TOOL_EXEC] ========== EXECUTING TOOL: {tool_name} ==========")
     logger.info(f"[TOOL_EXEC] Arguments: {arguments}")
-    print(f"[TOOL_TIMING] ⏱️ {tool_name} started at {tool_start_time:.3f}")
+    logger.debug("[TOOL_TIMING] ⏱️ %s started at %.3f", tool_name, tool_start_time)
     
     google_calendar = services.get('google_calendar')
     google_calendar_sync = services.get('google_calendar_sync')
@@ -447,14 +522,13 @@ def execute_tool_call(tool_name: str, arguments: dict, services: dict) -> dict:
             standalone_services = [s for s in all_services if not s.get('package_only', False)]
             
             # Filter out seasonal services outside their active months
-            import json as _json_mi
             now_month = datetime.now().month - 1  # 0-indexed
             filtered_services = []
             for s in standalone_services:
                 if s.get('seasonal'):
                     months = s.get('seasonal_months')
                     if isinstance(months, str):
-                        try: months = _json_mi.loads(months)
+                        try: months = json.loads(months)
                         except Exception: months = None
                     if months and isinstance(months, list) and now_month not in months:
                         continue
@@ -513,7 +587,7 @@ def execute_tool_call(tool_name: str, arguments: dict, services: dict) -> dict:
             # Build response
             if not matches:
                 tool_duration = time_module.time() - tool_start_time
-                print(f"[TOOL_TIMING] ✅ match_issue completed in {tool_duration:.3f}s (0 matches)")
+                logger.debug("[TOOL_TIMING] ✅ match_issue completed in %.3fs (0 matches)", tool_duration)
                 return {
                     "success": True,
                     "matches": [],
@@ -561,7 +635,7 @@ def execute_tool_call(tool_name: str, arguments: dict, services: dict) -> dict:
             sounds_urgent = any(kw in issue_lower for kw in emergency_keywords)
             
             tool_duration = time_module.time() - tool_start_time
-            print(f"[TOOL_TIMING] ✅ match_issue completed in {tool_duration:.3f}s ({len(matches)} matches)")
+            logger.debug("[TOOL_TIMING] ✅ match_issue completed in %.3fs (%d matches)", tool_duration, len(matches))
             
             # Add emergency hint to instruction if it sounds urgent
             if sounds_urgent:
@@ -650,7 +724,6 @@ def execute_tool_call(tool_name: str, arguments: dict, services: dict) -> dict:
                 logger.info(f"[CHECK_AVAIL] Parsed dates: {start_date} to {end_date}")
             
             # Collect available slots across date range
-            from collections import defaultdict
             slots_by_day = defaultdict(list)
             current_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
             end_search = end_date.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -717,7 +790,8 @@ def execute_tool_call(tool_name: str, arguments: dict, services: dict) -> dict:
             while current_date <= end_search:
                 # Only check business days (configured in config.BUSINESS_DAYS)
                 if current_date.weekday() in business_days:
-                    logger.info(f"[CHECK_AVAIL] Checking {current_date.strftime('%A, %B %d')} (weekday {current_date.weekday()})")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("[CHECK_AVAIL] Checking %s (weekday %d)", current_date.strftime('%A, %B %d'), current_date.weekday())
                     
                     if has_employees and db:
                         # EMPLOYEE-BASED AVAILABILITY (batch — no per-slot DB calls)
@@ -735,7 +809,7 @@ def execute_tool_call(tool_name: str, arguments: dict, services: dict) -> dict:
                                 )
                                 if len(avail) >= employees_required:
                                     day_slots = [biz_open]
-                            logger.info(f"[CHECK_AVAIL] Full-day fast path: {'1 slot' if day_slots else 'no slots'}")
+                            logger.debug("[CHECK_AVAIL] Full-day fast path: %s", '1 slot' if day_slots else 'no slots')
                         else:
                             # Short jobs: check hourly slots
                             slot_time = current_date.replace(hour=biz_start_hour, minute=0, second=0, microsecond=0)
@@ -762,31 +836,29 @@ def execute_tool_call(tool_name: str, arguments: dict, services: dict) -> dict:
                                     day_slots.append(slot_time)
                                 
                                 slot_time += timedelta(minutes=slot_step)
-                            logger.info(f"[CHECK_AVAIL] Employee-based check found {len(day_slots)} slots")
+                            logger.debug("[CHECK_AVAIL] Employee-based check found %d slots", len(day_slots))
                     else:
                         # NO EMPLOYEES: Use calendar-based availability (any booking blocks the slot)
                         try:
                             day_slots = google_calendar.get_available_slots_for_day(current_date, service_duration=service_duration)
-                            logger.info(f"[CHECK_AVAIL] Calendar-based check found {len(day_slots) if day_slots else 0} slots")
-                        except Exception as e:
-                            logger.error(f"[CHECK_AVAIL] Error checking {current_date.strftime('%A, %B %d')}: {e}")
-                            import traceback
-                            traceback.print_exc()
+                            logger.debug("[CHECK_AVAIL] Calendar-based check found %d slots", len(day_slots) if day_slots else 0)
+                        except Exception:
+                            logger.exception("[CHECK_AVAIL] Error checking %s", current_date.strftime('%A, %B %d'))
                             raise
                     
                     # For full-day services (8+ hours), only keep ONE slot per day (start of business day)
                     if day_slots and service_duration >= 480:
                         day_slots = [day_slots[0]]
-                        logger.info(f"[CHECK_AVAIL] Full-day service - 1 slot per day: {day_slots[0].strftime('%I:%M %p')}")
+                        logger.debug("[CHECK_AVAIL] Full-day service - 1 slot per day: %s", day_slots[0])
                     
                     if day_slots:
                         day_key = current_date.strftime('%Y-%m-%d')
                         slots_by_day[day_key] = day_slots
-                        logger.debug(f"   Found {len(day_slots)} slots")
+                        logger.debug("   Found %d slots", len(day_slots))
                     else:
-                        logger.debug(f"   No slots available")
-                else:
-                    logger.debug(f"[SKIP] Skipping {current_date.strftime('%A, %B %d')} (weekend)")
+                        logger.debug("   No slots available")
+                elif logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("[SKIP] Skipping %s (weekend)", current_date.strftime('%A, %B %d'))
                 current_date += timedelta(days=1)
             
             if not slots_by_day:
@@ -821,10 +893,6 @@ def execute_tool_call(tool_name: str, arguments: dict, services: dict) -> dict:
             
             # Build natural language summary for each day
             day_summaries = []
-            def _fmt_time(t):
-                if t.minute == 0:
-                    return t.strftime('%I %p').lstrip('0').lower().replace(' 0', ' ')
-                return t.strftime('%I:%M %p').lstrip('0').lower().replace(' 0', ' ')
             for day_key in sorted_day_keys:
                 day_slots = slots_by_day[day_key]
                 day_date = datetime.strptime(day_key, '%Y-%m-%d')
@@ -838,8 +906,8 @@ def execute_tool_call(tool_name: str, arguments: dict, services: dict) -> dict:
                     day_name = "tomorrow"
                 
                 # Get first and last available times
-                first_time = _fmt_time(day_slots[0])
-                last_time = _fmt_time(day_slots[-1])
+                first_time = _spoken_time(day_slots[0])
+                last_time = _spoken_time(day_slots[-1])
                 
                 # For full-day services (8+ hours), describe as "full day" instead of time range
                 if service_duration >= 480:  # 8 hours or more
@@ -850,7 +918,7 @@ def execute_tool_call(tool_name: str, arguments: dict, services: dict) -> dict:
                     summary = f"{day_name}: free {slot_range_str}"
                 else:
                     # Few slots - list them specifically
-                    times = [_fmt_time(s) for s in day_slots]
+                    times = [_spoken_time(s) for s in day_slots]
                     if len(times) == 1:
                         summary = f"{day_name}: {times[0]} only"
                     elif len(times) == 2:
@@ -873,7 +941,7 @@ def execute_tool_call(tool_name: str, arguments: dict, services: dict) -> dict:
             for slot in all_slots[:20]:  # Cap at 20 for data size
                 formatted_slots.append({
                     "date": slot.strftime('%A, %B %d, %Y'),
-                    "time": slot.strftime('%I:%M %p'),
+                    "time": _clock_time(slot),
                     "iso": slot.isoformat()
                 })
             
@@ -881,7 +949,7 @@ def execute_tool_call(tool_name: str, arguments: dict, services: dict) -> dict:
             time_reference = "Next week" if (start_date_str and 'next week' in start_date_str.lower()) else "This week"
             
             tool_duration = time_module.time() - tool_start_time
-            print(f"[TOOL_TIMING] ✅ check_availability completed in {tool_duration:.3f}s ({len(all_slots)} slots found)")
+            logger.debug("[TOOL_TIMING] ✅ check_availability completed in %.3fs (%d slots found)", tool_duration, len(all_slots))
             
             # Add special instruction for full-day services
             if service_duration >= 480:
@@ -931,7 +999,6 @@ def execute_tool_call(tool_name: str, arguments: dict, services: dict) -> dict:
                         f"employee_restrictions={employee_restrictions}, requires_callout={matched_service.get('requires_callout')}")
             
             # Search from today through N weeks
-            from collections import defaultdict
             slots_by_day = defaultdict(list)
             today = datetime.now()
             end_search = today + timedelta(weeks=weeks_to_search)
@@ -1040,7 +1107,7 @@ def execute_tool_call(tool_name: str, arguments: dict, services: dict) -> dict:
             
             if not available_days:
                 tool_duration = time_module.time() - tool_start_time
-                print(f"[TOOL_TIMING] ✅ get_next_available completed in {tool_duration:.3f}s (0 days found)")
+                logger.debug("[TOOL_TIMING] ✅ get_next_available completed in %.3fs (0 days found)", tool_duration)
                 return {
                     "success": True,
                     "available_days": [],
@@ -1083,13 +1150,13 @@ def execute_tool_call(tool_name: str, arguments: dict, services: dict) -> dict:
                     "date": day_date.strftime('%A, %B %d, %Y'),
                     "day_name": day_date.strftime('%A'),
                     "slots_count": len(day_slots),
-                    "first_slot": day_slots[0].strftime('%I:%M %p') if day_slots else None,
-                    "last_slot": day_slots[-1].strftime('%I:%M %p') if day_slots else None,
+                    "first_slot": _clock_time(day_slots[0]) if day_slots else None,
+                    "last_slot": _clock_time(day_slots[-1]) if day_slots else None,
                     "iso_date": day_date.strftime('%Y-%m-%d')
                 })
             
             tool_duration = time_module.time() - tool_start_time
-            print(f"[TOOL_TIMING] ✅ get_next_available completed in {tool_duration:.3f}s ({len(available_days)} days found)")
+            logger.debug("[TOOL_TIMING] ✅ get_next_available completed in %.3fs (%d days found)", tool_duration, len(available_days))
             
             if is_full_day:
                 voice_instruction = "Present these days naturally. Ask which DAY works - don't mention times for full-day jobs."
@@ -1471,7 +1538,7 @@ def execute_tool_call(tool_name: str, arguments: dict, services: dict) -> dict:
                 tool_duration = time_module.time() - tool_start_time
             
             if not available_day_summaries:
-                print(f"[TOOL_TIMING] ✅ search_reschedule_availability completed in {tool_duration:.3f}s (0 days found)")
+                logger.debug("[TOOL_TIMING] ✅ search_reschedule_availability completed in %.3fs (0 days found)", tool_duration)
                 return {
                     "success": True,
                     "available_slots": [],
@@ -1485,7 +1552,7 @@ def execute_tool_call(tool_name: str, arguments: dict, services: dict) -> dict:
             if extended_from_zero and available_day_summaries:
                 natural_summary = f"There's nothing available that week, but {natural_summary[0].lower()}{natural_summary[1:]}"
             
-            print(f"[TOOL_TIMING] ✅ search_reschedule_availability completed in {tool_duration:.3f}s ({len(available_day_summaries)} days found)")
+            logger.debug("[TOOL_TIMING] ✅ search_reschedule_availability completed in %.3fs (%d days found)", tool_duration, len(available_day_summaries))
             
             _duration_lbl3 = format_duration_label(booking_duration)
             _show_duration3 = not (call_state and getattr(call_state, 'duration_announced', False))
@@ -1703,7 +1770,6 @@ Return ONLY valid JSON, no explanation."""
                         temperature=0
                     )
                     
-                    import json
                     response_content = parse_response.choices[0].message.content.strip()
                     
                     # Strip markdown code blocks if present (```json ... ```)
@@ -1795,7 +1861,6 @@ Return ONLY valid JSON, no explanation."""
                     use_batch = False
             
             # Search for availability
-            from collections import defaultdict
             slots_by_day = defaultdict(list)
             current_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
             end_search = end_date.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -2042,7 +2107,7 @@ Return ONLY valid JSON, no explanation."""
                 
                 if not slots_by_day:
                     tool_duration = time_module.time() - tool_start_time
-                    print(f"[TOOL_TIMING] ✅ search_availability completed in {tool_duration:.3f}s (0 slots found)")
+                    logger.debug("[TOOL_TIMING] ✅ search_availability completed in %.3fs (0 slots found)", tool_duration)
                     
                     # Provide helpful message based on what they asked for
                     if time_filter:
@@ -2109,12 +2174,12 @@ Return ONLY valid JSON, no explanation."""
             for slot in all_slots[:20]:
                 formatted_slots.append({
                     "date": slot.strftime('%A, %B %d, %Y'),
-                    "time": slot.strftime('%I:%M %p'),
+                    "time": _clock_time(slot),
                     "iso": slot.isoformat()
                 })
             
             tool_duration = time_module.time() - tool_start_time
-            print(f"[TOOL_TIMING] ✅ search_availability completed in {tool_duration:.3f}s ({len(all_slots)} slots found)")
+            logger.debug("[TOOL_TIMING] ✅ search_availability completed in %.3fs (%d slots found)", tool_duration, len(all_slots))
             
             if is_full_day:
                 voice_instruction = "Present these days naturally. For full-day jobs, ask which DAY works - don't mention times."
@@ -2193,7 +2258,7 @@ Return ONLY valid JSON, no explanation."""
                             msg_parts.append(f"last address {last_address}")
                         
                         tool_duration = time_module.time() - tool_start_time
-                        print(f"[TOOL_TIMING] ✅ lookup_customer completed in {tool_duration:.3f}s (returning customer by phone)")
+                        logger.debug("[TOOL_TIMING] ✅ lookup_customer completed in %.3fs (returning customer by phone)", tool_duration)
                         
                         return {
                             "success": True,
@@ -2212,7 +2277,7 @@ Return ONLY valid JSON, no explanation."""
                     else:
                         # NEW CUSTOMER — phone not found in database
                         tool_duration = time_module.time() - tool_start_time
-                        print(f"[TOOL_TIMING] ✅ lookup_customer completed in {tool_duration:.3f}s (new customer by phone)")
+                        logger.debug("[TOOL_TIMING] ✅ lookup_customer completed in %.3fs (new customer by phone)", tool_duration)
                         
                         return {
                             "success": True,
@@ -2224,7 +2289,7 @@ Return ONLY valid JSON, no explanation."""
                         }
                 except Exception as e:
                     tool_duration = time_module.time() - tool_start_time
-                    print(f"[TOOL_TIMING] ❌ lookup_customer failed after {tool_duration:.3f}s: {e}")
+                    logger.debug("[TOOL_TIMING] ❌ lookup_customer failed after %.3fs: %s", tool_duration, e)
                     logger.error(f" Error looking up customer: {e}")
                     return {
                         "success": False,
@@ -2232,7 +2297,7 @@ Return ONLY valid JSON, no explanation."""
                     }
             
             tool_duration = time_module.time() - tool_start_time
-            print(f"[TOOL_TIMING] ⚠️ lookup_customer - no DB after {tool_duration:.3f}s")
+            logger.debug("[TOOL_TIMING] ⚠️ lookup_customer - no DB after %.3fs", tool_duration)
             return {
                 "success": False,
                 "error": "Database not available"
@@ -2442,9 +2507,7 @@ Return ONLY valid JSON, no explanation."""
                 )
                 logger.info(f"[BOOK_APPT] Calendar event created: {event}")
             except Exception as cal_error:
-                logger.error(f"[BOOK_APPT] Calendar event creation failed: {cal_error}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("[BOOK_APPT] Calendar event creation failed")
                 return {
                     "success": False,
                     "error": f"Failed to create calendar event: {str(cal_error)}"
@@ -2499,16 +2562,14 @@ Return ONLY valid JSON, no explanation."""
                         if _matched_pkg and _matched_pkg.get('default_materials'):
                             _dm = _matched_pkg['default_materials']
                             if isinstance(_dm, str):
-                                import json as _json
-                                _dm = _json.loads(_dm)
+                                _dm = json.loads(_dm)
                             _default_materials = _dm if isinstance(_dm, list) else []
                         else:
                             _svc = _sm.get_service_by_name(matched_service_name, company_id=company_id)
                             if _svc and _svc.get('default_materials'):
                                 _dm = _svc['default_materials']
                                 if isinstance(_dm, str):
-                                    import json as _json
-                                    _dm = _json.loads(_dm)
+                                    _dm = json.loads(_dm)
                                 _default_materials = _dm if isinstance(_dm, list) else []
                         
                         if _default_materials:
@@ -2577,16 +2638,16 @@ Return ONLY valid JSON, no explanation."""
                     
                     # Auto-assign employees if any were selected
                     if assigned_employees:
-                        for employee in assigned_employees:
-                            try:
-                                logger.info(f"[BOOK_APPT] Assigning employee {employee['name']} to booking {booking_id}")
-                                assignment_result = db.assign_employee_to_job(booking_id, employee['id'])
-                                if assignment_result.get('success'):
-                                    logger.info(f"[BOOK_APPT] ✅ Employee {employee['name']} assigned successfully")
-                                else:
-                                    logger.warning(f"[BOOK_APPT] ⚠️ Failed to assign employee {employee['name']}: {assignment_result.get('error')}")
-                            except Exception as employee_err:
-                                logger.warning(f"[BOOK_APPT] ⚠️ Could not assign employee {employee['name']}: {employee_err}")
+                        employee_names = ', '.join(e['name'] for e in assigned_employees)
+                        try:
+                            logger.info(f"[BOOK_APPT] Assigning employees {employee_names} to booking {booking_id}")
+                            assignment_result = db.assign_employees_bulk([(booking_id, e['id']) for e in assigned_employees])
+                            if assignment_result.get('success'):
+                                logger.info(f"[BOOK_APPT] ✅ Employees {employee_names} assigned successfully")
+                            else:
+                                logger.warning(f"[BOOK_APPT] ⚠️ Failed to assign employees {employee_names}: {assignment_result.get('error')}")
+                        except Exception as employee_err:
+                            logger.warning(f"[BOOK_APPT] ⚠️ Could not assign employees {employee_names}: {employee_err}")
                     
                     # Update client description — run in background to avoid blocking the response
                     try:
@@ -2597,10 +2658,8 @@ Return ONLY valid JSON, no explanation."""
                         pass
                     
                     logger.info(f"[BOOK_APPT] ✅ Booking saved to database (ID: {booking_id}, company_id: {company_id}, duration: {appointment_duration} mins)")
-                except Exception as e:
-                    logger.error(f"[BOOK_APPT] ❌ Database save failed: {e}")
-                    import traceback
-                    traceback.print_exc()
+                except Exception:
+                    logger.exception("[BOOK_APPT] ❌ Database save failed")
             else:
                 logger.warning(f"[BOOK_APPT] No database available - booking not saved to DB")
             
@@ -2931,11 +2990,7 @@ Return ONLY valid JSON, no explanation."""
                 
                 if booking_id and db:
                     try:
-                        bookings = db.get_all_bookings(company_id=company_id)
-                        for booking in bookings:
-                            if booking.get('id') == booking_id:
-                                assigned_employee_ids = booking.get('assigned_employee_ids', [])
-                                break
+                        assigned_employee_ids = [e['id'] for e in db.get_job_employees(booking_id, company_id=company_id)]
                     except Exception as e:
                         logger.warning(f"[RESCHEDULE] Could not get assigned employees: {e}")
                 
@@ -3022,11 +3077,7 @@ Return ONLY valid JSON, no explanation."""
             assigned_employee_ids = []
             if booking_id and db:
                 try:
-                    bookings = db.get_all_bookings(company_id=company_id)
-                    for booking in bookings:
-                        if booking.get('id') == booking_id:
-                            assigned_employee_ids = booking.get('assigned_employee_ids', [])
-                            break
+                    assigned_employee_ids = [e['id'] for e in db.get_job_employees(booking_id, company_id=company_id)]
                 except Exception as e:
                     logger.warning(f"[RESCHEDULE] Could not get assigned employees: {e}")
             
@@ -3125,16 +3176,20 @@ Return ONLY valid JSON, no explanation."""
             
             # Send reschedule confirmation SMS
             _resched_phone = None
+            _resched_email = None
             _resched_service = matched_job.get('service', 'appointment')
             _resched_company_name = None
             if booking_id and db:
                 try:
-                    all_bookings = db.get_all_bookings(company_id=company_id)
-                    for bk in all_bookings:
-                        if bk.get('id') == booking_id:
-                            _resched_phone = bk.get('phone') or bk.get('phone_number')
-                            _resched_service = bk.get('service_type') or _resched_service
-                            break
+                    _booking_rec = db.get_booking(booking_id, company_id=company_id)
+                    if _booking_rec:
+                        _resched_phone = _booking_rec.get('phone_number')
+                        _resched_service = _booking_rec.get('service_type') or _resched_service
+                        if _booking_rec.get('client_id'):
+                            _client_rec = db.get_client(_booking_rec['client_id'])
+                            if _client_rec:
+                                _resched_phone = _resched_phone or _client_rec.get('phone')
+                                _resched_email = _client_rec.get('email')
                 except Exception:
                     pass
                 try:
@@ -3153,17 +3208,6 @@ Return ONLY valid JSON, no explanation."""
                         except Exception:
                             pass
                     if _send_sms:
-                        # Look up customer email
-                        _resched_email = None
-                        if db and matched_job.get('booking_id'):
-                            try:
-                                _booking_rec = db.get_booking(matched_job['booking_id'])
-                                if _booking_rec and _booking_rec.get('client_id'):
-                                    _client_rec = db.get_client(_booking_rec['client_id'])
-                                    if _client_rec:
-                                        _resched_email = _client_rec.get('email')
-                            except Exception:
-                                pass
                         from src.services.sms_reminder import notify_customer
                         notify_customer(
                             'reschedule',
@@ -3206,13 +3250,12 @@ Return ONLY valid JSON, no explanation."""
             # Sanitize email: ASR often transcribes "at" literally instead of "@"
             # e.g., "jkdoherty123atgmail.com" should become "jkdoherty123@gmail.com"
             if email:
-                import re as _re
                 # Fix "atgmail" → "@gmail", "atyahoo" → "@yahoo", etc.
-                email = _re.sub(r'(?i)\bat(gmail|yahoo|hotmail|outlook|icloud|live|aol|protonmail|mail)', r'@\1', email)
+                email = re.sub(r'(?i)\bat(gmail|yahoo|hotmail|outlook|icloud|live|aol|protonmail|mail)', r'@\1', email)
                 # Fix "at " or " at " in the middle of an email
-                email = _re.sub(r'\s*at\s+', '@', email)
+                email = re.sub(r'\s*at\s+', '@', email)
                 # Fix "dot com" → ".com", "dot ie" → ".ie", etc.
-                email = _re.sub(r'\s*dot\s*(com|ie|co\.uk|org|net|io|dev)\b', r'.\1', email, flags=_re.IGNORECASE)
+                email = re.sub(r'\s*dot\s*(com|ie|co\.uk|org|net|io|dev)\b', r'.\1', email, flags=re.IGNORECASE)
                 # Remove any spaces
                 email = email.replace(' ', '')
                 # Ensure there's an @ symbol
@@ -3705,9 +3748,7 @@ Return ONLY valid JSON, no explanation."""
                 )
                 logger.info(f"[BOOK_JOB] Calendar event created: {event}")
             except Exception as cal_error:
-                logger.error(f"[BOOK_JOB] Calendar event creation failed: {cal_error}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("[BOOK_JOB] Calendar event creation failed")
                 return {
                     "success": False,
                     "error": f"Failed to create calendar event: {str(cal_error)}"
@@ -3829,16 +3870,14 @@ Return ONLY valid JSON, no explanation."""
                         if _matched_pkg and _matched_pkg.get('default_materials'):
                             _dm = _matched_pkg['default_materials']
                             if isinstance(_dm, str):
-                                import json as _json
-                                _dm = _json.loads(_dm)
+                                _dm = json.loads(_dm)
                             _default_materials = _dm if isinstance(_dm, list) else []
                         else:
                             _svc = _sm.get_service_by_name(matched_service_name, company_id=company_id)
                             if _svc and _svc.get('default_materials'):
                                 _dm = _svc['default_materials']
                                 if isinstance(_dm, str):
-                                    import json as _json
-                                    _dm = _json.loads(_dm)
+                                    _dm = json.loads(_dm)
                                 _default_materials = _dm if isinstance(_dm, list) else []
                         
                         if _default_materials:
@@ -3907,16 +3946,16 @@ Return ONLY valid JSON, no explanation."""
                     
                     # Auto-assign employees if any were selected
                     if assigned_employees:
-                        for employee in assigned_employees:
-                            try:
-                                logger.info(f"[BOOK_JOB] Assigning employee {employee['name']} to booking {booking_id}")
-                                assignment_result = db.assign_employee_to_job(booking_id, employee['id'])
-                                if assignment_result.get('success'):
-                                    logger.info(f"[BOOK_JOB] ✅ Employee {employee['name']} assigned successfully")
-                                else:
-                                    logger.warning(f"[BOOK_JOB] ⚠️ Failed to assign employee {employee['name']}: {assignment_result.get('error')}")
-                            except Exception as employee_err:
-                                logger.warning(f"[BOOK_JOB] ⚠️ Could not assign employee {employee['name']}: {employee_err}")
+                        employee_names = ', '.join(e['name'] for e in assigned_employees)
+                        try:
+                            logger.info(f"[BOOK_JOB] Assigning employees {employee_names} to booking {booking_id}")
+                            assignment_result = db.assign_employees_bulk([(booking_id, e['id']) for e in assigned_employees])
+                            if assignment_result.get('success'):
+                                logger.info(f"[BOOK_JOB] ✅ Employees {employee_names} assigned successfully")
+                            else:
+                                logger.warning(f"[BOOK_JOB] ⚠️ Failed to assign employees {employee_names}: {assignment_result.get('error')}")
+                        except Exception as employee_err:
+                            logger.warning(f"[BOOK_JOB] ⚠️ Could not assign employees {employee_names}: {employee_err}")
                     
                     # Update client description — run in background to avoid blocking the response
                     try:
@@ -4034,14 +4073,13 @@ Return ONLY valid JSON, no explanation."""
                     
                     # Auto-generate a draft quote for the job
                     try:
-                        import json as _qjson
                         _conn_q = db.get_connection()
                         _cur_q = _conn_q.cursor()
                         _company_q = db.get_company(company_id)
                         _next_num = int(_company_q.get('invoice_next_number', 1) or 1) if _company_q else 1
                         _quote_number = f"QTE-{_next_num:04d}"
                         _q_charge = job_charge or 0
-                        _q_items = _qjson.dumps([{"description": matched_service_name, "quantity": 1, "amount": _q_charge}])
+                        _q_items = json.dumps([{"description": matched_service_name, "quantity": 1, "amount": _q_charge}])
                         _cur_q.execute("""
                             INSERT INTO quotes (company_id, client_id, quote_number, title, description,
                                                 line_items, subtotal, tax_rate, tax_amount, total,
@@ -4062,10 +4100,8 @@ Return ONLY valid JSON, no explanation."""
                             db.return_connection(_conn_q)
                         except:
                             pass
-                except Exception as e:
-                    logger.error(f"[BOOK_JOB] ❌ Database save failed: {e}")
-                    import traceback
-                    traceback.print_exc()
+                except Exception:
+                    logger.exception("[BOOK_JOB] ❌ Database save failed")
             else:
                 logger.warning(f"[BOOK_JOB] No database available - booking not saved to DB")
             
@@ -4160,7 +4196,7 @@ Return ONLY valid JSON, no explanation."""
                 logger.warning(f"[BOOK_JOB] ⚠️ Booking notification failed (booking still saved): {notify_err}")
             
             tool_duration = time_module.time() - tool_start_time
-            print(f"[TOOL_TIMING] ✅ book_job completed in {tool_duration:.3f}s")
+            logger.debug("[TOOL_TIMING] ✅ book_job completed in %.3fs", tool_duration)
             logger.info(f"[BOOK_JOB] ========== JOB BOOKING COMPLETE ==========")
             
             # Sync to Google Calendar if connected (non-blocking)
@@ -4232,6 +4268,7 @@ Return ONLY valid JSON, no explanation."""
             """Update customer account information without needing a specific booking"""
             logger.info(f"[UPDATE_CUSTOMER] ========== UPDATING CUSTOMER INFO ==========")
             customer_name = arguments.get('customer_name')
+            customer_id = arguments.get('customer_id')
             new_address = arguments.get('new_address')
             new_email = arguments.get('new_email')
             new_phone = arguments.get('new_phone')
@@ -4257,20 +4294,32 @@ Return ONLY valid JSON, no explanation."""
                     "error": "No changes specified. Ask the customer what they'd like to update (address, email, or phone) and what the new value should be."
                 }
             
-            # Find the client by name
-            clients = db.get_clients_by_name(customer_name.lower(), company_id=company_id)
-            if not clients:
-                # Try phone from call_state
-                if call_state:
-                    _phone = getattr(call_state, 'phone_number', None)
-                    if _phone:
-                        client = db.find_client_by_phone(_phone, company_id=company_id)
-                        if client:
-                            clients = [client]
+            # Find the client by name, falling back to the caller's phone -
+            # one query, with a name+phone match ranked first
+            _phone = getattr(call_state, 'phone_number', None) if call_state else None
+            clients = db.lookup_client(name=customer_name, phone=_phone, company_id=company_id,
+                                       limit=None if customer_id else 5)
+            if customer_id:
+                clients = [c for c in clients if str(c['id']) == str(customer_id)]
             
             if not clients:
                 return {"success": False, "error": f"Could not find customer '{customer_name}' in the system."}
             
+            # Several customers share this name and the caller's phone doesn't
+            # settle it - don't guess which account to change
+            if not clients[0].get('phone_match'):
+                name_matches = [c for c in clients if c.get('name_match')]
+                if len(name_matches) > 1:
+                    return {
+                        "success": False,
+                        "ambiguous": True,
+                        "matches": [
+                            {"id": c['id'], "name": c['name'], "address": c.get('address') or c.get('eircode')}
+                            for c in name_matches
+                        ],
+                        "error": f"There are {len(name_matches)} customers named '{customer_name}'. Ask the customer for the address on their account, then call update_customer_info again with the matching customer_id."
+                    }
+            
             client = clients[0]
             client_id = client['id']
             
@@ -4319,14 +4368,13 @@ Return ONLY valid JSON, no explanation."""
                         # Update all upcoming bookings for this client with the new address + audio
                         try:
                             all_bookings = db.get_all_bookings(company_id=company_id)
-                            from datetime import datetime as dt_cls
-                            now = dt_cls.now()
+                            now = datetime.now()
                             for booking in all_bookings:
                                 if booking.get('client_id') == client_id:
                                     appt = booking.get('appointment_time')
                                     if appt:
                                         if isinstance(appt, str):
-                                            appt = dt_cls.fromisoformat(appt.replace('Z', '+00:00')).replace(tzinfo=None)
+                                            appt = datetime.fromisoformat(appt.replace('Z', '+00:00')).replace(tzinfo=None)
                                         if appt >= now:
                                             db.update_booking(booking['id'], address=client_update.get('address', new_address), address_audio_url=audio_url)
                             logger.info(f"[UPDATE_CUSTOMER] 🎙️ Updated upcoming bookings with new address + audio")
@@ -4337,7 +4385,7 @@ Return ONLY valid JSON, no explanation."""
                 logger.info(f"[UPDATE_CUSTOMER] ✅ Updated client {client_id}: {changes_summary}")
                 
                 tool_duration = time_module.time() - tool_start_time
-                print(f"[TOOL_TIMING] ✅ update_customer_info completed in {tool_duration:.3f}s")
+                logger.debug("[TOOL_TIMING] ✅ update_customer_info completed in %.3fs", tool_duration)
                 
                 return {
                     "success": True,
@@ -4401,7 +4449,7 @@ Return ONLY valid JSON, no explanation."""
                 if ' - ' in event_summary:
                     extracted_name = event_summary.split(' - ')[-1].strip()
                 else:
-                    between_match = re.search(r'between\s+([^and]+)\s+and', event_summary, re.IGNORECASE)
+                    between_match = _BETWEEN_RE.search(event_summary)
                     if between_match:
                         extracted_name = between_match.group(1).strip()
                     else:
@@ -4442,6 +4490,7 @@ Return ONLY valid JSON, no explanation."""
                     "success": False,
                     "requires_confirmation": True,
                     "customer_name": extracted_name,
+                    "event_id": event_id,
                     "appointment_time": parsed_time.strftime('%B %d at %I:%M %p'),
                     "current_details": current_details,
                     "message": f"Found appointment at {parsed_time.strftime('%B %d at %I:%M %p')} for {extracted_name}. Current address: {current_details.get('address', 'Not set')}. What would you like to change?"
@@ -4471,25 +4520,38 @@ Return ONLY valid JSON, no explanation."""
                     "error": "No changes specified. Please ask the customer what they would like to update (address, job description, phone, email, or urgency)."
                 }
             
-            # Find the appointment
-            event = google_calendar.find_appointment_by_details(
-                customer_name=customer_name,
-                appointment_time=parsed_time
-            )
-            
-            if not event:
-                return {
-                    "success": False,
-                    "error": f"No appointment found for {customer_name} at {parsed_time.strftime('%B %d at %I:%M %p')}"
-                }
+            # The confirmation step hands back the event_id it already found,
+            # so go straight to that booking instead of searching the calendar
+            # and scanning every booking again
+            booking_id = None
+            current_booking = None
+            event_id = arguments.get('event_id')
+            if event_id:
+                try:
+                    current_booking = _booking_for_event_id(db, event_id, parsed_time, company_id=company_id)
+                except Exception as e:
+                    logger.warning(f"[MODIFY_JOB] event_id lookup failed, falling back to search: {e}")
+                if current_booking:
+                    booking_id = current_booking['id']
             
-            event_id = event.get('id')
+            # Find the appointment
+            if not booking_id:
+                event = google_calendar.find_appointment_by_details(
+                    customer_name=customer_name,
+                    appointment_time=parsed_time
+                )
+                
+                if not event:
+                    return {
+                        "success": False,
+                        "error": f"No appointment found for {customer_name} at {parsed_time.strftime('%B %d at %I:%M %p')}"
+                    }
+                
+                event_id = event.get('id')
             
             # Find the booking in database
-            booking_id = None
-            current_booking = None
             try:
-                bookings = db.get_all_bookings(company_id=company_id)
+                bookings = db.get_all_bookings(company_id=company_id) if not booking_id else []
                 for booking in bookings:
                     # For database calendar: event_id IS the booking ID
                     if str(booking.get('id')) == str(event_id):
@@ -4634,12 +4696,7 @@ Return ONLY valid JSON, no explanation."""
                 if new_address or new_job_description:
                     try:
                         # Get updated booking info
-                        updated_booking = None
-                        refreshed_bookings = db.get_all_bookings(company_id=company_id)
-                        for booking in refreshed_bookings:
-                            if booking['id'] == booking_id:
-                                updated_booking = booking
-                                break
+                        updated_booking = db.get_booking(booking_id, company_id=company_id)
                         
                         if updated_booking and hasattr(google_calendar, 'update_event_description'):
                             new_description = f"Booked via AI receptionist\n\nCustomer: {customer_name}\nPhone: {updated_booking.get('phone_number', '')}\nEmail: {updated_booking.get('email', '')}\n\nJob Address: {updated_booking.get('address') or updated_booking.get('eircode') or 'N/A'}\nService: {updated_booking.get('service_type', '')}\nUrgency: {updated_booking.get('urgency', '')}\n\n[Modified: {changes_summary}]"
@@ -4656,9 +4713,7 @@ Return ONLY valid JSON, no explanation."""
                 }
                 
             except Exception as e:
-                logger.error(f"[MODIFY_JOB] Error updating booking: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("[MODIFY_JOB] Error updating booking")
                 return {
                     "success": False,
                     "error": f"Error updating booking: {str(e)}"
@@ -4688,7 +4743,11 @@ Return ONLY valid JSON, no explanation."""
                     # Try fuzzy match across all clients if exact match fails
                     all_bookings = db.get_all_bookings(company_id=company_id)
                     all_names = list(set(b.get('client_name') or b.get('customer_name') or '' for b in all_bookings if b.get('client_name') or b.get('customer_name')))
-                    best_match, score, _ = fuzzy_match_name(customer_name, all_names)
+                    # Closest lengths first, so a first+last name hit (95) is
+                    # usually found early and the rest of the scan is skipped
+                    spoken_len = len(customer_name.strip())
+                    all_names.sort(key=lambda n: abs(len(n) - spoken_len))
+                    best_match, score, _ = fuzzy_match_name(customer_name, all_names, stop_at=95)
                     if best_match and score >= 60:
                         clients = db.get_clients_by_name(best_match.lower(), company_id=company_id)
                 for c in clients:
@@ -4722,21 +4781,18 @@ Return ONLY valid JSON, no explanation."""
             
             # If date provided, filter by date
             if date_query:
-                from ..utils.date_parser import parse_datetime
                 parsed_date = parse_datetime(date_query)
                 if parsed_date:
                     target_date = parsed_date.date()
                     if matched_bookings:
                         # Filter existing results by date
-                        from datetime import datetime as dt_cls
                         matched_bookings = [
                             b for b in matched_bookings
                             if _parse_booking_date(b.get('date_iso', '')) == target_date
                         ]
                     elif not client_ids:
                         # No name/phone given — search all bookings on that date
-                        from datetime import datetime as dt_conv
-                        target_datetime = dt_conv.combine(target_date, dt_conv.min.time())
+                        target_datetime = datetime.combine(target_date, datetime.min.time())
                         jobs = find_jobs_on_day(target_datetime, db, company_id)
                         for j in jobs:
                             matched_bookings.append({
@@ -4751,13 +4807,12 @@ Return ONLY valid JSON, no explanation."""
                             })
             
             # Only keep upcoming bookings (today or future), sorted soonest first
-            from datetime import datetime as dt_cls
-            now = dt_cls.now()
+            now = datetime.now()
             upcoming = []
             past = []
             for b in matched_bookings:
                 try:
-                    bdt = dt_cls.fromisoformat(b['date_iso']) if b.get('date_iso') else None
+                    bdt = datetime.fromisoformat(b['date_iso']) if b.get('date_iso') else None
                     if bdt and bdt >= now.replace(hour=0, minute=0, second=0):
                         upcoming.append(b)
                     else:
@@ -4769,7 +4824,7 @@ Return ONLY valid JSON, no explanation."""
             upcoming.sort(key=lambda x: x.get('date_iso', ''))
             
             tool_duration = time_module.time() - tool_start_time
-            print(f"[TOOL_TIMING] ✅ search_bookings completed in {tool_duration:.3f}s")
+            logger.debug("[TOOL_TIMING] ✅ search_bookings completed in %.3fs", tool_duration)
             
             if not upcoming and not past:
                 return {
@@ -4813,7 +4868,7 @@ Return ONLY valid JSON, no explanation."""
             logger.info(f"Transfer: Transferring to business phone: {transfer_number}")
             
             tool_duration = time_module.time() - tool_start_time
-            print(f"[TOOL_TIMING] ✅ {tool_name} completed in {tool_duration:.3f}s")
+            logger.debug("[TOOL_TIMING] ✅ %s completed in %.3fs", tool_name, tool_duration)
             
             return {
                 "success": True,
@@ -4825,7 +4880,7 @@ Return ONLY valid JSON, no explanation."""
         
         else:
             tool_duration = time_module.time() - tool_start_time
-            print(f"[TOOL_TIMING] ⚠️ Unknown tool {tool_name} after {tool_duration:.3f}s")
+            logger.debug("[TOOL_TIMING] ⚠️ Unknown tool %s after %.3fs", tool_name, tool_duration)
             return {
                 "success": False,
                 "error": f"Unknown tool: {tool_name}"
@@ -4833,14 +4888,11 @@ Return ONLY valid JSON, no explanation."""
     
     except Exception as e:
         tool_duration = time_module.time() - tool_start_time
-        print(f"[TOOL_TIMING] ❌ {tool_name} FAILED after {tool_duration:.3f}s: {e}")
+        logger.debug("[TOOL_TIMING] ❌ %s FAILED after %.3fs: %s", tool_name, tool_duration, e)
         logger.error(f"[TOOL_ERROR] ========== TOOL EXECUTION FAILED ==========")
         logger.error(f"[TOOL_ERROR] Tool: {tool_name}")
         logger.error(f"[TOOL_ERROR] Arguments: {arguments}")
-        logger.error(f"[TOOL_ERROR] Exception type: {type(e).__name__}")
-        logger.error(f"[TOOL_ERROR] Error message: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("[TOOL_ERROR] %s: %s", type(e).__name__, e)
         return {
             "success": False,
             "error": f"Error executing {tool_name}: {str(e)}"
@@ -441,7 +441,7 @@ def format_summary_for_note(summary: Dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
-async def _add_summary_to_booking(job_details: Dict[str, Any], caller_phone: str, company_id: int) -> bool:
+def _add_summary_to_booking(job_details: Dict[str, Any], caller_phone: str, company_id: int) -> bool:
     """
     Add job summary to the most recent booking for this caller.
     Only adds summary to bookings created within the last 10 minutes (during this call).
@@ -512,7 +512,7 @@ async def _add_summary_to_booking(job_details: Dict[str, Any], caller_phone: str
         return False
 
 
-async def _log_call_to_db(
+def _log_call_to_db(
     log_data: Dict[str, Any],
     caller_phone: str,
     company_id: int,
@@ -586,10 +586,13 @@ async def summarize_and_log_call(
     loop = asyncio.get_running_loop()
     combined = await loop.run_in_executor(None, summarize_call_combined, conversation_log, caller_phone)
 
+    # The DB steps below are blocking psycopg2 calls too, so each runs in a
+    # worker thread - this loop is also streaming audio for live calls
+
     # 1. Add job summary to booking (if there's job content and a caller phone)
     if combined.get("has_job_content") and caller_phone and company_id:
         try:
-            await _add_summary_to_booking(combined, caller_phone, company_id)
+            await asyncio.to_thread(_add_summary_to_booking, combined, caller_phone, company_id)
         except Exception as e:
             print(f"⚠️ Booking summary error: {e}")
 
@@ -607,7 +610,8 @@ async def summarize_and_log_call(
             "lost_job_reason": combined.get("lost_job_reason", ""),
         }
         try:
-            call_log_id = await _log_call_to_db(
+            call_log_id = await asyncio.to_thread(
+                _log_call_to_db,
                 log_data=log_data,
                 caller_phone=caller_phone,
                 company_id=company_id,
@@ -624,7 +628,7 @@ async def summarize_and_log_call(
             import math
             call_minutes = math.ceil(duration_seconds / 60)  # Round up to nearest minute
             print(f"[USAGE] Tracking {call_minutes} min for company {company_id} (duration={duration_seconds}s)")
-            _track_call_minutes(company_id, call_minutes)
+            await asyncio.to_thread(_track_call_minutes, company_id, call_minutes)
         except Exception as e:
             import traceback
             print(f"⚠️ Usage tracking error: {e}")
@@ -637,7 +641,7 @@ async def summarize_and_log_call(
     # and returning customers (whose email/address may have been updated during the call)
     if caller_phone and company_id:
         try:
-            await _update_client_from_transcript(combined, caller_phone, company_id)
+            await asyncio.to_thread(_update_client_from_transcript, combined, caller_phone, company_id)
         except Exception as e:
             print(f"⚠️ Client update from transcript error: {e}")
 
@@ -656,7 +660,8 @@ async def summarize_and_log_call(
         )
         if should_create_lead:
             try:
-                await _create_lead_from_call(
+                await asyncio.to_thread(
+                    _create_lead_from_call,
                     combined=combined,
                     caller_phone=caller_phone,
                     company_id=company_id,
@@ -669,7 +674,7 @@ async def summarize_and_log_call(
     return call_log_id
 
 
-async def _create_lead_from_call(
+def _create_lead_from_call(
     combined: Dict[str, Any],
     caller_phone: str,
     company_id: int,
@@ -820,7 +825,7 @@ async def _create_lead_from_call(
             db.return_connection(conn)
 
 
-async def _update_client_from_transcript(
+def _update_client_from_transcript(
     summary: Dict[str, Any],
     caller_phone: str,
     company_id: int,
@@ -898,7 +903,7 @@ async def add_call_summary_to_booking(
     summary = await loop.run_in_executor(None, summarize_call, conversation_log, caller_phone)
     if not summary:
         return False
-    return await _add_summary_to_booking(summary, caller_phone, company_id)
+    return await asyncio.to_thread(_add_summary_to_booking, summary, caller_phone, company_id)
 
 
 async def log_call(
@@ -917,4 +922,5 @@ async def log_call(
     log_data = await loop.run_in_executor(None, generate_call_log_summary, conversation_log)
     if not log_data:
         log_data = _empty_call_log("no_action", "")
-    return await _log_call_to_db(log_data, caller_phone, company_id, duration_seconds, call_sid, call_state)
+    return await asyncio.to_thread(_log_call_to_db, log_data, caller_phone, company_id,
+                                   duration_seconds, call_sid, call_state)
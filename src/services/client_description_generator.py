@@ -1,38 +1,120 @@
 """
 Client Description Generator - Creates AI-generated summaries of client history
 """
+import atexit
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, List, Optional
+from functools import cache, lru_cache
+from typing import Dict, List, Optional, Tuple
 from openai import OpenAI
 from src.utils.config import config
+from src.utils.ttl_cache import TTLCache
 
-# Lazy initialization of OpenAI client
-_client = None
+# Try to import h2 - httpx only speaks HTTP/2 when it is installed
+try:
+    import h2  # noqa: F401
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
 
+logger = logging.getLogger(__name__)
+
+# Bulk refresh concurrency. Each worker holds a pooled DB connection while
+# it loads a client's history, so keep this well under the wrapper's
+# maxconn=10 (shared with web requests) unless the pool is raised too.
+DESCRIPTION_WORKERS = int(os.getenv('DESC_WORKERS', '4'))
+
+# The prompt asks for 2-3 sentences; streaming stops after this many.
+# A terminator only counts once whitespace follows it, so "€1.50" (or a
+# "." that happens to end a streamed chunk) doesn't cut the summary short.
+MAX_DESCRIPTION_SENTENCES = 3
+_SENTENCE_END_RE = re.compile(r'[.!?](?=\s)')
+
+# Last AI description per client as (history signature, description). Keyed
+# by client only so a stale signature is overwritten rather than piling up.
+# Catches repeat generations before the DB write lands (or when callers
+# don't persist the result at all).
+_ai_description_cache = TTLCache(ttl_seconds=3600)
+
+
+@cache
 def get_openai_client():
-    """Get or create OpenAI client instance with timeout"""
-    global _client
-    if _client is None:
-        import httpx
-        _client = OpenAI(
-            api_key=config.OPENAI_API_KEY,
-            timeout=httpx.Timeout(20.0, connect=5.0)  # 5s connect, 20s total for description generation
-        )
-    return _client
+    """Get the shared OpenAI client, created with a timeout on first use
+    
+    The HTTP pool is sized for the bulk refresh's worker threads and kept
+    alive between calls, so repeat requests skip the TLS handshake. HTTP/2
+    is used when the optional h2 package is installed.
+    """
+    import httpx
+    timeout = httpx.Timeout(20.0, connect=5.0)  # 5s connect, 20s total for description generation
+    http_client = httpx.Client(
+        http2=H2_AVAILABLE,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        timeout=timeout,
+    )
+    atexit.register(http_client.close)
+    return OpenAI(
+        api_key=config.OPENAI_API_KEY,
+        timeout=timeout,
+        http_client=http_client,
+    )
 
 
 def format_date_short(date_str: str) -> str:
     """Format date as d/m/yy (e.g., 12/1/23)"""
+    if isinstance(date_str, str):
+        return _format_date_string_short(date_str)
     try:
-        if isinstance(date_str, str):
-            dt = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-        else:
-            dt = date_str
-        return dt.strftime("%d/%m/%y").lstrip("0").replace("/0", "/")
+        return date_str.strftime("%d/%m/%y").lstrip("0").replace("/0", "/")
     except:
         return str(date_str)
 
 
+@lru_cache(maxsize=4096)
+def _format_date_string_short(date_str: str) -> str:
+    """format_date_short for string timestamps - cached, the same appointment
+    times come up repeatedly across template and prompt building"""
+    try:
+        dt = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
+        return dt.strftime("%d/%m/%y").lstrip("0").replace("/0", "/")
+    except:
+        return date_str
+
+
+def _history_signature(client: Dict, bookings: List[Dict]) -> str:
+    """
+    Content hash of everything a description is generated from (client name,
+    booking dates, services and notes). Stored as clients.description_sig so
+    unchanged histories don't get sent back to OpenAI.
+    """
+    payload = [client.get('name')] + [
+        [b.get('appointment_time'), b.get('service_type'), [n.get('note') for n in b.get('notes') or []]]
+        for b in bookings
+    ]
+    return hashlib.blake2b(json.dumps(payload, default=str).encode(), digest_size=16).hexdigest()
+
+
+def _load_client_history(db, client_id: int, company_id: int = None) -> Tuple[Optional[Dict], List[Dict]]:
+    """(client, bookings oldest first with notes) via get_client_with_history
+    
+    Clients with no bookings come back as (None, []) after a cheap COUNT,
+    without loading the client row or the bookings/notes JOIN.
+    """
+    if db.count_client_bookings(client_id, company_id=company_id) == 0:
+        return None, []
+    client = db.get_client_with_history(client_id, company_id=company_id)
+    if not client:
+        return None, []
+    return client, client.pop('bookings')
+
+
 def generate_client_description_from_notes(client_id: int, use_ai: bool = True, company_id: int = None) -> Optional[str]:
     """
     Generate a client description using AI based on appointment notes and history
@@ -51,113 +133,241 @@ def generate_client_description_from_notes(client_id: int, use_ai: bool = True,
     from src.services.database import get_database
     db = get_database()
     
-    # Get client info - filter by company_id for data isolation
-    client = db.get_client(client_id, company_id=company_id)
-    if not client:
+    # Get client info and booking history with notes in one go - filter by
+    # company_id for data isolation
+    client, bookings = _load_client_history(db, client_id, company_id)
+    if not client or not bookings:
         return None
     
-    # Get booking history with notes - filter by company_id for data isolation
-    bookings = db.get_client_bookings(client_id, company_id=company_id)
-    
-    if not bookings or len(bookings) == 0:
-        return None
+    sig = _history_signature(client, bookings)
+    if use_ai and client.get('description') and client.get('description_sig') == sig:
+        # Stored description was generated from this exact history
+        return client['description']
     
+    return _describe_client(client, bookings, use_ai=use_ai, sig=sig)[0]
+
+
+def _describe_client(client: Dict, bookings: List[Dict], use_ai: bool = True,
+                     sig: str = None) -> Tuple[str, bool]:
+    """
+    Generate a description from already-loaded client and booking history.
+    Returns (description, from_ai) - from_ai is False for the template
+    fallback, which mustn't be stored with the history signature or it would
+    never be replaced by an AI description.
+    """
     # If AI generation is enabled and we have OpenAI configured
     if use_ai:
+        sig = sig or _history_signature(client, bookings)
+        cache_key = ("ai_description", client['id'])
+        cached = _ai_description_cache.get(cache_key)
+        if cached and cached[0] == sig:
+            return cached[1], True
         try:
-            return _generate_ai_description(client, bookings)
+            description = _generate_ai_description(client, bookings)
+            _ai_description_cache.set(cache_key, (sig, description))
+            return description, True
         except Exception as e:
-            print(f"⚠️ AI generation failed, falling back to template: {e}")
+            logger.warning("⚠️ AI generation failed, falling back to template: %s", e)
             # Fall back to template-based generation
     
     # Template-based fallback
-    return _generate_template_description(client, bookings)
+    return _generate_template_description(client, bookings), False
 
 
-def _generate_ai_description(client: Dict, bookings: List[Dict]) -> str:
-    """
-    Use GPT-4o-mini to generate a natural description from appointment history
-    """
-    client_openai = get_openai_client()
-    
-    # Extract name
-    name_parts = client['name'].split()
-    first_name = name_parts[0].capitalize()
-    
-    # Prepare booking information with notes
-    booking_summaries = []
-    for booking in reversed(bookings):  # Oldest first
-        date_str = format_date_short(booking['appointment_time'])
-        service = booking.get('service_type', 'general appointment')
-        
-        # Get notes for this appointment
-        notes_text = ""
-        if booking.get('notes'):
-            notes_list = [note['note'] for note in booking['notes']]
-            notes_text = " Notes: " + " | ".join(notes_list)
-        
-        booking_summaries.append(f"- {date_str}: {service}{notes_text}")
-    
-    # Create prompt for AI
-    prompt = f"""Create a brief, natural-sounding summary of this client's history with our trades business.
+def _booking_summary_line(booking: Dict) -> str:
+    """One '- d/m/yy: service Notes: a | b' line of the prompt's job history"""
+    service = booking.get('service_type', 'general appointment')
+    notes = booking.get('notes')
+    notes_text = (" Notes: " + " | ".join(note['note'] for note in notes)) if notes else ""
+    return f"- {format_date_short(booking['appointment_time'])}: {service}{notes_text}"
+
+
+_DESCRIPTION_SYSTEM_PROMPT = (
+    "You are a receptionist writing brief client history summaries for a trades business. "
+    "Write naturally and conversationally. Use the appointment dates from the job history, NOT today's date."
+)
+
+_DESCRIPTION_PROMPT = """Create a brief, natural-sounding summary of this client's history with our trades business.
 
 Client name: {first_name}
-Total jobs: {len(bookings)}
+Total jobs: {total}
 
 Job history (oldest to newest):
-{chr(10).join(booking_summaries)}
+{history}
 
 Write a 2-3 sentence summary. Mention the APPOINTMENT DATE (not today's date) for each job.
 Keep it concise and natural. Use "they/their" pronouns. Focus on what work was done and when."""
 
-    response = client_openai.chat.completions.create(
-        model=config.CHAT_MODEL,
-        messages=[
+
+def _build_description_request(client: Dict, bookings: List[Dict]) -> Tuple[str, Dict]:
+    """
+    Build the chat completion request body for a client's description
+    
+    Returns:
+        (first_name, request body) - the body is shared by the single-call
+        and Batch API paths
+    """
+    # Extract name
+    name_parts = client['name'].split()
+    first_name = name_parts[0].capitalize()
+    
+    # Prepare booking information with notes (bookings arrive oldest first)
+    job_history = "\n".join(_booking_summary_line(booking) for booking in bookings)
+    
+    prompt = _DESCRIPTION_PROMPT.format(first_name=first_name, total=len(bookings), history=job_history)
+
+    body = {
+        "model": config.CHAT_MODEL,
+        "messages": [
             {
                 "role": "system", 
-                "content": "You are a receptionist writing brief client history summaries for a trades business. Write naturally and conversationally. Use the appointment dates from the job history, NOT today's date."
+                "content": _DESCRIPTION_SYSTEM_PROMPT
             },
             {
                 "role": "user",
                 "content": prompt
             }
         ],
-        temperature=0.7,
+        "temperature": 0.7,
         **config.max_tokens_param(value=150)
-    )
+    }
+    return first_name, body
+
+
+def _generate_ai_description(client: Dict, bookings: List[Dict]) -> str:
+    """
+    Use GPT-4o-mini to generate a natural description from appointment history
+    """
+    client_openai = get_openai_client()
+    first_name, body = _build_description_request(client, bookings)
+    
+    # Stream so we can hang up as soon as the summary is long enough
+    # instead of waiting out the rest of the token budget
+    stream = client_openai.chat.completions.create(**body, stream=True)
+    parts = []
+    try:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            parts.append(delta)
+            text = "".join(parts)
+            ends = list(_SENTENCE_END_RE.finditer(text))
+            if len(ends) >= MAX_DESCRIPTION_SENTENCES:
+                parts = [text[:ends[MAX_DESCRIPTION_SENTENCES - 1].end()]]
+                break
+    finally:
+        stream.close()
     
-    description = response.choices[0].message.content.strip()
-    print(f"✅ AI-generated description for {first_name}")
+    description = "".join(parts).strip()
+    if not description:
+        raise ValueError("Empty description returned by model")
+    logger.debug("✅ AI-generated description for %s", first_name)
     return description
 
 
+def _generate_ai_descriptions_bulk(pairs: List[Tuple[int, Dict, List[Dict]]],
+                                   poll_interval: float = 30.0,
+                                   max_wait: float = 24 * 3600) -> Dict[int, str]:
+    """
+    Generate descriptions for many clients through the OpenAI Batch API
+    
+    Batch jobs are billed at half the synchronous rate but may take up to the
+    24h completion window, so this is only used for bulk refreshes. On-demand
+    updates keep using _generate_ai_description.
+    
+    Args:
+        pairs: (client_id, client, bookings) tuples
+        poll_interval: Seconds between batch status checks
+        max_wait: Give up polling after this many seconds
+        
+    Returns:
+        Dict of client_id -> description for every request that succeeded
+    """
+    if not pairs:
+        return {}
+    
+    client_openai = get_openai_client()
+    
+    lines = []
+    for client_id, client, bookings in pairs:
+        _, body = _build_description_request(client, bookings)
+        lines.append(json.dumps({
+            "custom_id": str(client_id),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": body,
+        }))
+    
+    input_file = client_openai.files.create(
+        file=("client_descriptions.jsonl", io.BytesIO("\n".join(lines).encode("utf-8"))),
+        purpose="batch"
+    )
+    batch = client_openai.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    logger.info("📦 Submitted description batch %s (%d clients)", batch.id, len(pairs))
+    
+    deadline = time.monotonic() + max_wait
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        if time.monotonic() > deadline:
+            logger.warning("⚠️ Description batch %s still %s after %.0fs, giving up", batch.id, batch.status, max_wait)
+            return {}
+        time.sleep(poll_interval)
+        batch = client_openai.batches.retrieve(batch.id)
+    
+    if batch.status != "completed" or not batch.output_file_id:
+        logger.warning("⚠️ Description batch %s ended with status %s", batch.id, batch.status)
+        return {}
+    
+    descriptions = {}
+    output = client_openai.files.content(batch.output_file_id).text
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        result = json.loads(line)
+        response = result.get("response") or {}
+        if response.get("status_code") != 200:
+            continue
+        try:
+            content = response["body"]["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
+            continue
+        if content:
+            descriptions[int(result["custom_id"])] = content.strip()
+    
+    logger.info("✅ Description batch %s returned %d/%d results", batch.id, len(descriptions), len(pairs))
+    return descriptions
+
+
+# Service types too vague to mention in a template description
+_GENERIC_SERVICES = frozenset({'general', 'appointment', 'n/a'})
+
+
 def _generate_template_description(client: Dict, bookings: List[Dict]) -> str:
     """
     Template-based description generation (fallback when AI is unavailable)
     """
     # Get first and last visits
-    first_booking = bookings[-1]  # Oldest (last in the list)
-    last_booking = bookings[0]    # Most recent (first in the list)
+    first_booking = bookings[0]   # Oldest (first in the list)
+    last_booking = bookings[-1]   # Most recent (last in the list)
     total_visits = len(bookings)
     
     # Extract name parts
     name_parts = client['name'].split()
     first_name = name_parts[0].capitalize()
     
-    # Get service types (reasons for visits)
-    service_types = []
-    for booking in bookings:
-        service = booking.get('service_type', 'general appointment')
-        if service and service.lower() not in ['general', 'appointment', 'n/a']:
-            service_types.append(service.lower())
-    
-    # Remove duplicates while preserving order
-    unique_services = []
-    seen = set()
-    for service in service_types:
-        if service not in seen:
-            unique_services.append(service)
-            seen.add(service)
+    # Get service types (reasons for visits), de-duplicated in order
+    unique_services = list(dict.fromkeys(
+        service
+        for booking in bookings
+        if (service := (booking.get('service_type', 'general appointment') or '').lower())
+        and service not in _GENERIC_SERVICES
+    ))
     
     # Format dates
     first_visit_date = format_date_short(first_booking['appointment_time'])
@@ -239,39 +449,45 @@ def update_client_description(client_id: int, company_id: int = None) -> bool:
         True if successful, False otherwise
     """
     try:
-        print(f"\\n{'='*60}")
-        print(f"🤖 Starting description update for client {client_id}" + (f" (company_id: {company_id})" if company_id else ""))
-        print(f"{'='*60}")
+        logger.debug("🤖 Starting description update for client %s (company_id: %s)", client_id, company_id)
+        
+        from src.services.database import get_database
+        db = get_database()
+        
+        # Filter by company_id for data isolation
+        client, bookings = _load_client_history(db, client_id, company_id)
+        
+        description = None
+        if bookings:
+            sig = _history_signature(client, bookings)
+            if client.get('description') and client.get('description_sig') == sig:
+                logger.debug("⏭️ Client %s history unchanged since last description, skipping regeneration", client_id)
+                return True
+            description, from_ai = _describe_client(client, bookings, sig=sig)
         
-        description = generate_client_description(client_id, company_id=company_id)
         if description:
-            print(f"✅ Generated description ({len(description)} chars)")
-            print(f"📝 Preview: {description[:100]}...")
+            logger.debug("📝 Preview: %.100s...", description)
             
-            from src.services.database import get_database
-            db = get_database()
-            db.update_client_description(client_id, description, company_id=company_id)
-            print(f"💾 Saved to database for client {client_id}")
-            print(f"{'='*60}\\n")
+            db.update_client_description(client_id, description, company_id=company_id,
+                                         description_sig=sig if from_ai else None)
+            logger.info("💾 Saved description for client %s (%d chars)", client_id, len(description))
             return True
         else:
-            print(f"⚠️ No description generated (possibly no bookings)")
-            print(f"{'='*60}\\n")
+            logger.info("⚠️ No description generated for client %s (possibly no bookings)", client_id)
             return False
     except Exception as e:
-        print(f"❌ Error updating description for client {client_id}: {e}")
-        import traceback
-        traceback.print_exc()
-        print(f"{'='*60}\\n")
+        logger.exception("❌ Error updating description for client %s: %s", client_id, e)
         return False
 
 
-def update_all_client_descriptions(company_id: int = None) -> int:
+def update_all_client_descriptions(company_id: int = None, use_batch: bool = False) -> int:
     """
     Update descriptions for all clients who have bookings
     
     Args:
         company_id: Optional company ID to filter clients (for multi-tenant isolation)
+        use_batch: Submit through the OpenAI Batch API (half price, but can
+            take hours to complete) - intended for scheduled nightly refreshes
     
     Returns:
         Number of descriptions updated
@@ -281,11 +497,55 @@ def update_all_client_descriptions(company_id: int = None) -> int:
     # MUST filter by company_id for proper multi-tenant data isolation
     all_clients = db.get_all_clients(company_id=company_id)
     
+    if not all_clients:
+        return 0
+    
+    if use_batch:
+        return _update_client_descriptions_batch(db, all_clients, company_id)
+    
+    # Each update is an independent OpenAI round-trip, so run them concurrently
     updated_count = 0
-    for client in all_clients:
-        if update_client_description(client['id'], company_id=company_id):
-            updated_count += 1
+    with ThreadPoolExecutor(max_workers=min(DESCRIPTION_WORKERS, len(all_clients))) as executor:
+        futures = [
+            executor.submit(update_client_description, client['id'], company_id=company_id)
+            for client in all_clients
+        ]
+        for future in as_completed(futures):
+            if future.result():
+                updated_count += 1
     
-    print(f"\n✅ Updated {updated_count} client descriptions" + (f" for company {company_id}" if company_id else ""))
+    logger.info("✅ Updated %d client descriptions (company_id: %s)", updated_count, company_id)
     return updated_count
 
+
+def _update_client_descriptions_batch(db, all_clients: List[Dict], company_id: int = None) -> int:
+    """Batch API variant of update_all_client_descriptions"""
+    pairs = []
+    sigs = {}
+    for summary in all_clients:
+        client, bookings = _load_client_history(db, summary['id'], company_id)
+        if not bookings:
+            continue
+        sig = _history_signature(client, bookings)
+        if client.get('description') and client.get('description_sig') == sig:
+            continue
+        pairs.append((client['id'], client, bookings))
+        sigs[client['id']] = sig
+    
+    try:
+        generated = _generate_ai_descriptions_bulk(pairs)
+    except Exception as e:
+        logger.warning("⚠️ Batch description generation failed, falling back to templates: %s", e)
+        generated = {}
+    
+    updated_count = 0
+    for client_id, client, bookings in pairs:
+        description = generated.get(client_id)
+        # Template fallbacks are stored unsigned so the next refresh retries the AI
+        sig = sigs[client_id] if description else None
+        description = description or _generate_template_description(client, bookings)
+        db.update_client_description(client_id, description, company_id=company_id, description_sig=sig)
+        updated_count += 1
+    
+    logger.info("✅ Updated %d client descriptions via batch (company_id: %s)", updated_count, company_id)
+    return updated_count
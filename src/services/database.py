@@ -2,9 +2,9 @@
 Database module for AI Trades Receptionist
 Uses PostgreSQL via DATABASE_URL environment variable
 """
+import atexit
 import os
 import threading
-from typing import Optional
 
 
 # Ensure PostgreSQL is configured
@@ -33,6 +33,17 @@ _db = None
 _db_lock = threading.Lock()
 
 
+def _close_database():
+    """
+    atexit hook: there is one pool for the life of the process, so hand its
+    connections back to the server on exit instead of leaving them to time out
+    """
+    try:
+        _db.close()
+    except Exception as e:
+        print(f"[WARNING] Could not close database pool on exit: {e}")
+
+
 def get_database():
     """
     Get or create global database instance (thread-safe)
@@ -55,11 +66,15 @@ def get_database():
                     wrapper = object.__new__(PostgreSQLDatabaseWrapper)
                     wrapper.database_url = db_url
                     wrapper._pool_lock = threading.Lock()
+                    wrapper._idle_since = {}
                     from psycopg2 import pool as psycopg2_pool
+                    from src.services.db_postgres_wrapper import DB_SESSION_OPTIONS, DB_POOL_MIN, DB_POOL_MAX
                     wrapper.connection_pool = psycopg2_pool.ThreadedConnectionPool(
-                        minconn=2, maxconn=10, dsn=db_url
+                        minconn=DB_POOL_MIN, maxconn=DB_POOL_MAX, dsn=db_url,
+                        **({'options': DB_SESSION_OPTIONS} if DB_SESSION_OPTIONS else {})
                     )
                     wrapper.use_postgres = True
                     _db = wrapper
                     print("[SUCCESS] Connected to PostgreSQL database (skipped init)")
+                atexit.register(_close_database)
     return _db
@@ -393,7 +393,14 @@ class DatabaseCalendarService:
             Booking dict if found, None otherwise
         """
         # MUST filter by company_id for data isolation
-        all_bookings = self.db.get_all_bookings(company_id=self.company_id)
+        if appointment_time:
+            # Indexed lookup of just the bookings around that time instead of
+            # scanning the company's whole booking history
+            all_bookings = self.db.get_bookings_near_time(
+                _make_naive(appointment_time), company_id=self.company_id, tolerance_minutes=5
+            )
+        else:
+            all_bookings = self.db.get_all_bookings(company_id=self.company_id)
         
         for booking in all_bookings:
             if booking.get('status') in ['cancelled', 'completed']:
@@ -3,22 +3,319 @@ PostgreSQL Database Wrapper
 Primary database layer for the application using PostgreSQL
 """
 import os
+import re
 import psycopg2
-from psycopg2.extras import RealDictCursor, Json
+from psycopg2.extensions import connection as _PgConnection
+from psycopg2.extras import RealDictCursor, Json, execute_values
 from psycopg2 import pool as psycopg2_pool
-from datetime import datetime
+from datetime import datetime, date, timedelta
 from typing import List, Dict, Optional, Any
 from contextlib import contextmanager
+from functools import lru_cache, wraps
 import threading
 
+from src.utils.ttl_cache import TTLCache
+
+
+def _phone_variants(phone: str) -> List[str]:
+    """
+    Stored formats a phone number might match, for SQL IN lookups
+    e.g. +353851234567 -> also 0851234567, 353851234567
+    """
+    if not phone:
+        return []
+    cleaned = re.sub(r'[^\d+]', '', phone.strip())
+    if cleaned.startswith('0') and len(cleaned) == 10:
+        cleaned = '+353' + cleaned[1:]
+    elif cleaned.startswith('353') and not cleaned.startswith('+'):
+        cleaned = '+' + cleaned
+    elif cleaned.startswith('00'):
+        cleaned = '+' + cleaned[2:]
+    if not cleaned:
+        return []
+    
+    variants = {phone.strip(), cleaned}
+    if cleaned.startswith('+353'):
+        variants.add('0' + cleaned[4:])
+        variants.add('353' + cleaned[4:])
+    return [p for p in variants if p]
+
+
+# appointment_notes columns selected alongside b.* when notes are joined onto
+# bookings; aliased so they can't collide with booking columns
+_JOINED_NOTE_COLUMNS = """
+    an.id AS note_id, an.note AS note_note, an.created_by AS note_created_by,
+    an.created_at AS note_created_at, an.updated_at AS note_updated_at
+"""
+
+
+# Columns update_client / update_booking may SET from caller kwargs; the
+# names are interpolated into the SQL, so anything else is ignored
+_CLIENT_UPDATE_FIELDS = frozenset({
+    'name', 'phone', 'email', 'date_of_birth', 'description', 'address', 'eircode',
+})
+_BOOKING_UPDATE_FIELDS = frozenset({
+    'calendar_event_id', 'appointment_time', 'service_type',
+    'status', 'phone_number', 'email', 'charge', 'charge_max', 'payment_status',
+    'payment_method', 'urgency', 'address', 'eircode', 'property_type',
+    'duration_minutes', 'address_audio_url', 'requires_callout', 'requires_quote',
+    'photo_urls', 'job_started_at', 'job_completed_at', 'actual_duration_minutes',
+    'status_label', 'recurrence_pattern', 'recurrence_end_date', 'parent_booking_id',
+    'emergency_status', 'emergency_accepted_by', 'emergency_accepted_at',
+})
+
+
+def _naive_datetime(value):
+    """
+    A booking timestamp as a naive datetime. Rows from Postgres are already
+    datetimes, so that case costs one isinstance check; strings go straight
+    to fromisoformat, which reads a trailing 'Z' itself on Python 3.11+.
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            value = datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+    if getattr(value, 'tzinfo', None) is not None:
+        value = value.replace(tzinfo=None)
+    return value
+
+
+# Every employees column, named so reads keep the same shape when a
+# migration adds one
+_EMPLOYEE_COLUMNS = """
+    id, company_id, name, phone, email, trade_specialty, status, image_url,
+    weekly_hours_expected, work_schedule, created_at, updated_at
+"""
+
+def _range_bound(value, end: bool = False):
+    """
+    A schedule range bound as a naive datetime. A bare date (date object or
+    'YYYY-MM-DD') as the end bound means "through that day", so it becomes
+    midnight after it - callers then compare with a half-open [start, end).
+    """
+    if value is None:
+        return None
+    bare_date = (isinstance(value, date) and not isinstance(value, datetime)) or \
+        (isinstance(value, str) and len(value.strip()) == 10)
+    if isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    value = _naive_datetime(value.strip() if isinstance(value, str) else value)
+    if end and bare_date:
+        value += timedelta(days=1)
+    return value
+
+
+# Columns find_client_by_phone returns - the client fields the call flow
+# uses, not the whole row (no description_sig, name_normalized, ...)
+_CLIENT_PHONE_COLUMNS = (
+    'id, company_id, name, phone, email, address, eircode, first_visit, last_visit, '
+    'total_appointments, created_at, updated_at, date_of_birth, description'
+)
+
+# What makes two clients the same client: the idx_clients_identity unique
+# index and the ON CONFLICT target of inserts into clients. A plain
+# UNIQUE(company_id, name, phone, email) treats NULLs as distinct, so it let
+# the same name with no phone / email be added over and over.
+_CLIENT_IDENTITY = "(company_id, name, COALESCE(phone, ''), COALESCE(email, ''))"
+# ...and the constraint it replaces, still the conflict target on a database
+# where idx_clients_identity couldn't be built (see init_database)
+_CLIENT_LEGACY_IDENTITY = "(company_id, name, phone, email)"
+
+# Columns update_employee may SET, in the order they appear in its SQL
+_EMPLOYEE_UPDATE_COLUMNS = (
+    'name', 'phone', 'email', 'trade_specialty', 'status', 'image_url', 'weekly_hours_expected',
+)
+
+
+@lru_cache(maxsize=None)
+def _employee_update_statement(columns: tuple) -> tuple:
+    """
+    (prepared statement name, SQL) updating these employee columns, built
+    once per column set - at most 127 - so the text is identical every time
+    and _execute_prepared can reuse the plan.
+    """
+    mask = sum(1 << _EMPLOYEE_UPDATE_COLUMNS.index(c) for c in columns)
+    assignments = ', '.join(f"{c} = %s" for c in columns)
+    return (f"update_employee_{mask}",
+            f"UPDATE employees SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE id = %s")
+
+
+# _CLIENT_UPDATE_FIELDS in a fixed order, so each column set has one SQL text
+_CLIENT_UPDATE_COLUMNS = tuple(sorted(_CLIENT_UPDATE_FIELDS))
+
+
+@lru_cache(maxsize=None)
+def _client_update_statement(columns: tuple) -> tuple:
+    """
+    (prepared statement name, SQL) updating these client columns - the
+    update_client counterpart of _employee_update_statement. A hand-edited
+    description also clears description_sig so it isn't treated as generated.
+    """
+    mask = sum(1 << _CLIENT_UPDATE_COLUMNS.index(c) for c in columns)
+    assignments = ', '.join(f"{c} = %s" for c in columns)
+    if 'description' in columns:
+        assignments += ", description_sig = NULL"
+    return (f"update_client_{mask}",
+            f"UPDATE clients SET {assignments}, updated_at = %s WHERE id = %s")
+
+
+# _BOOKING_UPDATE_FIELDS in a fixed order, likewise
+_BOOKING_UPDATE_COLUMNS = tuple(sorted(_BOOKING_UPDATE_FIELDS))
+
+
+@lru_cache(maxsize=None)
+def _booking_update_statement(columns: tuple) -> tuple:
+    """(prepared statement name, SQL) updating these booking columns - see
+    _employee_update_statement"""
+    mask = sum(1 << _BOOKING_UPDATE_COLUMNS.index(c) for c in columns)
+    assignments = ', '.join(f"{c} = %s" for c in columns)
+    return (f"update_booking_{mask}",
+            f"UPDATE bookings SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE id = %s")
+
+
+def _group_booking_notes(rows) -> List[Dict]:
+    """
+    Fold bookings LEFT JOIN appointment_notes rows (ordered by booking) into
+    booking dicts with a 'notes' list, the same shape as a booking plus
+    get_appointment_notes(booking_id).
+    """
+    bookings = []
+    current = None
+    for row in rows:
+        row = dict(row)
+        note_id = row.pop('note_id')
+        note = {
+            'id': note_id,
+            'booking_id': row['id'],
+            'note': row.pop('note_note'),
+            'created_by': row.pop('note_created_by'),
+            'created_at': row.pop('note_created_at'),
+            'updated_at': row.pop('note_updated_at'),
+        }
+        if current is None or current['id'] != row['id']:
+            current = row
+            current['notes'] = []
+            bookings.append(current)
+        if note_id is not None:
+            current['notes'].append(note)
+    return bookings
+
+
+# Run first in a write transaction whose commit needn't wait for the WAL
+# flush. A server crash can lose the last few hundred ms of such writes
+# (never corrupts anything), so only use it for low-value, high-volume
+# rows like call logs - not bookings, clients or notes.
+_ASYNC_COMMIT = "SET LOCAL synchronous_commit = off"
+
+
+# Server-side prepared statements for the hottest fixed lookups (see
+# _execute_prepared). Off by default: transaction-pooling proxies such as
+# pgbouncer don't keep a PREPAREd statement on the backend that runs EXECUTE,
+# and a SELECT * statement errors once another process adds a column to its
+# table, until this process restarts - only enable with a direct connection
+# and migrations run before the workers start. Queries whose text depends on
+# optional filters get one name per variant.
+USE_PREPARED_STATEMENTS = os.getenv('DB_PREPARED_STATEMENTS', '').lower() in ('1', 'true', 'yes')
+
+
+# Session settings sent in the connection startup packet, so every pooled
+# connection has them without an extra round-trip. lock_timeout makes a write
+# stuck behind another transaction's row lock fail after 5s instead of tying
+# up a request (and a pool slot) indefinitely; idle_in_transaction_session_
+# timeout ends sessions that left a transaction open, releasing their locks.
+# jit=off: every query here is a short indexed lookup or small report, and
+# once the planner's cost estimate crosses jit_above_cost (easy on the
+# bookings joins) LLVM compilation costs more than the query itself.
+# Set DB_SESSION_OPTIONS= (empty) behind a pooler that rejects startup options.
+DB_SESSION_OPTIONS = os.getenv(
+    'DB_SESSION_OPTIONS', '-c lock_timeout=5s -c idle_in_transaction_session_timeout=60s -c jit=off'
+)
+
+
+# Connections per process. The default suits the Starter tier's connection
+# limit with a couple of workers; with more headroom raise DB_POOL_MAX so
+# request threads and the media handler's to_thread calls don't queue on
+# the pool (each worker process has its own).
+DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', '2'))
+DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', '10'))
+
+
+# get_client / find_client_by_phone results. One call looks the same client
+# up several times, and it rarely changes mid-call. Every client or notes
+# write here invalidates it; writes from other workers (or raw SQL) show up
+# once the short TTL runs out.
+_client_cache = TTLCache(ttl_seconds=30)
+
+# get_employee rows. Read for every assignment, availability and shift check;
+# edited from the dashboard now and then. Same invalidation rules as above.
+_employee_cache = TTLCache(ttl_seconds=60)
+
+
+class _PreparingConnection(_PgConnection):
+    """psycopg2 connection that remembers which statements it has PREPAREd"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements = set()
+
+
+def _execute_prepared(cursor, name: str, sql: str, params: tuple):
+    """
+    Execute a fixed query through a named server-side prepared statement, so
+    Postgres parses and plans it once per connection instead of every call.
+    Falls back to a plain execute when disabled or on connections that
+    don't track their statements (e.g. the pool-exhausted fallback).
+    """
+    prepared = getattr(cursor.connection, 'prepared_statements', None)
+    if not USE_PREPARED_STATEMENTS or prepared is None:
+        cursor.execute(sql, params)
+        return
+    if name not in prepared:
+        counter = iter(range(1, len(params) + 1))
+        cursor.execute(f"PREPARE {name} AS " + re.sub(r'%s', lambda _: f"${next(counter)}", sql))
+        prepared.add(name)
+    cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+
+
+def _row_dicts(method=None, *, one: bool = False):
+    """
+    For plain lookups: the decorated method returns (sql, params) and this
+    runs it on an acquire_read() connection, returning a list of row dicts
+    (or with one=True the first row's dict, None if there isn't one).
+    """
+    def decorate(build):
+        @wraps(build)
+        def wrapper(self, *args, **kwargs):
+            sql, params = build(self, *args, **kwargs)
+            with self.acquire_read() as conn:
+                cursor = conn.cursor(cursor_factory=RealDictCursor)
+                cursor.execute(sql, params)
+                if one:
+                    row = cursor.fetchone()
+                    return dict(row) if row else None
+                return [dict(row) for row in cursor]
+        return wrapper
+    return decorate(method) if method else decorate
+
 
 class PostgreSQLDatabaseWrapper:
     """PostgreSQL database wrapper"""
     
+    # A connection handed back to the pool less than this many seconds ago is
+    # reused without the SELECT 1 liveness probe - TCP keepalives and the
+    # probe on longer-idle connections still catch dead sockets
+    PING_AFTER_IDLE_SECONDS = 30
+    
+    # ON CONFLICT target for client inserts; init_database falls back to
+    # _CLIENT_LEGACY_IDENTITY when idx_clients_identity can't be built
+    _client_conflict_target = _CLIENT_IDENTITY
+    
     def __init__(self, database_url: str):
         """Initialize PostgreSQL connection pool"""
         self.database_url = database_url
         self._pool_lock = threading.Lock()
+        self._idle_since = {}  # id(conn) -> monotonic time it was returned
         
         # Add connection options for resilience
         # - connect_timeout: fail fast on initial connect
@@ -34,24 +331,50 @@ class PostgreSQLDatabaseWrapper:
         }
         
         # Build DSN with options
-        if '?' in database_url:
-            dsn = database_url
-        else:
+        def with_options(url):
+            if '?' in url:
+                return url
             option_str = '&'.join(f'{k}={v}' for k, v in connect_options.items())
-            dsn = f"{database_url}?{option_str}"
+            return f"{url}?{option_str}"
         
         # Use ThreadedConnectionPool for thread-safety with gevent workers
         self.connection_pool = psycopg2_pool.ThreadedConnectionPool(
-            minconn=2,  # Keep connections warm for each worker
-            maxconn=10,  # Reasonable for Starter tier
-            dsn=dsn
+            minconn=DB_POOL_MIN,  # Keep connections warm for each worker
+            maxconn=DB_POOL_MAX,
+            dsn=with_options(database_url),
+            connection_factory=_PreparingConnection,
+            **({'options': DB_SESSION_OPTIONS} if DB_SESSION_OPTIONS else {})
         )
         self.use_postgres = True  # Flag for compatibility
-        print(f"[SUCCESS] PostgreSQL ThreadedConnectionPool initialized (1-10 connections)")
+        print(f"[SUCCESS] PostgreSQL ThreadedConnectionPool initialized ({DB_POOL_MIN}-{DB_POOL_MAX} connections)")
+        
+        # Optional read replica (DATABASE_READ_URL) for dashboard reads that
+        # can lag the primary by a moment - see acquire_replica
+        self.read_pool = None
+        read_url = os.getenv('DATABASE_READ_URL')
+        if read_url:
+            try:
+                self.read_pool = psycopg2_pool.ThreadedConnectionPool(
+                    minconn=1,
+                    maxconn=DB_POOL_MAX,
+                    dsn=with_options(read_url),
+                    **({'options': DB_SESSION_OPTIONS} if DB_SESSION_OPTIONS else {})
+                )
+                print("[SUCCESS] PostgreSQL read replica pool initialized")
+            except psycopg2.OperationalError as e:
+                # A replica that's down at startup shouldn't stop the app -
+                # acquire_replica serves everything from the primary instead
+                print(f"[WARNING] Read replica unreachable, using the primary for all reads: {e}")
         self.init_database()
     
-    def get_connection(self):
-        """Get connection from pool with timeout to prevent indefinite blocking"""
+    def get_connection(self, autocommit: bool = False):
+        """Get connection from pool with timeout to prevent indefinite blocking.
+        
+        autocommit=True is for single-purpose reads: psycopg2 otherwise sends
+        a BEGIN before the first query and the pool a ROLLBACK when the
+        connection goes back, two extra round-trips for a lookup. Never use
+        it where statements must commit together. return_connection resets it.
+        """
         import time as time_module
         max_wait = 5.0  # Max seconds to wait for a connection
         start_time = time_module.time()
@@ -59,6 +382,14 @@ class PostgreSQLDatabaseWrapper:
         while True:
             try:
                 conn = self.connection_pool.getconn()
+                if not conn.closed and conn.autocommit != autocommit:
+                    # Before the ping, so the ping itself doesn't open a transaction
+                    conn.autocommit = autocommit
+                idle_since = self._idle_since.pop(id(conn), None)
+                if idle_since is not None and not conn.closed and \
+                        time_module.monotonic() - idle_since < self.PING_AFTER_IDLE_SECONDS:
+                    # Just used - skip the extra round-trip
+                    return conn
                 # Test connection is still alive
                 try:
                     conn.cursor().execute("SELECT 1")
@@ -69,27 +400,131 @@ class PostgreSQLDatabaseWrapper:
                     except Exception:
                         pass
                     conn = self.connection_pool.getconn()
+                    conn.autocommit = autocommit
                 return conn
             except psycopg2_pool.PoolError as e:
                 elapsed = time_module.time() - start_time
                 if elapsed > max_wait:
                     # Pool exhausted and timeout reached - create direct connection as fallback
                     print(f"[WARNING] Connection pool exhausted after {elapsed:.1f}s, creating direct connection: {e}")
-                    return psycopg2.connect(self.database_url, connect_timeout=10)
+                    conn = psycopg2.connect(self.database_url, connect_timeout=10,
+                                            **({'options': DB_SESSION_OPTIONS} if DB_SESSION_OPTIONS else {}))
+                    conn.autocommit = autocommit
+                    return conn
                 # Brief sleep before retry
                 time_module.sleep(0.1)
     
     def return_connection(self, conn):
         """Return connection to pool"""
+        import time as time_module
         try:
+            # Stamped before putconn so another thread can't check it out first
+            if not conn.closed:
+                if conn.autocommit:
+                    conn.autocommit = False
+                self._idle_since[id(conn)] = time_module.monotonic()
             self.connection_pool.putconn(conn)
+            if conn.closed:
+                # The pool already held its minimum of idle connections and
+                # closed this one instead of keeping it
+                self._idle_since.pop(id(conn), None)
         except Exception as e:
+            self._idle_since.pop(id(conn), None)
             # Connection might not belong to pool (fallback connection)
             try:
                 conn.close()
             except Exception:
                 pass
     
+    @contextmanager
+    def acquire(self, autocommit: bool = False):
+        """Check out a pooled connection for the duration of a with-block.
+
+        Always handed back, even if the block raises; committing or
+        rolling back stays with the caller.
+        """
+        conn = self.get_connection(autocommit=autocommit)
+        try:
+            yield conn
+        finally:
+            self.return_connection(conn)
+
+    def acquire_read(self):
+        """acquire() for lookups: autocommit, so no BEGIN/ROLLBACK round-trips"""
+        return self.acquire(autocommit=True)
+
+    @contextmanager
+    def acquire_write(self):
+        """acquire() as one transaction: committed if the block finishes,
+        rolled back (and the error re-raised) if it doesn't."""
+        with self.acquire() as conn:
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    @contextmanager
+    def acquire_replica(self):
+        """
+        acquire_read() on the read replica when one is configured. Only for
+        views that tolerate replica lag (an employee's job list, not a read
+        straight after a write). Falls back to the primary when there's no
+        replica, its pool is exhausted, or it can't be reached.
+        """
+        read_pool = getattr(self, 'read_pool', None)
+        conn = None
+        if read_pool is not None:
+            try:
+                conn = read_pool.getconn()
+                if not conn.autocommit:
+                    conn.autocommit = True
+                # Always probed: unlike the primary pool nothing else notices
+                # a replica that has gone away
+                conn.cursor().execute("SELECT 1")
+            except psycopg2_pool.PoolError:
+                conn = None
+            except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+                print(f"[WARNING] Read replica unavailable, reading from the primary: {e}")
+                if conn is not None:
+                    try:
+                        read_pool.putconn(conn, close=True)
+                    except Exception:
+                        pass
+                conn = None
+        if conn is None:
+            with self.acquire_read() as conn:
+                yield conn
+            return
+        try:
+            yield conn
+        finally:
+            # A connection that died mid-query is dropped, not handed out again
+            read_pool.putconn(conn, close=bool(conn.closed))
+    
+    def close(self):
+        """Close every pooled connection (for shutdown)"""
+        getattr(self, '_idle_since', {}).clear()
+        for pool in (getattr(self, 'connection_pool', None), getattr(self, 'read_pool', None)):
+            if pool is not None:
+                pool.closeall()
+    
+    def _schema_fingerprint(self) -> Optional[str]:
+        """
+        Hash of the schema code (init_database + _run_migrations). Stored in
+        schema_version once applied; any edit to either method changes it, so
+        the next startup runs the full idempotent pass again. None when the
+        source isn't available, which means always run it.
+        """
+        import hashlib
+        import inspect
+        try:
+            source = inspect.getsource(self.init_database) + inspect.getsource(self._run_migrations)
+        except (OSError, TypeError):
+            return None
+        return hashlib.sha256(source.encode()).hexdigest()
+    
     def init_database(self):
         """Initialize database tables with PostgreSQL syntax"""
         conn = self.get_connection()
@@ -100,6 +535,40 @@ class PostgreSQLDatabaseWrapper:
             # (e.g. if another connection holds a lock)
             cursor.execute("SET statement_timeout = '15s'")
             
+            # Skip the whole schema pass if this exact init/migration code has
+            # already run against the database (see _schema_fingerprint)
+            fingerprint = self._schema_fingerprint()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+                    fingerprint TEXT NOT NULL,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                SELECT fingerprint FROM schema_version WHERE id = 1
+            """)
+            applied = cursor.fetchone()
+            if fingerprint and applied and applied['fingerprint'] == fingerprint:
+                conn.commit()
+                print("[SUCCESS] PostgreSQL schema up to date")
+                return
+            
+            if fingerprint:
+                # Workers started together would otherwise all run the DDL at
+                # once and queue on each other's table locks. Take turns (the
+                # lock is held until commit/rollback), and re-check: a worker
+                # that waited usually finds the first one already applied it.
+                cursor.execute("""
+                    SET LOCAL statement_timeout = 0;
+                    SELECT pg_advisory_xact_lock(hashtext('init_database'));
+                    SET LOCAL statement_timeout = '15s';
+                    SELECT fingerprint FROM schema_version WHERE id = 1
+                """)
+                applied = cursor.fetchone()
+                if applied and applied['fingerprint'] == fingerprint:
+                    conn.commit()
+                    print("[SUCCESS] PostgreSQL schema up to date")
+                    return
+            
             # Companies/Users table MUST be created first (other tables reference it)
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS companies (
@@ -167,14 +636,14 @@ class PostgreSQLDatabaseWrapper:
                     email TEXT,
                     date_of_birth DATE,
                     description TEXT,
+                    description_sig TEXT,
                     first_visit DATE,
                     last_visit DATE,
                     total_appointments INTEGER DEFAULT 0,
                     address TEXT,
                     eircode TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(company_id, name, phone, email)
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
             
@@ -269,6 +738,7 @@ class PostgreSQLDatabaseWrapper:
                     status TEXT DEFAULT 'active',
                     image_url TEXT,
                     weekly_hours_expected REAL DEFAULT 40.0,
+                    work_schedule JSONB DEFAULT NULL,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
@@ -287,10 +757,15 @@ class PostgreSQLDatabaseWrapper:
                 )
             """)
             
-            # Index for quick lookups
+            # Only the available numbers, in the order they're handed out:
+            # stays small however many are assigned, and gives
+            # assign_phone_number / get_available_phone_numbers their
+            # ORDER BY created_at without a sort. A status index was
+            # mostly 'assigned' entries.
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_twilio_phone_status 
-                ON twilio_phone_numbers(status)
+                CREATE INDEX IF NOT EXISTS idx_twilio_phone_available
+                ON twilio_phone_numbers(created_at) WHERE status = 'available';
+                DROP INDEX IF EXISTS idx_twilio_phone_status
             """)
             
             cursor.execute("""
@@ -357,30 +832,13 @@ class PostgreSQLDatabaseWrapper:
                 END $$;
             """)
             
-            # Add package_only column if it doesn't exist (migration)
-            cursor.execute("""
-                DO $$ 
-                BEGIN 
-                    IF NOT EXISTS (SELECT 1 FROM information_schema.columns 
-                                   WHERE table_name='services' AND column_name='package_only') THEN
-                        ALTER TABLE services ADD COLUMN package_only BOOLEAN DEFAULT FALSE;
-                    END IF;
-                END $$;
-            """)
-            
-            # Add requires_quote column if it doesn't exist (migration)
-            cursor.execute("""
-                DO $$ 
-                BEGIN 
-                    IF NOT EXISTS (SELECT 1 FROM information_schema.columns 
-                                   WHERE table_name='services' AND column_name='requires_quote') THEN
-                        ALTER TABLE services ADD COLUMN requires_quote BOOLEAN DEFAULT FALSE;
-                    END IF;
-                END $$;
-            """)
-            
-            # Add extended service columns (tags, capacity, deposits, etc.)
-            for _col, _def in [
+            # Columns added to services since it was created (package_only,
+            # requires_quote, then tags, capacity, deposits, etc.) - one ALTER
+            # for all of them: one round-trip and one lock on the table
+            # instead of one per column
+            _service_columns = [
+                ("package_only", "BOOLEAN DEFAULT FALSE"),
+                ("requires_quote", "BOOLEAN DEFAULT FALSE"),
                 ("default_materials", "JSONB DEFAULT '[]'"),
                 ("tags", "JSONB DEFAULT NULL"),
                 ("capacity_min", "INTEGER DEFAULT NULL"),
@@ -393,11 +851,10 @@ class PostgreSQLDatabaseWrapper:
                 ("seasonal_months", "JSONB DEFAULT NULL"),
                 ("ai_notes", "TEXT DEFAULT NULL"),
                 ("follow_up_service_id", "TEXT DEFAULT NULL"),
-            ]:
-                try:
-                    cursor.execute(f"ALTER TABLE services ADD COLUMN IF NOT EXISTS {_col} {_def}")
-                except Exception:
-                    pass
+            ]
+            cursor.execute("ALTER TABLE services " + ", ".join(
+                f"ADD COLUMN IF NOT EXISTS {_col} {_def}" for _col, _def in _service_columns
+            ))
 
             # Service categories table (per-company custom categories)
             cursor.execute("""
@@ -483,29 +940,94 @@ class PostgreSQLDatabaseWrapper:
                 )
             """)
             
-            # Create indexes for better performance
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_clients_phone ON clients(phone)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_clients_email ON clients(email)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_bookings_client_id ON bookings(client_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_bookings_appointment_time ON bookings(appointment_time)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_bookings_status ON bookings(status)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_bookings_calendar_event_id ON bookings(calendar_event_id)")
-
-            # Performance indexes for hot paths (N+1 fixes, dashboard loads, availability checks)
-            # employee_assignments: every availability / employee-jobs query filters on these
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_employee_assignments_employee_id ON employee_assignments(employee_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_employee_assignments_booking_id ON employee_assignments(booking_id)")
-            # Composite index: get_all_bookings + filters typically use (company_id, status, appointment_time)
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_bookings_company_status ON bookings(company_id, status)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_bookings_company_appt_time ON bookings(company_id, appointment_time DESC)")
-            # services filtered by (company_id, active) on almost every load
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_services_company_active ON services(company_id, active)")
-            # call_logs list is ordered by created_at for a company
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_call_logs_company_created ON call_logs(company_id, created_at DESC)")
+            # Create indexes for better performance - one round-trip for the
+            # whole batch (same transaction as the tables above)
+            cursor.execute(";\n".join([
+                "CREATE INDEX IF NOT EXISTS idx_clients_phone ON clients(phone)",
+                "CREATE INDEX IF NOT EXISTS idx_clients_email ON clients(email)",
+                # bookings.client_id is served by idx_bookings_client_time below
+                "DROP INDEX IF EXISTS idx_bookings_client_id",
+                # Time range first, status alongside: the auto-complete sweep
+                # (status != 'completed' AND appointment_time < cutoff, in
+                # time order) is answered from the index alone
+                "CREATE INDEX IF NOT EXISTS idx_bookings_appt_status ON bookings(appointment_time, status)",
+                "DROP INDEX IF EXISTS idx_bookings_appointment_time",
+                "CREATE INDEX IF NOT EXISTS idx_bookings_status ON bookings(status)",
+                # Duplicate of the UNIQUE(calendar_event_id) index - only slowed inserts
+                "DROP INDEX IF EXISTS idx_bookings_calendar_event_id",
+
+                # Performance indexes for hot paths (N+1 fixes, dashboard loads, availability checks)
+                # employee_assignments: every availability / employee-jobs query filters on these
+                # (employee_id, booking_id) so the join to bookings never visits the heap
+                "CREATE INDEX IF NOT EXISTS idx_employee_assignments_employee_booking ON employee_assignments(employee_id, booking_id)",
+                "DROP INDEX IF EXISTS idx_employee_assignments_employee_id",
+                "CREATE INDEX IF NOT EXISTS idx_employee_assignments_booking_id ON employee_assignments(booking_id)",
+                # Composite index: get_all_bookings + filters typically use (company_id, status, appointment_time)
+                "CREATE INDEX IF NOT EXISTS idx_bookings_company_status ON bookings(company_id, status)",
+                "CREATE INDEX IF NOT EXISTS idx_bookings_company_appt_time ON bookings(company_id, appointment_time DESC)",
+                # services filtered by (company_id, active) on almost every load
+                "CREATE INDEX IF NOT EXISTS idx_services_company_active ON services(company_id, active)",
+                # call_logs list is ordered by created_at for a company
+                "CREATE INDEX IF NOT EXISTS idx_call_logs_company_created ON call_logs(company_id, created_at DESC)",
+                # A client's booking history in date order (description generation),
+                # and any lookup or cascade by client_id alone
+                "CREATE INDEX IF NOT EXISTS idx_bookings_client_time ON bookings(client_id, appointment_time)",
+                # Notes are always fetched per client / per booking in date order
+                # (get_client_notes, get_appointment_notes, client deletes)
+                "CREATE INDEX IF NOT EXISTS idx_notes_client_created ON notes(client_id, created_at)",
+                "CREATE INDEX IF NOT EXISTS idx_appointment_notes_booking_created ON appointment_notes(booking_id, created_at)",
+            ]))
+
+            # Client identity index (see _CLIENT_IDENTITY), replacing the
+            # NULL-blind UNIQUE constraint. Existing same-name clients with no
+            # phone / email stop it building until they're merged, so a
+            # failure keeps the old constraint (and conflict target) rather
+            # than aborting the init - and leaves the fingerprint unrecorded
+            # so the next startup tries again.
+            cursor.execute("SAVEPOINT sp_client_identity")
+            try:
+                cursor.execute(f"""
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_clients_identity ON clients {_CLIENT_IDENTITY};
+                    ALTER TABLE clients DROP CONSTRAINT IF EXISTS clients_company_id_name_phone_email_key
+                """)
+                cursor.execute("RELEASE SAVEPOINT sp_client_identity")
+            except Exception as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT sp_client_identity")
+                print(f"[WARNING] Could not create idx_clients_identity (duplicate clients?): {e}")
+                self._client_conflict_target = _CLIENT_LEGACY_IDENTITY
+                fingerprint = None
 
             # Run migrations for new columns
             self._run_migrations(cursor)
             
+            # Fresh planner statistics for the new indexes (only runs when
+            # the schema changed - see the fingerprint check above)
+            cursor.execute("ANALYZE bookings; ANALYZE employee_assignments")
+            # Keep them fresh: autovacuum re-analyzes a table once 10% of it
+            # has changed by default, which lags badly as these two grow.
+            # 2% (plus a floor of 500 rows) keeps the planner on the
+            # composite indexes without any work on the request path. Needs
+            # table ownership, so a refusal mustn't abort the whole init.
+            cursor.execute("SAVEPOINT sp_autovacuum")
+            try:
+                cursor.execute("""
+                    ALTER TABLE bookings SET (autovacuum_analyze_scale_factor = 0.02,
+                                              autovacuum_analyze_threshold = 500);
+                    ALTER TABLE employee_assignments SET (autovacuum_analyze_scale_factor = 0.02,
+                                                          autovacuum_analyze_threshold = 500)
+                """)
+                cursor.execute("RELEASE SAVEPOINT sp_autovacuum")
+            except Exception as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT sp_autovacuum")
+                print(f"[WARNING] Could not tune autovacuum analyze thresholds: {e}")
+            
+            if fingerprint:
+                cursor.execute("""
+                    INSERT INTO schema_version (id, fingerprint) VALUES (1, %s)
+                    ON CONFLICT (id) DO UPDATE SET fingerprint = EXCLUDED.fingerprint,
+                                                   applied_at = CURRENT_TIMESTAMP
+                """, (fingerprint,))
+            
             conn.commit()
             print("[SUCCESS] PostgreSQL database initialized")
         except Exception as e:
@@ -519,16 +1041,36 @@ class PostgreSQLDatabaseWrapper:
         """Run database migrations to add new columns if they don't exist"""
         print("[INFO] Running database migrations...")
         
+        # One information_schema read for every table migrated below,
+        # instead of a query per column checked. Only the schema the tables
+        # are created in - a same-named table elsewhere (another app's schema
+        # on a shared database) must not make a column look present.
+        cursor.execute("""
+            SELECT table_name, column_name FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = ANY(%s)
+        """, ([
+            'appointment_notes', 'booking_stats_monthly', 'bookings', 'business_settings', 'call_logs',
+            'clients', 'companies', 'developer_settings', 'employees', 'notes', 'services',
+        ],))
+        columns = {}
+        for row in cursor.fetchall():
+            columns.setdefault(row['table_name'], set()).add(row['column_name'])
+        
+        def missing_column(table: str, column: str) -> bool:
+            """True if the column needs adding - it's then counted as present,
+            since a failed ALTER aborts the whole init transaction anyway"""
+            present = columns.setdefault(table, set())
+            if column in present:
+                return False
+            present.add(column)
+            return True
+        
         # ============================================
         # CRITICAL: Add company_id to data tables for multi-tenancy
         # ============================================
         
         # Add company_id to clients table
-        cursor.execute("""
-            SELECT column_name FROM information_schema.columns 
-            WHERE table_name = 'clients' AND column_name = 'company_id'
-        """)
-        if not cursor.fetchone():
+        if missing_column('clients', 'company_id'):
             try:
                 cursor.execute("ALTER TABLE clients ADD COLUMN company_id BIGINT REFERENCES companies(id) ON DELETE CASCADE")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_clients_company_id ON clients(company_id)")
@@ -537,11 +1079,7 @@ class PostgreSQLDatabaseWrapper:
                 print(f"[WARNING] Could not add company_id to clients: {e}")
         
         # Add company_id to bookings table
-        cursor.execute("""
-            SELECT column_name FROM information_schema.columns 
-            WHERE table_name = 'bookings' AND column_name = 'company_id'
-        """)
-        if not cursor.fetchone():
+        if missing_column('bookings', 'company_id'):
             try:
                 cursor.execute("ALTER TABLE bookings ADD COLUMN company_id BIGINT REFERENCES companies(id) ON DELETE CASCADE")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_bookings_company_id ON bookings(company_id)")
@@ -550,11 +1088,7 @@ class PostgreSQLDatabaseWrapper:
                 print(f"[WARNING] Could not add company_id to bookings: {e}")
         
         # Add duration_minutes to bookings table for service duration tracking
-        cursor.execute("""
-            SELECT column_name FROM information_schema.columns 
-            WHERE table_name = 'bookings' AND column_name = 'duration_minutes'
-        """)
-        if not cursor.fetchone():
+        if missing_column('bookings', 'duration_minutes'):
             try:
                 cursor.execute("ALTER TABLE bookings ADD COLUMN duration_minutes INTEGER DEFAULT 1440")
                 print("[SUCCESS] Added duration_minutes column to bookings table")
@@ -562,11 +1096,7 @@ class PostgreSQLDatabaseWrapper:
                 print(f"[WARNING] Could not add duration_minutes to bookings: {e}")
         
         # Add company_id to employees table
-        cursor.execute("""
-            SELECT column_name FROM information_schema.columns 
-            WHERE table_name = 'employees' AND column_name = 'company_id'
-        """)
-        if not cursor.fetchone():
+        if missing_column('employees', 'company_id'):
             try:
                 cursor.execute("ALTER TABLE employees ADD COLUMN company_id BIGINT REFERENCES companies(id) ON DELETE CASCADE")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_employees_company_id ON employees(company_id)")
@@ -574,12 +1104,16 @@ class PostgreSQLDatabaseWrapper:
             except Exception as e:
                 print(f"[WARNING] Could not add company_id to employees: {e}")
         
+        # Per-day shift hours (was only added by db_scripts/add_work_schedule_column.py)
+        if missing_column('employees', 'work_schedule'):
+            try:
+                cursor.execute("ALTER TABLE employees ADD COLUMN work_schedule JSONB DEFAULT NULL")
+                print("[SUCCESS] Added work_schedule column to employees table")
+            except Exception as e:
+                print(f"[WARNING] Could not add work_schedule to employees: {e}")
+        
         # Add company_id to notes table
-        cursor.execute("""
-            SELECT column_name FROM information_schema.columns 
-            WHERE table_name = 'notes' AND column_name = 'company_id'
-        """)
-        if not cursor.fetchone():
+        if missing_column('notes', 'company_id'):
             try:
                 cursor.execute("ALTER TABLE notes ADD COLUMN company_id BIGINT REFERENCES companies(id) ON DELETE CASCADE")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_notes_company_id ON notes(company_id)")
@@ -588,11 +1122,7 @@ class PostgreSQLDatabaseWrapper:
                 print(f"[WARNING] Could not add company_id to notes: {e}")
         
         # Add company_id to appointment_notes table
-        cursor.execute("""
-            SELECT column_name FROM information_schema.columns 
-            WHERE table_name = 'appointment_notes' AND column_name = 'company_id'
-        """)
-        if not cursor.fetchone():
+        if missing_column('appointment_notes', 'company_id'):
             try:
                 cursor.execute("ALTER TABLE appointment_notes ADD COLUMN company_id BIGINT REFERENCES companies(id) ON DELETE CASCADE")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_appointment_notes_company_id ON appointment_notes(company_id)")
@@ -601,11 +1131,7 @@ class PostgreSQLDatabaseWrapper:
                 print(f"[WARNING] Could not add company_id to appointment_notes: {e}")
         
         # Add company_id to call_logs table
-        cursor.execute("""
-            SELECT column_name FROM information_schema.columns 
-            WHERE table_name = 'call_logs' AND column_name = 'company_id'
-        """)
-        if not cursor.fetchone():
+        if missing_column('call_logs', 'company_id'):
             try:
                 cursor.execute("ALTER TABLE call_logs ADD COLUMN company_id BIGINT REFERENCES companies(id) ON DELETE CASCADE")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_call_logs_company_id ON call_logs(company_id)")
@@ -614,11 +1140,7 @@ class PostgreSQLDatabaseWrapper:
                 print(f"[WARNING] Could not add company_id to call_logs: {e}")
         
         # Add company_id to services table
-        cursor.execute("""
-            SELECT column_name FROM information_schema.columns 
-            WHERE table_name = 'services' AND column_name = 'company_id'
-        """)
-        if not cursor.fetchone():
+        if missing_column('services', 'company_id'):
             try:
                 cursor.execute("ALTER TABLE services ADD COLUMN company_id BIGINT REFERENCES companies(id) ON DELETE CASCADE")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_services_company_id ON services(company_id)")
@@ -627,11 +1149,7 @@ class PostgreSQLDatabaseWrapper:
                 print(f"[WARNING] Could not add company_id to services: {e}")
         
         # Add company_id to business_settings table
-        cursor.execute("""
-            SELECT column_name FROM information_schema.columns 
-            WHERE table_name = 'business_settings' AND column_name = 'company_id'
-        """)
-        if not cursor.fetchone():
+        if missing_column('business_settings', 'company_id'):
             try:
                 cursor.execute("ALTER TABLE business_settings ADD COLUMN company_id BIGINT REFERENCES companies(id) ON DELETE CASCADE")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_business_settings_company_id ON business_settings(company_id)")
@@ -640,11 +1158,7 @@ class PostgreSQLDatabaseWrapper:
                 print(f"[WARNING] Could not add company_id to business_settings: {e}")
         
         # Add company_id to developer_settings table
-        cursor.execute("""
-            SELECT column_name FROM information_schema.columns 
-            WHERE table_name = 'developer_settings' AND column_name = 'company_id'
-        """)
-        if not cursor.fetchone():
+        if missing_column('developer_settings', 'company_id'):
             try:
                 cursor.execute("ALTER TABLE developer_settings ADD COLUMN company_id BIGINT REFERENCES companies(id) ON DELETE CASCADE")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_developer_settings_company_id ON developer_settings(company_id)")
@@ -656,13 +1170,6 @@ class PostgreSQLDatabaseWrapper:
         # End of multi-tenancy migrations
         # ============================================
         
-        # Check existing columns in companies table
-        cursor.execute("""
-            SELECT column_name FROM information_schema.columns 
-            WHERE table_name = 'companies'
-        """)
-        existing_columns = [row['column_name'] if isinstance(row, dict) else row[0] for row in cursor.fetchall()]
-        
         # New subscription-related columns to add to companies table
         # This ensures all columns used in the code exist in the database
         migrations = {
@@ -731,12 +1238,6 @@ class PostgreSQLDatabaseWrapper:
         }
         
         # Also migrate business_settings table for bank details
-        cursor.execute("""
-            SELECT column_name FROM information_schema.columns 
-            WHERE table_name = 'business_settings'
-        """)
-        bs_existing = [row['column_name'] if isinstance(row, dict) else row[0] for row in cursor.fetchall()]
-        
         bs_migrations = {
             'bank_iban': 'TEXT',
             'bank_bic': 'TEXT',
@@ -768,7 +1269,7 @@ class PostgreSQLDatabaseWrapper:
         }
         
         for col_name, col_type in bs_migrations.items():
-            if col_name not in bs_existing:
+            if missing_column('business_settings', col_name):
                 try:
                     cursor.execute(f"ALTER TABLE business_settings ADD COLUMN {col_name} {col_type}")
                     print(f"[SUCCESS] Added {col_name} column to business_settings table")
@@ -776,7 +1277,7 @@ class PostgreSQLDatabaseWrapper:
                     print(f"[WARNING] Could not add {col_name} to business_settings: {e}")
         
         for column_name, column_type in migrations.items():
-            if column_name not in existing_columns:
+            if missing_column('companies', column_name):
                 try:
                     cursor.execute(f"ALTER TABLE companies ADD COLUMN {column_name} {column_type}")
                     print(f"[SUCCESS] Added {column_name} column to companies table")
@@ -786,11 +1287,7 @@ class PostgreSQLDatabaseWrapper:
         # ============================================
         # Add employees_required column to services table
         # ============================================
-        cursor.execute("""
-            SELECT column_name FROM information_schema.columns 
-            WHERE table_name = 'services' AND column_name = 'employees_required'
-        """)
-        if not cursor.fetchone():
+        if missing_column('services', 'employees_required'):
             try:
                 cursor.execute("ALTER TABLE services ADD COLUMN employees_required INTEGER DEFAULT 1")
                 print("[SUCCESS] Added employees_required column to services table")
@@ -806,7 +1303,7 @@ class PostgreSQLDatabaseWrapper:
             companies = cursor.fetchall()
             
             for company_row in companies:
-                company_id = company_row['id'] if isinstance(company_row, dict) else company_row[0]
+                company_id = company_row['id']
                 
                 # Check if this company has a General service
                 cursor.execute("""
@@ -840,8 +1337,7 @@ class PostgreSQLDatabaseWrapper:
             print(f"[WARNING] Could not run General Service migration: {e}")
         
         # Add address_audio_url column to bookings table
-        cursor.execute("SELECT column_name FROM information_schema.columns WHERE table_name='bookings' AND column_name='address_audio_url'")
-        if not cursor.fetchone():
+        if missing_column('bookings', 'address_audio_url'):
             try:
                 cursor.execute("ALTER TABLE bookings ADD COLUMN address_audio_url TEXT")
                 print("[SUCCESS] Added address_audio_url column to bookings table")
@@ -849,8 +1345,7 @@ class PostgreSQLDatabaseWrapper:
                 print(f"[WARNING] Could not add address_audio_url column: {e}")
         
         # Add reminder_sent column to bookings table (prevents duplicate SMS on redeploy)
-        cursor.execute("SELECT column_name FROM information_schema.columns WHERE table_name='bookings' AND column_name='reminder_sent'")
-        if not cursor.fetchone():
+        if missing_column('bookings', 'reminder_sent'):
             try:
                 cursor.execute("ALTER TABLE bookings ADD COLUMN reminder_sent BOOLEAN DEFAULT FALSE")
                 print("[SUCCESS] Added reminder_sent column to bookings table")
@@ -858,8 +1353,7 @@ class PostgreSQLDatabaseWrapper:
                 print(f"[WARNING] Could not add reminder_sent column: {e}")
         
         # Add requires_callout column to bookings table
-        cursor.execute("SELECT column_name FROM information_schema.columns WHERE table_name='bookings' AND column_name='requires_callout'")
-        if not cursor.fetchone():
+        if missing_column('bookings', 'requires_callout'):
             try:
                 cursor.execute("ALTER TABLE bookings ADD COLUMN requires_callout BOOLEAN DEFAULT FALSE")
                 print("[SUCCESS] Added requires_callout column to bookings table")
@@ -867,8 +1361,7 @@ class PostgreSQLDatabaseWrapper:
                 print(f"[WARNING] Could not add requires_callout column: {e}")
         
         # Add requires_quote column to bookings table
-        cursor.execute("SELECT column_name FROM information_schema.columns WHERE table_name='bookings' AND column_name='requires_quote'")
-        if not cursor.fetchone():
+        if missing_column('bookings', 'requires_quote'):
             try:
                 cursor.execute("ALTER TABLE bookings ADD COLUMN requires_quote BOOLEAN DEFAULT FALSE")
                 print("[SUCCESS] Added requires_quote column to bookings table")
@@ -881,11 +1374,7 @@ class PostgreSQLDatabaseWrapper:
             ('emergency_accepted_by', "INTEGER DEFAULT NULL"),
             ('emergency_accepted_at', "TIMESTAMP DEFAULT NULL"),
         ]:
-            cursor.execute(
-                "SELECT column_name FROM information_schema.columns WHERE table_name='bookings' AND column_name=%s",
-                (col,)
-            )
-            if not cursor.fetchone():
+            if missing_column('bookings', col):
                 try:
                     cursor.execute(f"ALTER TABLE bookings ADD COLUMN {col} {col_type}")
                     print(f"[SUCCESS] Added {col} column to bookings table")
@@ -893,8 +1382,7 @@ class PostgreSQLDatabaseWrapper:
                     print(f"[WARNING] Could not add {col} column: {e}")
 
         # Add updated_at and gcal_synced_at columns to bookings table (incremental sync)
-        cursor.execute("SELECT column_name FROM information_schema.columns WHERE table_name='bookings' AND column_name='updated_at'")
-        if not cursor.fetchone():
+        if missing_column('bookings', 'updated_at'):
             try:
                 cursor.execute("ALTER TABLE bookings ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
                 cursor.execute("UPDATE bookings SET updated_at = created_at WHERE updated_at IS NULL")
@@ -902,17 +1390,34 @@ class PostgreSQLDatabaseWrapper:
             except Exception as e:
                 print(f"[WARNING] Could not add updated_at column: {e}")
         
-        cursor.execute("SELECT column_name FROM information_schema.columns WHERE table_name='bookings' AND column_name='gcal_synced_at'")
-        if not cursor.fetchone():
+        if missing_column('bookings', 'gcal_synced_at'):
             try:
                 cursor.execute("ALTER TABLE bookings ADD COLUMN gcal_synced_at TIMESTAMP")
                 print("[SUCCESS] Added gcal_synced_at column to bookings table")
             except Exception as e:
                 print(f"[WARNING] Could not add gcal_synced_at column: {e}")
         
+        # Add description_sig column to clients table (skips AI regeneration when history is unchanged)
+        if missing_column('clients', 'description_sig'):
+            try:
+                cursor.execute("ALTER TABLE clients ADD COLUMN description_sig TEXT")
+                print("[SUCCESS] Added description_sig column to clients table")
+            except Exception as e:
+                print(f"[WARNING] Could not add description_sig column: {e}")
+        
+        # Case/whitespace-folded name, kept by Postgres itself so every writer
+        # agrees on it. Client name lookups compare it within a company.
+        if missing_column('clients', 'name_normalized'):
+            try:
+                cursor.execute("ALTER TABLE clients ADD COLUMN name_normalized TEXT GENERATED ALWAYS AS (LOWER(TRIM(name))) STORED")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_clients_company_name_normalized ON clients(company_id, name_normalized)")
+                cursor.execute("DROP INDEX IF EXISTS idx_clients_company_lower_name")
+                print("[SUCCESS] Added name_normalized column to clients table")
+            except Exception as e:
+                print(f"[WARNING] Could not add name_normalized column: {e}")
+        
         # Add price_max column to services table (price ranges)
-        cursor.execute("SELECT column_name FROM information_schema.columns WHERE table_name='services' AND column_name='price_max'")
-        if not cursor.fetchone():
+        if missing_column('services', 'price_max'):
             try:
                 cursor.execute("ALTER TABLE services ADD COLUMN price_max REAL DEFAULT NULL")
                 print("[SUCCESS] Added price_max column to services table")
@@ -920,8 +1425,7 @@ class PostgreSQLDatabaseWrapper:
                 print(f"[WARNING] Could not add price_max column: {e}")
         
         # Add charge_max column to bookings table (price ranges)
-        cursor.execute("SELECT column_name FROM information_schema.columns WHERE table_name='bookings' AND column_name='charge_max'")
-        if not cursor.fetchone():
+        if missing_column('bookings', 'charge_max'):
             try:
                 cursor.execute("ALTER TABLE bookings ADD COLUMN charge_max REAL DEFAULT NULL")
                 print("[SUCCESS] Added charge_max column to bookings table")
@@ -943,11 +1447,7 @@ class PostgreSQLDatabaseWrapper:
             'recording_url': 'TEXT',
         }
         for col_name, col_type in call_log_columns.items():
-            cursor.execute(
-                "SELECT column_name FROM information_schema.columns WHERE table_name='call_logs' AND column_name=%s",
-                (col_name,)
-            )
-            if not cursor.fetchone():
+            if missing_column('call_logs', col_name):
                 try:
                     cursor.execute(f"ALTER TABLE call_logs ADD COLUMN {col_name} {col_type}")
                     print(f"[SUCCESS] Added {col_name} column to call_logs table")
@@ -1019,11 +1519,7 @@ class PostgreSQLDatabaseWrapper:
             'stripe_checkout_session_id': 'TEXT',
         }
         for col_name, col_type in booking_acct_cols.items():
-            cursor.execute(
-                "SELECT column_name FROM information_schema.columns WHERE table_name='bookings' AND column_name=%s",
-                (col_name,)
-            )
-            if not cursor.fetchone():
+            if missing_column('bookings', col_name):
                 try:
                     cursor.execute(f"ALTER TABLE bookings ADD COLUMN {col_name} {col_type}")
                     print(f"[SUCCESS] Added {col_name} column to bookings table")
@@ -1042,7 +1538,7 @@ class PostgreSQLDatabaseWrapper:
             'default_expense_categories': 'TEXT',
         }
         for col_name, col_type in company_acct_cols.items():
-            if col_name not in existing_columns:
+            if missing_column('companies', col_name):
                 try:
                     cursor.execute(f"ALTER TABLE companies ADD COLUMN {col_name} {col_type}")
                     print(f"[SUCCESS] Added {col_name} column to companies table")
@@ -1154,6 +1650,157 @@ class PostgreSQLDatabaseWrapper:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_reviews_booking ON job_reviews(booking_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_reviews_token ON job_reviews(review_token)")
         print("[INFO] Job reviews migration complete")
+        
+        # ============================================
+        # Running revenue counters for get_financial_stats
+        # ============================================
+        # One row per company / month / payment status / payment method,
+        # kept up to date by a trigger on bookings, so the finance dashboard
+        # reads a few dozen rows instead of aggregating every booking.
+        # NULL key parts are stored as '' (0 for company_id) so they can sit
+        # in the primary key. Only non-cancelled bookings are counted.
+        if 'booking_stats_monthly' not in columns:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS booking_stats_monthly (
+                    company_id BIGINT NOT NULL,
+                    month TEXT NOT NULL,
+                    payment_status TEXT NOT NULL,
+                    payment_method TEXT NOT NULL,
+                    revenue DOUBLE PRECISION NOT NULL DEFAULT 0,
+                    appointments INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (company_id, month, payment_status, payment_method)
+                )
+            """)
+            cursor.execute("""
+                CREATE OR REPLACE FUNCTION booking_stats_monthly_sync() RETURNS trigger AS $$
+                BEGIN
+                    IF TG_OP <> 'INSERT' AND OLD.status <> 'cancelled' THEN
+                        UPDATE booking_stats_monthly
+                        SET revenue = revenue - COALESCE(OLD.charge, 0),
+                            appointments = appointments - 1
+                        WHERE company_id = COALESCE(OLD.company_id, 0)
+                          AND month = TO_CHAR(OLD.appointment_time, 'YYYY-MM')
+                          AND payment_status = COALESCE(OLD.payment_status, '')
+                          AND payment_method = COALESCE(OLD.payment_method, '');
+                    END IF;
+                    IF TG_OP <> 'DELETE' AND NEW.status <> 'cancelled' THEN
+                        INSERT INTO booking_stats_monthly
+                            (company_id, month, payment_status, payment_method, revenue, appointments)
+                        VALUES (COALESCE(NEW.company_id, 0), TO_CHAR(NEW.appointment_time, 'YYYY-MM'),
+                                COALESCE(NEW.payment_status, ''), COALESCE(NEW.payment_method, ''),
+                                COALESCE(NEW.charge, 0), 1)
+                        ON CONFLICT (company_id, month, payment_status, payment_method) DO UPDATE
+                        SET revenue = booking_stats_monthly.revenue + EXCLUDED.revenue,
+                            appointments = booking_stats_monthly.appointments + 1;
+                    END IF;
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql
+            """)
+            cursor.execute("DROP TRIGGER IF EXISTS trg_booking_stats_monthly ON bookings")
+            cursor.execute("""
+                CREATE TRIGGER trg_booking_stats_monthly
+                AFTER INSERT OR DELETE OR UPDATE OF status, charge, payment_status, payment_method,
+                                                    appointment_time, company_id
+                ON bookings
+                FOR EACH ROW EXECUTE FUNCTION booking_stats_monthly_sync()
+            """)
+            # Backfill from the existing bookings. The trigger is already in
+            # place and holds off writers to bookings until init commits, so
+            # nothing is counted twice or missed.
+            cursor.execute("""
+                INSERT INTO booking_stats_monthly
+                    (company_id, month, payment_status, payment_method, revenue, appointments)
+                SELECT COALESCE(company_id, 0), TO_CHAR(appointment_time, 'YYYY-MM'),
+                       COALESCE(payment_status, ''), COALESCE(payment_method, ''),
+                       COALESCE(SUM(charge), 0), COUNT(*)
+                FROM bookings
+                WHERE status != 'cancelled'
+                GROUP BY 1, 2, 3, 4
+                ON CONFLICT DO NOTHING
+            """)
+            print("[SUCCESS] Created booking_stats_monthly counters")
+        
+        # ============================================
+        # clients.total_appointments / last_visit follow bookings via triggers
+        # ============================================
+        # Statement-level, so a bulk import or company delete updates each
+        # client once. Inserts count up, deletes count down (and recompute
+        # last_visit), updates only act on bookings moved between clients.
+        cursor.execute("SELECT 1 FROM pg_trigger WHERE tgname = 'trg_client_booking_stats_ins'")
+        if not cursor.fetchone():
+            cursor.execute("""
+                CREATE OR REPLACE FUNCTION client_booking_stats_sync() RETURNS trigger AS $$
+                BEGIN
+                    IF TG_OP = 'INSERT' THEN
+                        UPDATE clients c
+                        SET total_appointments = c.total_appointments + s.n,
+                            last_visit = GREATEST(c.last_visit, s.latest::date),
+                            updated_at = CURRENT_TIMESTAMP
+                        FROM (
+                            SELECT client_id, COUNT(*) AS n, MAX(appointment_time) AS latest
+                            FROM new_rows WHERE client_id IS NOT NULL GROUP BY client_id
+                        ) s
+                        WHERE c.id = s.client_id;
+                    ELSIF TG_OP = 'DELETE' THEN
+                        UPDATE clients c
+                        SET total_appointments = GREATEST(c.total_appointments - s.n, 0),
+                            last_visit = (SELECT MAX(b.appointment_time)::date FROM bookings b WHERE b.client_id = c.id)
+                        FROM (
+                            SELECT client_id, COUNT(*) AS n
+                            FROM old_rows WHERE client_id IS NOT NULL GROUP BY client_id
+                        ) s
+                        WHERE c.id = s.client_id;
+                    ELSE
+                        UPDATE clients c
+                        SET total_appointments = GREATEST(c.total_appointments + s.delta, 0),
+                            last_visit = (SELECT MAX(b.appointment_time)::date FROM bookings b WHERE b.client_id = c.id)
+                        FROM (
+                            SELECT client_id, SUM(delta) AS delta FROM (
+                                SELECT o.client_id, -1 AS delta
+                                FROM old_rows o JOIN new_rows n ON n.id = o.id
+                                WHERE n.client_id IS DISTINCT FROM o.client_id
+                                UNION ALL
+                                SELECT n.client_id, 1
+                                FROM old_rows o JOIN new_rows n ON n.id = o.id
+                                WHERE n.client_id IS DISTINCT FROM o.client_id
+                            ) moved
+                            WHERE client_id IS NOT NULL
+                            GROUP BY client_id
+                        ) s
+                        WHERE c.id = s.client_id;
+                    END IF;
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql
+            """)
+            cursor.execute("""
+                CREATE TRIGGER trg_client_booking_stats_ins AFTER INSERT ON bookings
+                REFERENCING NEW TABLE AS new_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION client_booking_stats_sync()
+            """)
+            cursor.execute("""
+                CREATE TRIGGER trg_client_booking_stats_del AFTER DELETE ON bookings
+                REFERENCING OLD TABLE AS old_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION client_booking_stats_sync()
+            """)
+            cursor.execute("""
+                CREATE TRIGGER trg_client_booking_stats_upd AFTER UPDATE ON bookings
+                REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION client_booking_stats_sync()
+            """)
+            # Deletes never used to count down - recount once
+            cursor.execute("""
+                UPDATE clients c
+                SET total_appointments = s.n
+                FROM (
+                    SELECT c2.id, COUNT(b.id) AS n
+                    FROM clients c2 LEFT JOIN bookings b ON b.client_id = c2.id
+                    GROUP BY c2.id
+                ) s
+                WHERE c.id = s.id AND c.total_appointments IS DISTINCT FROM s.n
+            """)
+            print("[SUCCESS] Client booking counters now maintained by triggers")
     
     def _convert_query(self, query: str) -> str:
         """Convert ? placeholders to %s for parameterized queries"""
@@ -1265,17 +1912,11 @@ class PostgreSQLDatabaseWrapper:
     
     def get_company_by_email(self, email: str) -> Optional[Dict]:
         """Get company by email"""
-        conn = self.get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        try:
-            cursor.execute("SELECT * FROM companies WHERE email = %s", (email,))
+        with self.acquire_read() as conn:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            _execute_prepared(cursor, "get_company_by_email", "SELECT * FROM companies WHERE email = %s", (email,))
             row = cursor.fetchone()
-            if row:
-                return dict(row)
-            return None
-        finally:
-            cursor.close()
-            self.return_connection(conn)
+        return dict(row) if row else None
     
     def get_company_by_stripe_customer_id(self, stripe_customer_id: str) -> Optional[Dict]:
         """Get company by Stripe customer ID"""
@@ -1307,17 +1948,11 @@ class PostgreSQLDatabaseWrapper:
     
     def get_company_by_id(self, company_id: int) -> Optional[Dict]:
         """Get company by ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        try:
-            cursor.execute("SELECT * FROM companies WHERE id = %s", (company_id,))
+        with self.acquire_read() as conn:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            _execute_prepared(cursor, "get_company_by_id", "SELECT * FROM companies WHERE id = %s", (company_id,))
             row = cursor.fetchone()
-            if row:
-                return dict(row)
-            return None
-        finally:
-            cursor.close()
-            self.return_connection(conn)
+        return dict(row) if row else None
     
     def get_company(self, company_id: int) -> Optional[Dict]:
         """Get company by ID (alias for get_company_by_id)"""
@@ -1523,6 +2158,8 @@ class PostgreSQLDatabaseWrapper:
             cursor.execute("DELETE FROM companies WHERE id = %s", (company_id,))
             
             conn.commit()
+            self.invalidate_client_cache()
+            self.invalidate_employee_cache()
             print(f"[SUCCESS] Deleted company {company_id} and all associated data")
             return True
         except Exception as e:
@@ -1562,15 +2199,16 @@ class PostgreSQLDatabaseWrapper:
         SECURITY: When company_id is provided, ALWAYS filter by it.
         If company_id is 0 or None when explicitly passed, return None for safety.
         """
-        conn = self.get_connection()
+        conn = self.get_connection(autocommit=True)
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         
         try:
             if company_id:
-                cursor.execute("SELECT * FROM bookings WHERE id = %s AND company_id = %s", (booking_id, company_id))
+                _execute_prepared(cursor, "get_booking_for_company",
+                                  "SELECT * FROM bookings WHERE id = %s AND company_id = %s", (booking_id, company_id))
             else:
                 # Backwards compatibility: allow unfiltered query only when company_id not passed
-                cursor.execute("SELECT * FROM bookings WHERE id = %s", (booking_id,))
+                _execute_prepared(cursor, "get_booking", "SELECT * FROM bookings WHERE id = %s", (booking_id,))
             row = cursor.fetchone()
             if row:
                 result = dict(row)
@@ -1622,8 +2260,6 @@ class PostgreSQLDatabaseWrapper:
             rows = cursor.fetchall()
             bookings = []
             
-            from datetime import datetime as dt, timedelta
-            
             # Get business hours for accurate multi-day job end time calculation
             try:
                 from src.utils.config import config
@@ -1635,23 +2271,10 @@ class PostgreSQLDatabaseWrapper:
                 biz_end = 17
             
             # Parse the query range
-            if isinstance(start_time, str):
-                try:
-                    range_start = dt.fromisoformat(start_time.replace('Z', '+00:00')).replace(tzinfo=None)
-                except ValueError:
-                    range_start = dt.strptime(start_time, '%Y-%m-%d %H:%M:%S')
-            else:
-                range_start = start_time
+            range_start = _naive_datetime(start_time) if isinstance(start_time, str) else start_time
             
             for row in rows:
-                appt_time = row['appointment_time']
-                if isinstance(appt_time, str):
-                    try:
-                        appt_time = dt.fromisoformat(appt_time.replace('Z', '+00:00')).replace(tzinfo=None)
-                    except ValueError:
-                        appt_time = dt.strptime(appt_time, '%Y-%m-%d %H:%M:%S')
-                elif hasattr(appt_time, 'tzinfo') and appt_time.tzinfo is not None:
-                    appt_time = appt_time.replace(tzinfo=None)
+                appt_time = _naive_datetime(row['appointment_time'])
                 
                 duration = row.get('duration_minutes') or 60
                 
@@ -1724,33 +2347,58 @@ class PostgreSQLDatabaseWrapper:
     
     def get_all_clients(self, company_id: int = None) -> List[Dict]:
         """Get all clients for a specific company"""
-        conn = self.get_connection()
+        # Just the list fields - not tags, description_sig, name_normalized, ...
+        columns = ('id, name, phone, email, first_visit, last_visit, total_appointments, '
+                   'created_at, updated_at, date_of_birth, description, address, eircode')
+        conn = self.get_connection(autocommit=True)
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         try:
             if company_id:
-                cursor.execute("SELECT * FROM clients WHERE company_id = %s ORDER BY created_at DESC", (company_id,))
+                cursor.execute(f"SELECT {columns} FROM clients WHERE company_id = %s ORDER BY created_at DESC", (company_id,))
             else:
-                cursor.execute("SELECT * FROM clients ORDER BY created_at DESC")
-            rows = cursor.fetchall()
-            
-            return [{
-                'id': row['id'],
-                'name': row['name'],
-                'phone': row['phone'],
-                'email': row['email'],
-                'first_visit': row.get('first_visit'),
-                'last_visit': row.get('last_visit'),
-                'total_appointments': row.get('total_appointments', 0),
-                'created_at': row.get('created_at'),
-                'updated_at': row.get('updated_at'),
-                'date_of_birth': row.get('date_of_birth'),
-                'description': row.get('description'),
-                'address': row.get('address'),
-                'eircode': row.get('eircode')
-            } for row in rows]
+                cursor.execute(f"SELECT {columns} FROM clients ORDER BY created_at DESC")
+            return [dict(row) for row in cursor]
         finally:
             self.return_connection(conn)
     
+    def get_bookings_near_time(self, appointment_time: datetime, company_id: int = None,
+                               tolerance_minutes: int = 5) -> List[Dict]:
+        """Get active bookings starting within tolerance_minutes of appointment_time.
+        
+        Used to resolve "the appointment at <time>" without loading every
+        booking for the company; served by idx_bookings_company_appt_time.
+        Returns the get_all_bookings fields callers match on (id, client_id,
+        calendar_event_id, appointment_time, service_type, status, client_name),
+        newest first.
+        """
+        window = timedelta(minutes=tolerance_minutes)
+        params = [appointment_time - window, appointment_time + window]
+        company_filter = ""
+        if company_id:
+            company_filter = "AND b.company_id = %s"
+            params.append(company_id)
+        with self.acquire_read() as conn:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute(f"""
+                SELECT b.id, b.client_id, b.calendar_event_id, b.appointment_time,
+                       b.service_type, b.status, c.name AS client_name
+                FROM bookings b
+                LEFT JOIN clients c ON b.client_id = c.id
+                WHERE b.appointment_time > %s AND b.appointment_time < %s
+                  AND COALESCE(b.status, '') NOT IN ('cancelled', 'completed')
+                  {company_filter}
+                ORDER BY b.appointment_time DESC
+            """, params)
+            return [{
+                'id': row['id'],
+                'client_id': row['client_id'],
+                'calendar_event_id': row['calendar_event_id'],
+                'appointment_time': row['appointment_time'].isoformat() if hasattr(row['appointment_time'], 'isoformat') else row['appointment_time'],
+                'service_type': row['service_type'],
+                'status': row['status'],
+                'client_name': row['client_name'],
+            } for row in cursor.fetchall()]
+    
     def get_all_bookings(self, company_id: int = None, limit: int = None,
                           offset: int = 0, since_days: int = None) -> List[Dict]:
         """Get bookings for a company, including assigned employee IDs.
@@ -1766,8 +2414,8 @@ class PostgreSQLDatabaseWrapper:
         subquery. Lets PostgreSQL pick the best plan and avoids the join explosion
         when a booking has multiple employees.
         """
-        conn = self.get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        conn = self.get_connection(autocommit=True)
+        cursor = conn.cursor()
         try:
             where_clauses = []
             params: List[Any] = []
@@ -1788,24 +2436,31 @@ class PostgreSQLDatabaseWrapper:
                 limit_sql = " LIMIT %s OFFSET %s"
                 params.extend([int(limit), int(offset)])
 
+            # Output keys (aliases included) are built in SQL, so each row maps
+            # straight onto the column names with no per-field Python lookups
             query = f"""
                 SELECT
                     b.id, b.client_id, b.calendar_event_id, b.appointment_time,
-                    b.service_type, b.status, b.phone_number, b.email, b.created_at,
-                    b.charge, b.charge_max, b.payment_status, b.payment_method, b.urgency,
-                    b.address, b.eircode, b.property_type, b.duration_minutes,
-                    b.address_audio_url, b.requires_callout, b.requires_quote,
-                    b.updated_at, b.gcal_synced_at, b.stripe_checkout_session_id,
-                    b.status_label, b.recurrence_pattern,
-                    b.emergency_status, b.emergency_accepted_by, b.emergency_accepted_at,
-                    b.table_number, b.party_size, b.dining_area, b.special_requests, b.course_status,
-                    c.name AS client_name, c.phone AS client_phone, c.email AS client_email,
+                    b.service_type, b.service_type AS service, b.status, b.phone_number,
+                    COALESCE(NULLIF(b.phone_number, ''), c.phone) AS phone,
+                    COALESCE(NULLIF(b.email, ''), c.email) AS email,
+                    b.created_at, b.charge, b.charge_max, b.charge AS estimated_charge,
+                    b.payment_status, b.payment_method, b.urgency,
+                    b.address, b.address AS job_address, b.eircode, b.property_type,
+                    c.name AS customer_name, c.name AS client_name,
+                    '' AS notes,
+                    b.duration_minutes,
                     COALESCE(
                         (SELECT ARRAY_AGG(wa.employee_id)
                          FROM employee_assignments wa
                          WHERE wa.booking_id = b.id),
                         ARRAY[]::BIGINT[]
-                    ) AS assigned_employee_ids
+                    ) AS assigned_employee_ids,
+                    b.address_audio_url, b.requires_callout, b.requires_quote,
+                    b.emergency_status, b.emergency_accepted_by, b.emergency_accepted_at,
+                    b.updated_at, b.gcal_synced_at, b.status_label, b.recurrence_pattern,
+                    b.stripe_checkout_session_id,
+                    b.table_number, b.party_size, b.dining_area, b.special_requests, b.course_status
                 FROM bookings b
                 LEFT JOIN clients c ON b.client_id = c.id
                 {where_sql}
@@ -1813,52 +2468,13 @@ class PostgreSQLDatabaseWrapper:
                 {limit_sql}
             """
             cursor.execute(query, params)
-            rows = cursor.fetchall()
-            
-            return [{
-                'id': row['id'],
-                'client_id': row['client_id'],
-                'calendar_event_id': row['calendar_event_id'],
-                'appointment_time': row['appointment_time'].isoformat() if hasattr(row['appointment_time'], 'isoformat') else row['appointment_time'],
-                'service_type': row['service_type'],
-                'service': row['service_type'],  # Alias for compatibility
-                'status': row['status'],
-                'phone_number': row['phone_number'],
-                'phone': row['phone_number'] or row['client_phone'],  # Use booking phone or client phone as fallback
-                'email': row['email'] or row['client_email'],  # Use booking email or client email as fallback
-                'created_at': row['created_at'].isoformat() if hasattr(row.get('created_at'), 'isoformat') else row['created_at'],
-                'charge': row['charge'],
-                'charge_max': row.get('charge_max'),
-                'estimated_charge': row['charge'],  # Alias for compatibility
-                'payment_status': row['payment_status'],
-                'payment_method': row['payment_method'],
-                'urgency': row['urgency'],
-                'address': row['address'],
-                'job_address': row['address'],  # Alias for compatibility
-                'eircode': row['eircode'],
-                'property_type': row['property_type'],
-                'customer_name': row['client_name'],
-                'client_name': row['client_name'],  # Alias for compatibility
-                'notes': '',  # Will be fetched separately if needed
-                'duration_minutes': row['duration_minutes'],
-                'assigned_employee_ids': row['assigned_employee_ids'] or [],  # List of assigned employee IDs
-                'address_audio_url': row.get('address_audio_url'),
-                'requires_callout': row.get('requires_callout', False),
-                'requires_quote': row.get('requires_quote', False),
-                'emergency_status': row.get('emergency_status'),
-                'emergency_accepted_by': row.get('emergency_accepted_by'),
-                'emergency_accepted_at': row.get('emergency_accepted_at'),
-                'updated_at': row.get('updated_at'),
-                'gcal_synced_at': row.get('gcal_synced_at'),
-                'status_label': row.get('status_label'),
-                'recurrence_pattern': row.get('recurrence_pattern'),
-                'stripe_checkout_session_id': row.get('stripe_checkout_session_id'),
-                'table_number': row.get('table_number'),
-                'party_size': row.get('party_size'),
-                'dining_area': row.get('dining_area'),
-                'special_requests': row.get('special_requests'),
-                'course_status': row.get('course_status'),
-            } for row in rows]
+            columns = [col[0] for col in cursor.description]
+            bookings = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            for booking in bookings:
+                for key in ('appointment_time', 'created_at'):
+                    if hasattr(booking[key], 'isoformat'):
+                        booking[key] = booking[key].isoformat()
+            return bookings
         finally:
             self.return_connection(conn)
     
@@ -1892,40 +2508,68 @@ class PostgreSQLDatabaseWrapper:
     def add_client(self, name: str, phone: str = None, email: str = None, 
                    date_of_birth: str = None, description: str = None, company_id: int = None,
                    address: str = None, eircode: str = None) -> Optional[int]:
-        """Add a new client"""
+        """Add a new client
+        
+        If the same client (see _CLIENT_IDENTITY - a missing phone or email
+        counts as equal) already exists, returns its id instead - the no-op DO UPDATE is what lets RETURNING
+        see the existing row, so it's one round-trip either way.
+        """
         conn = self.get_connection()
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         try:
-            cursor.execute("""
+            cursor.execute(f"""
                 INSERT INTO clients (name, phone, email, date_of_birth, description, first_visit, company_id, address, eircode)
                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT {self._client_conflict_target} DO UPDATE SET updated_at = CURRENT_TIMESTAMP
                 RETURNING id
             """, (name, phone, email, date_of_birth, description, datetime.now(), company_id, address, eircode))
             
             result = cursor.fetchone()
             client_id = result['id'] if result else None
             conn.commit()
+            self.invalidate_client_cache(client_id)
             return client_id
         except Exception as e:
-            # Client already exists or other error
             conn.rollback()
             print(f"Error adding client: {e}")
-            # Try to find existing client for this company
-            try:
-                if company_id:
-                    cursor.execute("""
-                        SELECT id FROM clients 
-                        WHERE company_id = %s AND name = %s AND (phone = %s OR email = %s)
-                    """, (company_id, name, phone, email))
-                else:
-                    cursor.execute("""
-                        SELECT id FROM clients 
-                        WHERE name = %s AND (phone = %s OR email = %s)
-                    """, (name, phone, email))
-                row = cursor.fetchone()
-                return row['id'] if row else None
-            except:
-                return None
+            return None
+        finally:
+            self.return_connection(conn)
+    
+    # Fields add_clients_bulk takes from each client dict, in insert order
+    _BULK_CLIENT_FIELDS = ('name', 'phone', 'email', 'date_of_birth', 'description', 'address', 'eircode')
+    
+    def add_clients_bulk(self, clients: List[Dict], company_id: int = None) -> List[int]:
+        """Insert many clients in one transaction (e.g. a customer list import)
+        
+        Each dict takes the same keyword fields as add_client. Rows matching
+        an existing client (see _CLIENT_IDENTITY) are skipped rather than
+        failing the batch; use find_or_create_client where a duplicate
+        should resolve to the existing id.
+        
+        Returns:
+            ids of the clients inserted
+        """
+        if not clients:
+            return []
+        rows = [tuple(c.get(f) for f in self._BULK_CLIENT_FIELDS) + (company_id,) for c in clients]
+        conn = self.get_connection()
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        try:
+            inserted = execute_values(cursor, f"""
+                INSERT INTO clients ({', '.join(self._BULK_CLIENT_FIELDS)}, company_id, first_visit)
+                VALUES %s
+                ON CONFLICT {self._client_conflict_target} DO NOTHING
+                RETURNING id
+            """, rows, template="(%s, %s, %s, %s, %s, %s, %s, %s, CURRENT_DATE)",
+                page_size=500, fetch=True)
+            conn.commit()
+            print(f"[DB] Bulk insert: {len(inserted)} of {len(rows)} clients added")
+            return [row['id'] for row in inserted]
+        except Exception as e:
+            conn.rollback()
+            print(f"Error adding clients in bulk: {e}")
+            return []
         finally:
             self.return_connection(conn)
     
@@ -1937,6 +2581,10 @@ class PostgreSQLDatabaseWrapper:
           e.g., "John O'Brien" matches "john obrien"
         - Phones: normalized to digits only with country code
           e.g., "085-123-4567" matches "+353851234567"
+        
+        The lookup and any insert run in one transaction on one connection,
+        under a per-company advisory lock, so two concurrent calls for the
+        same new caller can't both miss and create a duplicate.
         """
         from src.utils.security import normalize_name_for_comparison, normalize_phone_for_comparison
         
@@ -1951,67 +2599,124 @@ class PostgreSQLDatabaseWrapper:
             normalized_phone = normalize_phone_for_comparison(phone) if phone else None
             normalized_email = email.lower().strip() if email else None
             
-            # Fetch all clients for this company to do normalized comparison
-            if company_id:
-                cursor.execute("SELECT * FROM clients WHERE company_id = %s", (company_id,))
-            else:
-                cursor.execute("SELECT * FROM clients")
+            # Held until commit/rollback below
+            cursor.execute("SELECT pg_advisory_xact_lock(hashtext('find_or_create_client'), %s)", (company_id or 0,))
+            
+            client_id = None
+            email_added = False
+            phone_match = None
             
-            all_clients = cursor.fetchall()
+            if normalized_phone and not date_of_birth:
+                # Fast path for returning callers: their number stored in one of
+                # its usual formats is an indexed lookup, not a scan of every client
+                if company_id:
+                    cursor.execute("""
+                        SELECT id, name, email FROM clients
+                        WHERE company_id = %s AND phone = ANY(%s) ORDER BY id LIMIT 1
+                    """, (company_id, _phone_variants(phone)))
+                else:
+                    cursor.execute("""
+                        SELECT id, name, email FROM clients
+                        WHERE phone = ANY(%s) ORDER BY id LIMIT 1
+                    """, (_phone_variants(phone),))
+                phone_match = cursor.fetchone()
+            
+            if phone_match:
+                all_clients = [phone_match]
+            # Fetch this company's clients (just the matched-on columns) to do normalized comparison
+            elif company_id:
+                cursor.execute("SELECT id, name, phone, email, date_of_birth FROM clients WHERE company_id = %s", (company_id,))
+                all_clients = cursor.fetchall()
+            else:
+                cursor.execute("SELECT id, name, phone, email, date_of_birth FROM clients")
+                all_clients = cursor.fetchall()
             
-            # First priority: Try to find by normalized name + DOB if DOB is provided
             if date_of_birth:
+                # First priority: Try to find by normalized name + DOB if DOB is provided
+                # (no match -> create a new client, phone/email are not tried)
                 for client in all_clients:
                     client_normalized_name = normalize_name_for_comparison(client['name'])
                     if client_normalized_name == normalized_name and client.get('date_of_birth') == date_of_birth:
-                        return client['id']
+                        client_id = client['id']
+                        break
+            else:
+                # FIRST PRIORITY: Match by phone number alone (prevents duplicate clients
+                # when the LLM passes a different name for the same phone number, e.g.
+                # ASR mishears "Yeah it's correct" as "Christie" and LLM uses that as name)
+                if normalized_phone:
+                    for client in all_clients:
+                        client_normalized_phone = normalize_phone_for_comparison(client.get('phone') or '')
+                        if client is phone_match or client_normalized_phone == normalized_phone:
+                            print(f"[DB_CLIENT] ✅ Found existing client by phone: {client['name']} (ID: {client['id']})")
+                            client_id = client['id']
+                            # Update email if we have a new one and client doesn't have one
+                            if normalized_email and not (client.get('email') or '').strip():
+                                cursor.execute("SAVEPOINT sp_email")
+                                try:
+                                    cursor.execute(
+                                        "UPDATE clients SET email = %s WHERE id = %s",
+                                        (email, client_id)
+                                    )
+                                    cursor.execute("RELEASE SAVEPOINT sp_email")
+                                    email_added = True
+                                    print(f"[DB_CLIENT] 📧 Updated email for client {client_id}: {email}")
+                                except Exception as e:
+                                    cursor.execute("ROLLBACK TO SAVEPOINT sp_email")
+                                    print(f"[DB_CLIENT] ⚠️ Failed to update email: {e}")
+                            break
                 
-                # DOB provided but no match found - create new client
-                return self.add_client(name, phone, email, date_of_birth, company_id=company_id)
+                # SECOND PRIORITY: Match by normalized name + contact info
+                if client_id is None:
+                    for client in all_clients:
+                        client_normalized_name = normalize_name_for_comparison(client['name'])
+                        
+                        # Check if names match (normalized)
+                        if client_normalized_name != normalized_name:
+                            continue
+                        
+                        # Names match - now check phone or email
+                        if normalized_phone:
+                            client_normalized_phone = normalize_phone_for_comparison(client.get('phone') or '')
+                            if client_normalized_phone == normalized_phone:
+                                client_id = client['id']
+                                break
+                        elif normalized_email:
+                            client_email = (client.get('email') or '').lower().strip()
+                            if client_email == normalized_email:
+                                client_id = client['id']
+                                break
+            
+            created = client_id is None
+            if created:
+                # No match found - create new client. An exact duplicate
+                # (see _CLIENT_IDENTITY, so a NULL contact matches '') is
+                # returned instead.
+                cursor.execute("""
+                    WITH inserted AS (
+                        INSERT INTO clients (name, phone, email, date_of_birth, first_visit, company_id)
+                        VALUES (%s, %s, %s, %s, %s, %s)
+                        ON CONFLICT DO NOTHING
+                        RETURNING id
+                    )
+                    SELECT id FROM inserted
+                    UNION ALL
+                    SELECT id FROM clients
+                    WHERE company_id IS NOT DISTINCT FROM %s AND name = %s
+                      AND COALESCE(phone, '') = COALESCE(%s, '') AND COALESCE(email, '') = COALESCE(%s, '')
+                    LIMIT 1
+                """, (name, phone, email, date_of_birth, datetime.now(), company_id,
+                      company_id, name, phone, email))
+                row = cursor.fetchone()
+                if not row:
+                    raise Exception(f"Client {name!r} conflicted on insert but no matching row was found")
+                client_id = row['id']
             
-            # FIRST PRIORITY: Match by phone number alone (prevents duplicate clients
-            # when the LLM passes a different name for the same phone number, e.g.
-            # ASR mishears "Yeah it's correct" as "Christie" and LLM uses that as name)
-            if normalized_phone:
-                for client in all_clients:
-                    client_normalized_phone = normalize_phone_for_comparison(client.get('phone') or '')
-                    if client_normalized_phone == normalized_phone:
-                        print(f"[DB_CLIENT] ✅ Found existing client by phone: {client['name']} (ID: {client['id']})")
-                        # Update email if we have a new one and client doesn't have one
-                        if normalized_email and not (client.get('email') or '').strip():
-                            try:
-                                cursor.execute(
-                                    "UPDATE clients SET email = %s WHERE id = %s",
-                                    (email, client['id'])
-                                )
-                                conn.commit()
-                                print(f"[DB_CLIENT] 📧 Updated email for client {client['id']}: {email}")
-                            except Exception as e:
-                                print(f"[DB_CLIENT] ⚠️ Failed to update email: {e}")
-                        return client['id']
-            
-            # SECOND PRIORITY: Match by normalized name + contact info
-            for client in all_clients:
-                client_normalized_name = normalize_name_for_comparison(client['name'])
-                
-                # Check if names match (normalized)
-                if client_normalized_name != normalized_name:
-                    continue
-                
-                # Names match - now check phone or email
-                if normalized_phone:
-                    client_normalized_phone = normalize_phone_for_comparison(client.get('phone') or '')
-                    if client_normalized_phone == normalized_phone:
-                        return client['id']
-                elif normalized_email:
-                    client_email = (client.get('email') or '').lower().strip()
-                    if client_email == normalized_email:
-                        return client['id']
-            
-            # No match found - create new client
-            new_id = self.add_client(name, phone, email, date_of_birth, company_id=company_id)
-            return new_id
+            conn.commit()
+            if created or email_added:
+                self.invalidate_client_cache(client_id)
+            return client_id
         except Exception as e:
+            conn.rollback()
             print(f"[DB_CLIENT] ❌ Error: {e}")
             import traceback
             traceback.print_exc()
@@ -2019,23 +2724,15 @@ class PostgreSQLDatabaseWrapper:
         finally:
             self.return_connection(conn)
     
+    @_row_dicts
     def get_available_phone_numbers(self) -> List[Dict]:
         """Get list of all available phone numbers"""
-        conn = self.get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        try:
-            cursor.execute("""
-                SELECT phone_number, created_at 
-                FROM twilio_phone_numbers 
-                WHERE status = 'available'
-                ORDER BY created_at
-            """)
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        finally:
-            cursor.close()
-            self.return_connection(conn)
+        return """
+            SELECT phone_number, created_at 
+            FROM twilio_phone_numbers 
+            WHERE status = 'available'
+            ORDER BY created_at
+        """, ()
     
     def assign_phone_number(self, company_id: int, phone_number: str = None):
         """Assign a phone number to a company (either specific number or first available)"""
@@ -2043,48 +2740,33 @@ class PostgreSQLDatabaseWrapper:
         cursor = conn.cursor()
         
         try:
-            if not phone_number:
-                # Get first available number if none specified - lock the row immediately
-                cursor.execute("""
-                    SELECT phone_number FROM twilio_phone_numbers 
-                    WHERE status = 'available'
-                    ORDER BY created_at
-                    LIMIT 1
-                    FOR UPDATE SKIP LOCKED
-                """)
-                result = cursor.fetchone()
-                
-                if not result:
-                    conn.rollback()
-                    raise Exception("No available phone numbers in pool")
-                
-                phone_number = result[0]
-            else:
-                # Verify the specific number is available and lock it
-                cursor.execute("""
-                    SELECT phone_number FROM twilio_phone_numbers 
-                    WHERE phone_number = %s AND status = 'available'
-                    FOR UPDATE SKIP LOCKED
-                """, (phone_number,))
-                result = cursor.fetchone()
-                
-                if not result:
-                    conn.rollback()
-                    raise Exception(f"Phone number {phone_number} is not available")
-            
-            # Update phone number status
+            # Claim the number in one statement: the subquery locks the row
+            # (skipping any another signup is claiming) and the UPDATE marks
+            # it assigned before anyone else can read it as available.
+            # First available number if none specified.
             cursor.execute("""
                 UPDATE twilio_phone_numbers 
                 SET assigned_to_company_id = %s, 
                     assigned_at = CURRENT_TIMESTAMP,
                     status = 'assigned'
-                WHERE phone_number = %s
-            """, (company_id, phone_number))
+                WHERE phone_number = (
+                    SELECT phone_number FROM twilio_phone_numbers 
+                    WHERE status = 'available' AND (%s::text IS NULL OR phone_number = %s)
+                    ORDER BY created_at
+                    LIMIT 1
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING phone_number
+            """, (company_id, phone_number, phone_number))
+            result = cursor.fetchone()
             
-            # Verify the update succeeded
-            if cursor.rowcount == 0:
+            if not result:
                 conn.rollback()
-                raise Exception(f"Failed to update phone number status")
+                if not phone_number:
+                    raise Exception("No available phone numbers in pool")
+                raise Exception(f"Phone number {phone_number} is not available")
+            
+            phone_number = result[0]
             
             # Update company with phone number
             cursor.execute("""
@@ -2115,16 +2797,16 @@ class PostgreSQLDatabaseWrapper:
     
     def get_clients_by_name(self, name: str, company_id: int = None) -> List[Dict]:
         """Get all clients with a given name (case-insensitive), filtered by company_id for data isolation"""
-        conn = self.get_connection()
+        conn = self.get_connection(autocommit=True)
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         try:
             name = name.lower().strip()
             # CRITICAL: Filter by company_id for proper multi-tenant data isolation
             # Exact match only - "Doherty" should NOT match "James Doherty"
             if company_id:
-                cursor.execute("SELECT * FROM clients WHERE company_id = %s AND LOWER(name) = %s", (company_id, name))
+                cursor.execute("SELECT * FROM clients WHERE company_id = %s AND name_normalized = %s", (company_id, name))
             else:
-                cursor.execute("SELECT * FROM clients WHERE LOWER(name) = %s", (name,))
+                cursor.execute("SELECT * FROM clients WHERE name_normalized = %s", (name,))
             rows = cursor.fetchall()
             
             return [{
@@ -2150,73 +2832,41 @@ class PostgreSQLDatabaseWrapper:
         if not phone:
             return None
         
-        import re as _re
-        
-        def _normalize(p):
-            if not p:
-                return ""
-            cleaned = _re.sub(r'[^\d+]', '', p.strip())
-            if cleaned.startswith('0') and len(cleaned) == 10:
-                cleaned = '+353' + cleaned[1:]
-            elif cleaned.startswith('353') and not cleaned.startswith('+'):
-                cleaned = '+' + cleaned
-            elif cleaned.startswith('00'):
-                cleaned = '+' + cleaned[2:]
-            return cleaned
-        
-        normalized_phone = _normalize(phone)
-        if not normalized_phone:
+        phone_variants = _phone_variants(phone)
+        if not phone_variants:
             return None
         
-        # Build all possible format variants for SQL IN query
-        # e.g., +353851234567 → also try 0851234567, 353851234567
-        phone_variants = {phone.strip(), normalized_phone}
-        if normalized_phone.startswith('+353'):
-            local = '0' + normalized_phone[4:]
-            phone_variants.add(local)
-            phone_variants.add('353' + normalized_phone[4:])
-        phone_variants = [p for p in phone_variants if p]
+        cached = _client_cache.get(("client_phone", phone, company_id))
+        if cached is not None:
+            return dict(cached)
         
-        conn = self.get_connection()
+        conn = self.get_connection(autocommit=True)
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         try:
-            # Fast path: try all common format variants in a single SQL query
+            # Fast path: try all common format variants in a single SQL query.
+            # Variants go in as one array, so the text (and prepared plan) is
+            # the same however many there are - this runs on every inbound call.
             if company_id:
-                placeholders = ','.join(['%s'] * len(phone_variants))
-                cursor.execute(f"""
-                    SELECT * FROM clients 
-                    WHERE company_id = %s AND phone IN ({placeholders})
+                _execute_prepared(cursor, "find_client_by_phone_for_company", f"""
+                    SELECT {_CLIENT_PHONE_COLUMNS} FROM clients 
+                    WHERE company_id = %s AND phone = ANY(%s)
                     ORDER BY updated_at DESC
                     LIMIT 1
-                """, (company_id, *phone_variants))
+                """, (company_id, phone_variants))
             else:
-                placeholders = ','.join(['%s'] * len(phone_variants))
-                cursor.execute(f"""
-                    SELECT * FROM clients 
-                    WHERE phone IN ({placeholders})
+                _execute_prepared(cursor, "find_client_by_phone", f"""
+                    SELECT {_CLIENT_PHONE_COLUMNS} FROM clients 
+                    WHERE phone = ANY(%s)
                     ORDER BY updated_at DESC
                     LIMIT 1
-                """, tuple(phone_variants))
+                """, (phone_variants,))
             
             row = cursor.fetchone()
             
             if row:
-                return {
-                    'id': row['id'],
-                    'company_id': row.get('company_id'),
-                    'name': row['name'],
-                    'phone': row['phone'],
-                    'email': row['email'],
-                    'address': row.get('address'),
-                    'eircode': row.get('eircode'),
-                    'first_visit': row.get('first_visit'),
-                    'last_visit': row.get('last_visit'),
-                    'total_appointments': row.get('total_appointments', 0),
-                    'created_at': row.get('created_at'),
-                    'updated_at': row.get('updated_at'),
-                    'date_of_birth': row.get('date_of_birth'),
-                    'description': row.get('description')
-                }
+                client = dict(row)
+                _client_cache.set(("client_phone", phone, company_id), client)
+                return dict(client)
             return None
         except Exception as e:
             print(f"[ERROR] Error finding client by phone: {e}")
@@ -2224,20 +2874,103 @@ class PostgreSQLDatabaseWrapper:
         finally:
             self.return_connection(conn)
     
+    def lookup_client(self, name: str = None, phone: str = None, date_of_birth: str = None,
+                      company_id: int = None, limit: int = None) -> List[Dict]:
+        """Find clients by any combination of name, phone and date of birth in one query.
+        
+        Name and phone are alternatives (a client matching either is returned),
+        ranked: name AND phone first, then name only, then phone only - the same
+        precedence as looking up by name and falling back to phone, without the
+        second round-trip. date_of_birth, if given, must also match.
+        
+        Each row carries name_match / phone_match booleans so callers can tell
+        a confirmed match from an ambiguous name-only one.
+        """
+        phone_variants = _phone_variants(phone)
+        if not name and not phone_variants:
+            return []
+        
+        select_params = []
+        if name:
+            name_expr = "name_normalized = %s"
+            select_params.append(name.lower().strip())
+        else:
+            name_expr = "FALSE"
+        if phone_variants:
+            phone_expr = f"phone IN ({','.join(['%s'] * len(phone_variants))})"
+            select_params.extend(phone_variants)
+        else:
+            phone_expr = "FALSE"
+        
+        filters = []
+        filter_params = []
+        if company_id:
+            filters.append("company_id = %s")
+            filter_params.append(company_id)
+        if date_of_birth:
+            filters.append("date_of_birth = %s")
+            filter_params.append(date_of_birth)
+        where = f"WHERE {' AND '.join(filters)}" if filters else ""
+        
+        limit_sql = ""
+        limit_params = []
+        if limit is not None:
+            limit_sql = "LIMIT %s"
+            limit_params.append(int(limit))
+        
+        conn = self.get_connection(autocommit=True)
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        try:
+            # Simple subquery - Postgres pulls it up, so the outer OR still
+            # uses the phone / (company_id, name_normalized) indexes
+            cursor.execute(f"""
+                SELECT * FROM (
+                    SELECT *, {name_expr} AS name_match, {phone_expr} AS phone_match
+                    FROM clients
+                    {where}
+                ) c
+                WHERE name_match OR phone_match
+                ORDER BY (name_match AND phone_match) DESC, name_match DESC, updated_at DESC
+                {limit_sql}
+            """, (*select_params, *filter_params, *limit_params))
+            return [dict(row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+            self.return_connection(conn)
+    
+    def invalidate_client_cache(self, client_id: int = None):
+        """
+        Drop cached client lookups after a client (or its notes) changed.
+        Phone lookups are always dropped - a write can change which client a
+        number resolves to. With no client_id the whole cache is cleared.
+        """
+        if client_id is None:
+            _client_cache.clear()
+            return
+        _client_cache.invalidate(("client", client_id))
+        _client_cache.invalidate_prefix("client_phone")
+    
     def get_client(self, client_id: int, company_id: int = None) -> Optional[Dict]:
         """Get client by ID, optionally filtered by company_id for security"""
-        conn = self.get_connection()
+        cached = _client_cache.get(("client", client_id))
+        if cached is not None:
+            if company_id and cached['company_id'] != company_id:
+                return None
+            return dict(cached)
+        
+        conn = self.get_connection(autocommit=True)
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         try:
             if company_id:
-                cursor.execute("SELECT * FROM clients WHERE id = %s AND company_id = %s", (client_id, company_id))
+                _execute_prepared(cursor, "get_client_for_company",
+                                  "SELECT * FROM clients WHERE id = %s AND company_id = %s", (client_id, company_id))
             else:
-                cursor.execute("SELECT * FROM clients WHERE id = %s", (client_id,))
+                _execute_prepared(cursor, "get_client", "SELECT * FROM clients WHERE id = %s", (client_id,))
             row = cursor.fetchone()
             
             if row:
                 # Fetch notes from the notes table and aggregate them
-                cursor.execute("""
+                _execute_prepared(cursor, "get_client_notes_text", """
                     SELECT note, created_at, created_by 
                     FROM notes 
                     WHERE client_id = %s 
@@ -2254,7 +2987,7 @@ class PostgreSQLDatabaseWrapper:
                         note_entries.append(f"[{timestamp}] {note_row['note']}")
                     notes_text = "\n\n".join(note_entries)
                 
-                return {
+                client = {
                     'id': row['id'],
                     'company_id': row.get('company_id'),
                     'name': row['name'],
@@ -2267,44 +3000,40 @@ class PostgreSQLDatabaseWrapper:
                     'updated_at': row.get('updated_at'),
                     'date_of_birth': row.get('date_of_birth'),
                     'description': row.get('description'),
+                    'description_sig': row.get('description_sig'),
                     'address': row.get('address'),
                     'eircode': row.get('eircode'),
                     'notes': notes_text
                 }
+                _client_cache.set(("client", client_id), client)
+                return dict(client)
             return None
         finally:
             self.return_connection(conn)
     
     def update_client(self, client_id: int, **kwargs):
         """Update client information"""
-        conn = self.get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        columns = tuple(c for c in _CLIENT_UPDATE_COLUMNS if c in kwargs)
+        if not columns:
+            return
+        name, query = _client_update_statement(columns)
+        params = tuple(kwargs[c] for c in columns) + (datetime.now(), client_id)
         try:
-            fields = []
-            values = []
-            for key, value in kwargs.items():
-                if key in ['name', 'phone', 'email', 'date_of_birth', 'description', 'address', 'eircode']:
-                    fields.append(f"{key} = %s")
-                    values.append(value)
-            
-            if fields:
-                values.append(datetime.now())
-                values.append(client_id)
-                cursor.execute(f"""
-                    UPDATE clients 
-                    SET {', '.join(fields)}, updated_at = %s
-                    WHERE id = %s
-                """, values)
-                conn.commit()
+            with self.acquire_write() as conn:
+                cursor = conn.cursor(cursor_factory=RealDictCursor)
+                _execute_prepared(cursor, name, query, params)
+            self.invalidate_client_cache(client_id)
         except Exception as e:
-            conn.rollback()
             print(f"Error updating client: {e}")
-        finally:
-            self.return_connection(conn)
     
-    def update_client_description(self, client_id: int, description: str, company_id: int = None):
+    def update_client_description(self, client_id: int, description: str, company_id: int = None,
+                                   description_sig: str = None):
         """Update client description (AI-generated summary).
         
+        description_sig is the content hash of the booking history the
+        description was generated from; it is stored alongside in the same
+        UPDATE so the two never drift apart.
+        
         SECURITY: When company_id is provided, always filter by it to prevent
         cross-tenant writes.
         """
@@ -2314,17 +3043,18 @@ class PostgreSQLDatabaseWrapper:
             if company_id:
                 cursor.execute("""
                     UPDATE clients 
-                    SET description = %s, updated_at = %s
+                    SET description = %s, description_sig = %s, updated_at = %s
                     WHERE id = %s AND company_id = %s
-                """, (description, datetime.now(), client_id, company_id))
+                """, (description, description_sig, datetime.now(), client_id, company_id))
             else:
                 cursor.execute("""
                     UPDATE clients 
-                    SET description = %s, updated_at = %s
+                    SET description = %s, description_sig = %s, updated_at = %s
                     WHERE id = %s
-                """, (description, datetime.now(), client_id))
+                """, (description, description_sig, datetime.now(), client_id))
             
             conn.commit()
+            self.invalidate_client_cache(client_id)
         except Exception as e:
             conn.rollback()
             print(f"Error updating client description: {e}")
@@ -2415,6 +3145,7 @@ class PostgreSQLDatabaseWrapper:
             
             client_deleted = cursor.rowcount > 0
             conn.commit()
+            self.invalidate_client_cache(client_id)
             
             return {
                 "success": client_deleted,
@@ -2440,68 +3171,41 @@ class PostgreSQLDatabaseWrapper:
                     table_number: str = None, party_size: int = None, dining_area: str = None,
                     special_requests: str = None) -> Optional[int]:
         """Add a new booking (default 1 day duration for trades)"""
-        print(f"[DB_BOOKING] ========== ADDING BOOKING ==========")
-        print(f"[DB_BOOKING] client_id={client_id}, calendar_event_id={calendar_event_id}")
-        print(f"[DB_BOOKING] appointment_time={appointment_time}, service_type={service_type}")
-        print(f"[DB_BOOKING] phone={phone_number}, email={email}, company_id={company_id}")
-        print(f"[DB_BOOKING] urgency={urgency}, address={address}, eircode={eircode}")
-        print(f"[DB_BOOKING] property_type={property_type}, charge={charge}, duration={duration_minutes}")
-        print(f"[DB_BOOKING] requires_callout={requires_callout}, requires_quote={requires_quote}")
+        # One line per booking - this runs mid-call, and every print takes the stdout lock
+        print(f"[DB_BOOKING] Adding booking: client_id={client_id}, company_id={company_id}, "
+              f"event={calendar_event_id}, time={appointment_time}, service={service_type}, "
+              f"duration={duration_minutes}")
         
         conn = self.get_connection()
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         try:
-            # If phone/email not provided, get from client record
-            if not phone_number and not email:
-                print(f"[DB_BOOKING] No phone/email provided, fetching from client {client_id}")
-                cursor.execute("SELECT phone, email FROM clients WHERE id = %s", (client_id,))
-                client = cursor.fetchone()
-                if client:
-                    phone_number = client.get('phone')
-                    email = client.get('email')
-                    print(f"[DB_BOOKING] Got from client: phone={phone_number}, email={email}")
-            
-            # Insert booking with company_id and duration_minutes
-            if charge is not None:
-                print(f"[DB_BOOKING] Inserting booking with charge...")
-                cursor.execute("""
-                    INSERT INTO bookings (client_id, calendar_event_id, appointment_time, 
-                                        service_type, phone_number, email, urgency, address,
-                                        eircode, property_type, charge, charge_max, company_id, duration_minutes, requires_callout, requires_quote,
-                                        table_number, party_size, dining_area, special_requests)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    RETURNING id
-                """, (client_id, calendar_event_id, appointment_time, service_type, 
-                      phone_number, email, urgency, address, eircode, property_type, charge, charge_max, company_id, duration_minutes, requires_callout, requires_quote,
-                      table_number, party_size, dining_area, special_requests))
-            else:
-                print(f"[DB_BOOKING] Inserting booking without charge...")
-                cursor.execute("""
-                    INSERT INTO bookings (client_id, calendar_event_id, appointment_time, 
-                                        service_type, phone_number, email, urgency, address,
-                                        eircode, property_type, company_id, duration_minutes, requires_callout, requires_quote,
-                                        table_number, party_size, dining_area, special_requests)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    RETURNING id
-                """, (client_id, calendar_event_id, appointment_time, service_type, 
-                      phone_number, email, urgency, address, eircode, property_type, company_id, duration_minutes, requires_callout, requires_quote,
-                      table_number, party_size, dining_area, special_requests))
+            # If phone/email not provided, the client record's are copied in
+            # by the INSERT itself rather than read first in a separate query.
+            # The client's total_appointments / last_visit are bumped by the
+            # bookings trigger. A missing charge falls back to the column's default of 0.
+            from_client = not phone_number and not email
+            if from_client:
+                print(f"[DB_BOOKING] No phone/email provided, taking them from client {client_id}")
+            cursor.execute("""
+                INSERT INTO bookings (client_id, calendar_event_id, appointment_time, 
+                                    service_type, phone_number, email, urgency, address,
+                                    eircode, property_type, charge, charge_max, company_id, duration_minutes, requires_callout, requires_quote,
+                                    table_number, party_size, dining_area, special_requests)
+                VALUES (%s, %s, %s, %s,
+                        CASE WHEN %s THEN (SELECT phone FROM clients WHERE id = %s) ELSE %s END,
+                        CASE WHEN %s THEN (SELECT email FROM clients WHERE id = %s) ELSE %s END,
+                        %s, %s, %s, %s, COALESCE(%s, 0), %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING id
+            """, (client_id, calendar_event_id, appointment_time, service_type, 
+                  from_client, client_id, phone_number, from_client, client_id, email,
+                  urgency, address, eircode, property_type, charge, charge_max, company_id, duration_minutes, requires_callout, requires_quote,
+                  table_number, party_size, dining_area, special_requests))
             
             result = cursor.fetchone()
             booking_id = result['id'] if result else None
-            print(f"[DB_BOOKING] Booking inserted with ID: {booking_id}")
-            
-            # Update client stats
-            print(f"[DB_BOOKING] Updating client stats...")
-            cursor.execute("""
-                UPDATE clients 
-                SET total_appointments = total_appointments + 1,
-                    last_visit = %s,
-                    updated_at = %s
-                WHERE id = %s
-            """, (appointment_time, datetime.now(), client_id))
             
             conn.commit()
+            self.invalidate_client_cache(client_id)
             print(f"[DB_BOOKING] ✅ Booking committed successfully: ID={booking_id}")
             return booking_id
         except Exception as e:
@@ -2519,6 +3223,75 @@ class PostgreSQLDatabaseWrapper:
         finally:
             self.return_connection(conn)
     
+    # Fields add_bookings_bulk takes from each booking dict, in insert order
+    _BULK_BOOKING_FIELDS = ('client_id', 'calendar_event_id', 'appointment_time', 'service_type',
+                            'phone_number', 'email', 'urgency', 'address', 'eircode',
+                            'property_type', 'charge', 'duration_minutes')
+    
+    def add_bookings_bulk(self, bookings: List[Dict], company_id: int = None) -> Dict[str, Optional[int]]:
+        """Insert many bookings in one transaction (e.g. a calendar import)
+        
+        Each dict takes the same keyword fields as add_booking (see
+        _BULK_BOOKING_FIELDS), and like add_booking a row with neither
+        phone_number nor email takes both from its client. Rows whose
+        calendar_event_id already exists are skipped rather than failing the
+        batch. The statement-level bookings trigger updates each client's
+        stats once for the batch. If the batch fails anyway (one bad row),
+        the rows are retried one at a time so the rest still go in.
+        
+        Returns:
+            {calendar_event_id: booking_id} for the bookings inserted, with
+            booking_id None for rows that failed to insert
+        """
+        if not bookings:
+            return {}
+        defaults = {'duration_minutes': 1440}
+        rows = []
+        for b in bookings:
+            values = tuple(b.get(f, defaults.get(f)) for f in self._BULK_BOOKING_FIELDS)
+            client_id, phone_number, email = values[0], values[4], values[5]
+            from_client = not phone_number and not email
+            rows.append(values[:4] + (from_client, client_id, phone_number, from_client, client_id, email)
+                        + values[6:] + (company_id,))
+        sql = f"""
+            INSERT INTO bookings ({', '.join(self._BULK_BOOKING_FIELDS)}, company_id)
+            VALUES %s
+            ON CONFLICT (calendar_event_id) DO NOTHING
+            RETURNING id, calendar_event_id
+        """
+        template = """(%s, %s, %s, %s,
+            CASE WHEN %s THEN (SELECT phone FROM clients WHERE id = %s) ELSE %s END,
+            CASE WHEN %s THEN (SELECT email FROM clients WHERE id = %s) ELSE %s END,
+            %s, %s, %s, %s, COALESCE(%s, 0), %s, %s)"""
+        conn = self.get_connection()
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        try:
+            try:
+                inserted = execute_values(cursor, sql, rows, template=template, page_size=500, fetch=True)
+                conn.commit()
+                added = {row['calendar_event_id']: row['id'] for row in inserted}
+            except Exception as e:
+                conn.rollback()
+                print(f"[DB_BOOKING] ⚠️ Bulk insert failed ({e}), adding bookings one at a time")
+                added = {}
+                for booking, row in zip(bookings, rows):
+                    try:
+                        inserted = execute_values(cursor, sql, [row], template=template, fetch=True)
+                        conn.commit()
+                    except Exception as e:
+                        conn.rollback()
+                        print(f"[DB_BOOKING] ❌ Error adding booking {booking.get('calendar_event_id')}: {e}")
+                        added[booking.get('calendar_event_id')] = None
+                        continue
+                    added.update({r['calendar_event_id']: r['id'] for r in inserted})
+            for client_id in {b.get('client_id') for b in bookings}:
+                self.invalidate_client_cache(client_id)
+            print(f"[DB_BOOKING] ✅ Bulk insert: {sum(v is not None for v in added.values())} "
+                  f"of {len(rows)} bookings added")
+            return added
+        finally:
+            self.return_connection(conn)
+    
     def update_booking(self, booking_id: int, company_id: int = None, **kwargs) -> bool:
         """Update booking information
         
@@ -2541,8 +3314,7 @@ class PostgreSQLDatabaseWrapper:
                 'phone': 'phone_number',
             }
             
-            fields = []
-            values = []
+            updates = {}
             customer_name = None
             
             for key, value in kwargs.items():
@@ -2553,24 +3325,17 @@ class PostgreSQLDatabaseWrapper:
                         customer_name = value
                     continue
                 
-                if db_field in ['calendar_event_id', 'appointment_time', 'service_type', 
-                          'status', 'phone_number', 'email', 'charge', 'charge_max', 'payment_status', 
-                          'payment_method', 'urgency', 'address', 'eircode', 'property_type',
-                          'duration_minutes', 'address_audio_url', 'requires_callout', 'requires_quote',
-                          'photo_urls', 'job_started_at', 'job_completed_at', 'actual_duration_minutes',
-                          'status_label', 'recurrence_pattern', 'recurrence_end_date', 'parent_booking_id',
-                          'emergency_status', 'emergency_accepted_by', 'emergency_accepted_at']:
-                    fields.append(f"{db_field} = %s")
-                    values.append(value)
+                if db_field in _BOOKING_UPDATE_FIELDS:
+                    updates[db_field] = value
             
             success = False
             
-            if fields:
-                # Always update the updated_at timestamp
-                fields.append("updated_at = CURRENT_TIMESTAMP")
-                values.append(booking_id)
-                query = f"UPDATE bookings SET {', '.join(fields)} WHERE id = %s"
-                cursor.execute(query, values)
+            if updates:
+                # Fixed column order: the same fields in any kwarg order
+                # are one statement (and one prepared plan)
+                columns = tuple(c for c in _BOOKING_UPDATE_COLUMNS if c in updates)
+                name, query = _booking_update_statement(columns)
+                _execute_prepared(cursor, name, query, tuple(updates[c] for c in columns) + (booking_id,))
                 conn.commit()
                 success = cursor.rowcount > 0
             
@@ -2580,6 +3345,7 @@ class PostgreSQLDatabaseWrapper:
                 if row and row['client_id']:
                     cursor.execute("UPDATE clients SET name = %s WHERE id = %s", (customer_name, row['client_id']))
                     conn.commit()
+                    self.invalidate_client_cache(row['client_id'])
                     success = True
             
             return success
@@ -2631,11 +3397,13 @@ class PostgreSQLDatabaseWrapper:
             
             # Delete associated appointment notes first (foreign key constraint)
             cursor.execute("DELETE FROM appointment_notes WHERE booking_id = %s", (booking_id,))
-            # Delete the booking
-            cursor.execute("DELETE FROM bookings WHERE id = %s", (booking_id,))
+            # Delete the booking (the trigger counts it off the client)
+            cursor.execute("DELETE FROM bookings WHERE id = %s RETURNING client_id", (booking_id,))
+            deleted = cursor.fetchone()
             conn.commit()
-            success = cursor.rowcount > 0
+            success = deleted is not None
             if success:
+                self.invalidate_client_cache(deleted['client_id'])
                 print(f"[SUCCESS] Deleted booking from database (ID: {booking_id})")
             return success
         except Exception as e:
@@ -2646,107 +3414,124 @@ class PostgreSQLDatabaseWrapper:
             self.return_connection(conn)
     
     def get_client_bookings(self, client_id: int, company_id: int = None) -> List[Dict]:
-        """Get all bookings for a client, optionally filtered by company_id for security"""
-        conn = self.get_connection()
+        """Get all bookings for a client (newest first) with their appointment notes,
+        optionally filtered by company_id for security"""
+        conn = self.get_connection(autocommit=True)
         cursor = conn.cursor(cursor_factory=RealDictCursor)
+        try:
+            # Notes come back on the same rows rather than a query per booking
+            company_filter = "AND b.company_id = %s" if company_id else ""
+            cursor.execute(f"""
+                SELECT b.*, {_JOINED_NOTE_COLUMNS}
+                FROM bookings b
+                LEFT JOIN appointment_notes an ON an.booking_id = b.id
+                WHERE b.client_id = %s {company_filter}
+                ORDER BY b.appointment_time DESC, b.id, an.created_at DESC
+            """, (client_id, company_id) if company_id else (client_id,))
+            return _group_booking_notes(cursor.fetchall())
+        finally:
+            cursor.close()
+            self.return_connection(conn)
+    
+    def count_client_bookings(self, client_id: int, company_id: int = None) -> int:
+        """Count a client's bookings (index-only on idx_bookings_client_time)"""
+        conn = self.get_connection(autocommit=True)
+        cursor = conn.cursor()
         try:
             if company_id:
-                cursor.execute("""
-                    SELECT * FROM bookings 
-                    WHERE client_id = %s AND company_id = %s
-                    ORDER BY appointment_time DESC
-                """, (client_id, company_id))
+                cursor.execute("SELECT COUNT(*) FROM bookings WHERE client_id = %s AND company_id = %s",
+                               (client_id, company_id))
             else:
-                cursor.execute("""
-                    SELECT * FROM bookings 
-                    WHERE client_id = %s 
-                    ORDER BY appointment_time DESC
-                """, (client_id,))
-            rows = cursor.fetchall()
-            
-            bookings = []
-            for row in rows:
-                booking = dict(row)
-                booking['notes'] = self.get_appointment_notes(booking['id'])
-                bookings.append(booking)
-            
-            return bookings
+                cursor.execute("SELECT COUNT(*) FROM bookings WHERE client_id = %s", (client_id,))
+            return cursor.fetchone()[0]
         finally:
+            cursor.close()
             self.return_connection(conn)
     
-    def get_client_notes(self, client_id: int) -> List[Dict]:
-        """Get all notes for a client"""
-        conn = self.get_connection()
+    def get_client_with_history(self, client_id: int, company_id: int = None) -> Optional[Dict]:
+        """Get a client plus their bookings (oldest first) with appointment notes.
+        
+        Same data as get_client + get_client_bookings, but from one pooled
+        connection and one bookings/notes JOIN instead of a notes query per
+        booking. The returned client dict has the bookings under 'bookings';
+        the aggregated client 'notes' text from get_client is not included.
+        """
+        conn = self.get_connection(autocommit=True)
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         try:
-            cursor.execute("""
-                SELECT * FROM notes 
-                WHERE client_id = %s 
-                ORDER BY created_at DESC
-            """, (client_id,))
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+            if company_id:
+                cursor.execute("SELECT * FROM clients WHERE id = %s AND company_id = %s", (client_id, company_id))
+            else:
+                cursor.execute("SELECT * FROM clients WHERE id = %s", (client_id,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            client = dict(row)
+            
+            company_filter = "AND b.company_id = %s" if company_id else ""
+            cursor.execute(f"""
+                SELECT b.*, {_JOINED_NOTE_COLUMNS}
+                FROM bookings b
+                LEFT JOIN appointment_notes an ON an.booking_id = b.id
+                WHERE b.client_id = %s {company_filter}
+                ORDER BY b.appointment_time ASC, b.id, an.created_at DESC
+            """, (client_id, company_id) if company_id else (client_id,))
+            client['bookings'] = _group_booking_notes(cursor.fetchall())
+            return client
         finally:
+            cursor.close()
             self.return_connection(conn)
     
+    @_row_dicts
+    def get_client_notes(self, client_id: int) -> List[Dict]:
+        """Get all notes for a client"""
+        return """
+            SELECT * FROM notes 
+            WHERE client_id = %s 
+            ORDER BY created_at DESC
+        """, (client_id,)
+    
     def add_note(self, client_id: int, note: str, created_by: str = "system") -> int:
         """Add a note to a client"""
-        conn = self.get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
         try:
-            cursor.execute("""
-                INSERT INTO notes (client_id, note, created_by)
-                VALUES (%s, %s, %s)
-                RETURNING id
-            """, (client_id, note, created_by))
-            
-            result = cursor.fetchone()
-            note_id = result['id'] if result else None
-            conn.commit()
-            return note_id
+            with self.acquire_write() as conn:
+                cursor = conn.cursor(cursor_factory=RealDictCursor)
+                cursor.execute("""
+                    INSERT INTO notes (client_id, note, created_by)
+                    VALUES (%s, %s, %s)
+                    RETURNING id
+                """, (client_id, note, created_by))
+                result = cursor.fetchone()
+            self.invalidate_client_cache(client_id)
+            return result['id'] if result else None
         except Exception as e:
-            conn.rollback()
             print(f"Error adding note: {e}")
             return None
-        finally:
-            self.return_connection(conn)
     
+    @_row_dicts
     def get_appointment_notes(self, booking_id: int) -> List[Dict]:
         """Get all notes for a specific appointment"""
-        conn = self.get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        try:
-            cursor.execute("""
-                SELECT * FROM appointment_notes 
-                WHERE booking_id = %s 
-                ORDER BY created_at DESC
-            """, (booking_id,))
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        finally:
-            self.return_connection(conn)
+        return """
+            SELECT * FROM appointment_notes 
+            WHERE booking_id = %s 
+            ORDER BY created_at DESC
+        """, (booking_id,)
     
     def add_appointment_note(self, booking_id: int, note: str, created_by: str = "system") -> int:
-        """Add a note to a specific appointment"""
-        conn = self.get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        """Add a note to a specific appointment"""
         try:
-            cursor.execute("""
-                INSERT INTO appointment_notes (booking_id, note, created_by)
-                VALUES (%s, %s, %s)
-                RETURNING id
-            """, (booking_id, note, created_by))
-            
-            result = cursor.fetchone()
-            note_id = result['id'] if result else None
-            conn.commit()
-            return note_id
+            with self.acquire_write() as conn:
+                cursor = conn.cursor(cursor_factory=RealDictCursor)
+                cursor.execute("""
+                    INSERT INTO appointment_notes (booking_id, note, created_by)
+                    VALUES (%s, %s, %s)
+                    RETURNING id
+                """, (booking_id, note, created_by))
+                result = cursor.fetchone()
+            return result['id'] if result else None
         except Exception as e:
-            conn.rollback()
             print(f"Error adding appointment note: {e}")
             return None
-        finally:
-            self.return_connection(conn)
     
     def update_appointment_note(self, note_id: int, note: str, booking_id: int = None) -> bool:
         """Update an appointment note.
@@ -2820,100 +3605,69 @@ class PostgreSQLDatabaseWrapper:
             self.return_connection(conn)
     
     def get_financial_stats(self, company_id: int = None) -> Dict:
-        """Get financial statistics for a specific company"""
-        conn = self.get_connection()
+        """Get financial statistics for a specific company.
+        
+        Reads the trigger-maintained booking_stats_monthly counters rather
+        than aggregating bookings. Total, payment-status, monthly and
+        payment-method figures come back from one statement, one row per
+        figure tagged by `kind`.
+        """
+        conn = self.get_connection(autocommit=True)
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         try:
-            # Total revenue
-            if company_id:
-                cursor.execute("""
-                    SELECT SUM(charge) FROM bookings 
-                    WHERE company_id = %s AND status != 'cancelled'
-                """, (company_id,))
-            else:
-                cursor.execute("""
-                    SELECT SUM(charge) FROM bookings 
-                    WHERE status != 'cancelled'
-                """)
-            total_revenue = cursor.fetchone()['sum'] or 0
-            
-            # Payment breakdown
-            if company_id:
-                cursor.execute("""
-                    SELECT payment_status, SUM(charge)
-                    FROM bookings
-                    WHERE company_id = %s AND status != 'cancelled'
-                    GROUP BY payment_status
-                """, (company_id,))
-            else:
-                cursor.execute("""
-                    SELECT payment_status, SUM(charge)
-                    FROM bookings
-                    WHERE status != 'cancelled'
-                    GROUP BY payment_status
-                """)
-            payment_breakdown = cursor.fetchall()
-            
-            # Monthly revenue
-            if company_id:
-                cursor.execute("""
-                    SELECT TO_CHAR(appointment_time, 'YYYY-MM') as month,
-                           SUM(charge) as revenue,
-                           COUNT(*) as appointments
-                    FROM bookings 
-                    WHERE company_id = %s AND status != 'cancelled'
-                    GROUP BY month
-                    ORDER BY month DESC
-                    LIMIT 12
-                """, (company_id,))
-            else:
-                cursor.execute("""
-                    SELECT TO_CHAR(appointment_time, 'YYYY-MM') as month,
-                           SUM(charge) as revenue,
-                           COUNT(*) as appointments
-                    FROM bookings 
-                    WHERE status != 'cancelled'
-                    GROUP BY month
-                    ORDER BY month DESC
-                    LIMIT 12
-                """)
-            monthly_revenue = cursor.fetchall()
-            
-            # Revenue by payment method
-            if company_id:
-                cursor.execute("""
-                    SELECT payment_method, SUM(charge), COUNT(*)
-                    FROM bookings
-                    WHERE company_id = %s AND status != 'cancelled' AND payment_method IS NOT NULL
-                    GROUP BY payment_method
-                """, (company_id,))
-            else:
-                cursor.execute("""
-                    SELECT payment_method, SUM(charge), COUNT(*)
-                    FROM bookings
-                    WHERE status != 'cancelled' AND payment_method IS NOT NULL
-                    GROUP BY payment_method
-                """)
-            payment_methods = cursor.fetchall()
+            company_filter = "WHERE company_id = %s" if company_id else ""
+            cursor.execute(f"""
+                WITH stats AS (
+                    SELECT month, payment_status, payment_method, revenue, appointments
+                    FROM booking_stats_monthly
+                    {company_filter}
+                )
+                SELECT 'total' AS kind, NULL AS label, SUM(revenue) AS revenue, SUM(appointments) AS appointments
+                FROM stats
+                UNION ALL
+                SELECT 'payment_status', NULLIF(payment_status, ''), SUM(revenue), SUM(appointments)
+                FROM stats
+                GROUP BY payment_status
+                HAVING SUM(appointments) > 0
+                UNION ALL
+                (SELECT 'month', month, SUM(revenue), SUM(appointments)
+                 FROM stats
+                 GROUP BY month
+                 HAVING SUM(appointments) > 0
+                 ORDER BY month DESC
+                 LIMIT 12)
+                UNION ALL
+                SELECT 'payment_method', payment_method, SUM(revenue), SUM(appointments)
+                FROM stats
+                WHERE payment_method != ''
+                GROUP BY payment_method
+                HAVING SUM(appointments) > 0
+            """, (company_id,) if company_id else None)
+            rows = cursor.fetchall()
             
+            total_revenue = 0
             breakdown_dict = {'paid': 0, 'unpaid': 0}
-            for row in payment_breakdown:
-                status = row['payment_status'] or 'unpaid'
-                amount = float(row['sum'] or 0)
-                if status in breakdown_dict:
-                    breakdown_dict[status] = amount
+            monthly_revenue = []
+            payment_methods = {}
+            for row in rows:
+                kind = row['kind']
+                amount = round(float(row['revenue'] or 0), 2)
+                if kind == 'total':
+                    total_revenue = amount
+                elif kind == 'payment_status':
+                    status = row['label'] or 'unpaid'
+                    if status in breakdown_dict:
+                        breakdown_dict[status] = amount
+                elif kind == 'month':
+                    monthly_revenue.append({'month': row['label'], 'revenue': amount, 'appointments': int(row['appointments'])})
+                elif kind == 'payment_method':
+                    payment_methods[row['label']] = amount
             
             return {
-                'total_revenue': float(total_revenue),
+                'total_revenue': total_revenue,
                 'payment_breakdown': breakdown_dict,
-                'monthly_revenue': [
-                    {'month': row['month'], 'revenue': float(row['revenue'] or 0), 'appointments': row['appointments']}
-                    for row in monthly_revenue
-                ],
-                'payment_methods': {
-                    row['payment_method']: float(row['sum'] or 0)
-                    for row in payment_methods
-                }
+                'monthly_revenue': sorted(monthly_revenue, key=lambda m: m['month'], reverse=True),
+                'payment_methods': payment_methods
             }
         finally:
             self.return_connection(conn)
@@ -2942,159 +3696,194 @@ class PostgreSQLDatabaseWrapper:
         finally:
             self.return_connection(conn)
     
+    def invalidate_employee_cache(self, employee_id: int = None):
+        """Drop a cached get_employee row after the employee changed (all of them with no id)"""
+        if employee_id is None:
+            _employee_cache.clear()
+        else:
+            _employee_cache.invalidate(("employee", employee_id))
+    
     def get_employee(self, employee_id: int, company_id: int = None) -> Optional[Dict]:
         """Get employee by ID, optionally filtered by company_id for security"""
-        conn = self.get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        try:
+        cached = _employee_cache.get(("employee", employee_id))
+        if cached is not None:
+            if company_id and cached['company_id'] != company_id:
+                return None
+            return dict(cached)
+        
+        with self.acquire_read() as conn:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
             if company_id:
-                cursor.execute("SELECT * FROM employees WHERE id = %s AND company_id = %s", (employee_id, company_id))
+                _execute_prepared(cursor, "get_employee_for_company",
+                                  f"SELECT {_EMPLOYEE_COLUMNS} FROM employees WHERE id = %s AND company_id = %s",
+                                  (employee_id, company_id))
             else:
-                cursor.execute("SELECT * FROM employees WHERE id = %s", (employee_id,))
+                _execute_prepared(cursor, "get_employee",
+                                  f"SELECT {_EMPLOYEE_COLUMNS} FROM employees WHERE id = %s", (employee_id,))
             row = cursor.fetchone()
-            if row:
-                result = dict(row)
-                result['company_id'] = row.get('company_id')
-                return result
+        if not row:
             return None
-        finally:
-            self.return_connection(conn)
+        employee = dict(row)
+        _employee_cache.set(("employee", employee_id), employee)
+        return dict(employee)
     
     def update_employee(self, employee_id: int, **kwargs):
         """Update employee information"""
-        conn = self.get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        field_mapping = {
+            'specialty': 'trade_specialty'
+        }
+        
+        updates = {}
+        for key, value in kwargs.items():
+            db_key = field_mapping.get(key, key)
+            if db_key in _EMPLOYEE_UPDATE_COLUMNS:
+                updates[db_key] = value
+        
+        if not updates:
+            return
+        columns = tuple(c for c in _EMPLOYEE_UPDATE_COLUMNS if c in updates)
+        name, query = _employee_update_statement(columns)
+        params = tuple(updates[c] for c in columns) + (employee_id,)
         try:
-            field_mapping = {
-                'specialty': 'trade_specialty'
-            }
-            
-            fields = []
-            values = []
-            for key, value in kwargs.items():
-                db_key = field_mapping.get(key, key)
-                if db_key in ['name', 'phone', 'email', 'trade_specialty', 'status', 'image_url', 'weekly_hours_expected']:
-                    fields.append(f"{db_key} = %s")
-                    values.append(value)
-            
-            if fields:
-                values.append(datetime.now())
-                values.append(employee_id)
-                query = f"UPDATE employees SET {', '.join(fields)}, updated_at = %s WHERE id = %s"
-                cursor.execute(query, values)
-                conn.commit()
+            with self.acquire_write() as conn:
+                cursor = conn.cursor(cursor_factory=RealDictCursor)
+                _execute_prepared(cursor, name, query, params)
         except Exception as e:
-            conn.rollback()
             print(f"Error updating employee: {e}")
         finally:
-            self.return_connection(conn)
+            self.invalidate_employee_cache(employee_id)
     
     def delete_employee(self, employee_id: int, company_id: int = None) -> dict:
         """
         Delete an employee and remove from all job assignments (cascade delete).
         Returns dict with success status and count of removed assignments.
         """
-        conn = self.get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
         try:
-            # First, count employee assignments
-            cursor.execute("""
-                SELECT COUNT(*) as count FROM employee_assignments 
-                WHERE employee_id = %s
-            """, (employee_id,))
-            result = cursor.fetchone()
-            assignments_count = result['count'] if result else 0
-            
-            # Delete employee assignments
-            cursor.execute("DELETE FROM employee_assignments WHERE employee_id = %s", (employee_id,))
-            
-            # Update bookings to remove this employee from assigned_employee_ids array
-            cursor.execute("""
-                UPDATE bookings 
-                SET assigned_employee_ids = array_remove(assigned_employee_ids, %s)
-                WHERE %s = ANY(assigned_employee_ids)
-            """, (employee_id, employee_id))
-            
-            # Delete the employee
-            if company_id:
-                cursor.execute("DELETE FROM employees WHERE id = %s AND company_id = %s", (employee_id, company_id))
-            else:
-                cursor.execute("DELETE FROM employees WHERE id = %s", (employee_id,))
-            
-            employee_deleted = cursor.rowcount > 0
-            conn.commit()
+            with self.acquire_write() as conn:
+                cursor = conn.cursor(cursor_factory=RealDictCursor)
+                # First, count employee assignments
+                cursor.execute("""
+                    SELECT COUNT(*) as count FROM employee_assignments 
+                    WHERE employee_id = %s
+                """, (employee_id,))
+                result = cursor.fetchone()
+                assignments_count = result['count'] if result else 0
+                
+                # Delete employee assignments
+                cursor.execute("DELETE FROM employee_assignments WHERE employee_id = %s", (employee_id,))
+                
+                # Update bookings to remove this employee from assigned_employee_ids array
+                cursor.execute("""
+                    UPDATE bookings 
+                    SET assigned_employee_ids = array_remove(assigned_employee_ids, %s)
+                    WHERE %s = ANY(assigned_employee_ids)
+                """, (employee_id, employee_id))
+                
+                # Delete the employee
+                if company_id:
+                    cursor.execute("DELETE FROM employees WHERE id = %s AND company_id = %s", (employee_id, company_id))
+                else:
+                    cursor.execute("DELETE FROM employees WHERE id = %s", (employee_id,))
+                
+                employee_deleted = cursor.rowcount > 0
             
+            self.invalidate_employee_cache(employee_id)
             return {
                 "success": employee_deleted,
                 "assignments_removed": assignments_count
             }
         except Exception as e:
-            conn.rollback()
             print(f"Error deleting employee: {e}")
             return {
                 "success": False,
                 "error": str(e),
                 "assignments_removed": 0
             }
-        finally:
-            self.return_connection(conn)
     
     def assign_employee_to_job(self, booking_id: int, employee_id: int) -> Dict:
         """Assign an employee to a job"""
-        conn = self.get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
         try:
-            cursor.execute("""
-                INSERT INTO employee_assignments (booking_id, employee_id)
-                VALUES (%s, %s)
-                RETURNING id
-            """, (booking_id, employee_id))
-            
-            result = cursor.fetchone()
-            assignment_id = result['id'] if result else None
-            conn.commit()
+            with self.acquire_write() as conn:
+                cursor = conn.cursor(cursor_factory=RealDictCursor)
+                # A duplicate hits UNIQUE(booking_id, employee_id) and comes back
+                # as no row, rather than as an IntegrityError to catch
+                cursor.execute("""
+                    INSERT INTO employee_assignments (booking_id, employee_id)
+                    VALUES (%s, %s)
+                    ON CONFLICT (booking_id, employee_id) DO NOTHING
+                    RETURNING id, assigned_at
+                """, (booking_id, employee_id))
+                result = cursor.fetchone()
             
+            if result is None:
+                return {
+                    "success": False,
+                    "error": "Employee is already assigned to this job"
+                }
+            assigned_at = result['assigned_at']
             return {
                 "success": True,
-                "assignment_id": assignment_id,
+                "assignment_id": result['id'],
+                # ISO string, not a datetime - this dict is returned by the API as-is
+                "assigned_at": assigned_at.isoformat() if hasattr(assigned_at, 'isoformat') else assigned_at,
                 "message": "Employee assigned successfully"
             }
         except Exception as e:
-            conn.rollback()
             return {
                 "success": False,
                 "error": str(e)
             }
-        finally:
-            self.return_connection(conn)
+    
+    def assign_employees_bulk(self, pairs: List[tuple]) -> Dict:
+        """
+        Assign several (booking_id, employee_id) pairs in one INSERT and one
+        commit. Pairs already assigned are skipped rather than failing the batch.
+        Availability is the caller's job, as with assign_employee_to_job.
+        """
+        pairs = list(dict.fromkeys((int(b), int(e)) for b, e in pairs))
+        if not pairs:
+            return {"success": True, "assigned": []}
+        try:
+            with self.acquire_write() as conn:
+                cursor = conn.cursor(cursor_factory=RealDictCursor)
+                rows = execute_values(cursor, """
+                    INSERT INTO employee_assignments (booking_id, employee_id)
+                    VALUES %s
+                    ON CONFLICT (booking_id, employee_id) DO NOTHING
+                    RETURNING booking_id, employee_id
+                """, pairs, fetch=True)
+            return {
+                "success": True,
+                "assigned": [(row['booking_id'], row['employee_id']) for row in rows]
+            }
+        except Exception as e:
+            print(f"Error assigning employees: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
     
     def remove_employee_from_job(self, booking_id: int, employee_id: int) -> bool:
         """Remove an employee assignment from a job"""
-        conn = self.get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
         try:
-            cursor.execute("""
-                DELETE FROM employee_assignments
-                WHERE booking_id = %s AND employee_id = %s
-            """, (booking_id, employee_id))
-            
-            rows_affected = cursor.rowcount
-            conn.commit()
+            with self.acquire_write() as conn:
+                cursor = conn.cursor(cursor_factory=RealDictCursor)
+                cursor.execute("""
+                    DELETE FROM employee_assignments
+                    WHERE booking_id = %s AND employee_id = %s
+                """, (booking_id, employee_id))
+                rows_affected = cursor.rowcount
             return rows_affected > 0
         except Exception as e:
-            conn.rollback()
             print(f"Error removing employee from job: {e}")
             return False
-        finally:
-            self.return_connection(conn)
     
     def get_job_employees(self, booking_id: int, company_id: int = None) -> List[Dict]:
         """Get all employees assigned to a specific job, optionally filtered by company_id for security"""
-        conn = self.get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        try:
+        with self.acquire_read() as conn:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
             if company_id:
-                cursor.execute("""
+                _execute_prepared(cursor, "get_job_employees_for_company", """
                     SELECT w.id, w.name, w.phone, w.email, w.trade_specialty, wa.assigned_at
                     FROM employee_assignments wa
                     JOIN employees w ON wa.employee_id = w.id
@@ -3102,23 +3891,52 @@ class PostgreSQLDatabaseWrapper:
                     WHERE wa.booking_id = %s AND b.company_id = %s
                 """, (booking_id, company_id))
             else:
-                cursor.execute("""
+                _execute_prepared(cursor, "get_job_employees", """
                     SELECT w.id, w.name, w.phone, w.email, w.trade_specialty, wa.assigned_at
                     FROM employee_assignments wa
                     JOIN employees w ON wa.employee_id = w.id
                     WHERE wa.booking_id = %s
                 """, (booking_id,))
             
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
-        finally:
-            self.return_connection(conn)
+            return [dict(row) for row in cursor]
     
-    def get_employee_jobs(self, employee_id: int, include_completed: bool = False, company_id: int = None) -> List[Dict]:
-        """Get all jobs assigned to a specific employee, optionally filtered by company_id for security"""
-        conn = self.get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        try:
+    def get_job_employees_bulk(self, booking_ids: List[int], company_id: int = None) -> Dict[int, List[Dict]]:
+        """
+        get_job_employees for many bookings in one query, keyed by booking id.
+        Every requested booking gets an entry (empty list if nobody is assigned).
+        """
+        booking_ids = list({int(b) for b in booking_ids if b is not None})
+        if not booking_ids:
+            return {}
+        result = {booking_id: [] for booking_id in booking_ids}
+        with self.acquire_read() as conn:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            query = """
+                SELECT wa.booking_id, w.id, w.name, w.phone, w.email, w.trade_specialty, wa.assigned_at
+                FROM employee_assignments wa
+                JOIN employees w ON wa.employee_id = w.id
+            """
+            if company_id:
+                query += " JOIN bookings b ON wa.booking_id = b.id WHERE wa.booking_id = ANY(%s) AND b.company_id = %s"
+                params = (booking_ids, company_id)
+            else:
+                query += " WHERE wa.booking_id = ANY(%s)"
+                params = (booking_ids,)
+            cursor.execute(query, params)
+            for row in cursor:
+                employee = dict(row)
+                result[employee.pop('booking_id')].append(employee)
+        return result
+    
+    def get_employee_jobs(self, employee_id: int, include_completed: bool = False, company_id: int = None,
+                          use_replica: bool = False) -> List[Dict]:
+        """
+        Get all jobs assigned to a specific employee, optionally filtered by company_id for security.
+        use_replica=True may read from the replica - only for display, never
+        for "is this employee on this job" checks straight after an assignment.
+        """
+        with (self.acquire_replica() if use_replica else self.acquire_read()) as conn:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
             query = """
                 SELECT b.id, b.appointment_time, c.name as client_name, b.service_type, 
                        b.status, b.address, b.phone_number, wa.assigned_at,
@@ -3142,10 +3960,12 @@ class PostgreSQLDatabaseWrapper:
             
             query += " ORDER BY b.appointment_time ASC"
             
-            cursor.execute(query, tuple(params))
-            rows = cursor.fetchall()
+            # Four possible query texts - one prepared statement each
+            _execute_prepared(cursor, f"get_employee_jobs_{int(bool(company_id))}{int(bool(include_completed))}",
+                              query, tuple(params))
+            # Build the dicts straight off the cursor - no intermediate row list
             result = []
-            for row in rows:
+            for row in cursor:
                 d = dict(row)
                 # Serialize datetimes as ISO strings to prevent Flask GMT format shift
                 for key in ('appointment_time', 'job_started_at', 'job_completed_at', 'assigned_at', 'emergency_accepted_at'):
@@ -3153,14 +3973,12 @@ class PostgreSQLDatabaseWrapper:
                         d[key] = d[key].isoformat()
                 result.append(d)
             return result
-        finally:
-            self.return_connection(conn)
     
-    def get_employee_schedule(self, employee_id: int, start_date: str = None, end_date: str = None) -> List[Dict]:
-        """Get employee's schedule within a date range"""
-        conn = self.get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        try:
+    def get_employee_schedule(self, employee_id: int, start_date: str = None, end_date: str = None,
+                              use_replica: bool = False) -> List[Dict]:
+        """Get employee's schedule within a date range (use_replica: as get_employee_jobs)"""
+        with (self.acquire_replica() if use_replica else self.acquire_read()) as conn:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
             query = """
                 SELECT b.id, b.appointment_time, c.name as client_name, b.service_type, 
                        b.status, b.address, b.duration_minutes, b.charge, b.eircode,
@@ -3174,20 +3992,22 @@ class PostgreSQLDatabaseWrapper:
             
             params = [employee_id]
             
+            # Half-open [start, end): one index range seek on appointment_time,
+            # and an end date of "2030-03-31" still includes jobs that day
             if start_date:
                 query += " AND b.appointment_time >= %s"
-                params.append(start_date)
+                params.append(_range_bound(start_date))
             
             if end_date:
-                query += " AND b.appointment_time <= %s"
-                params.append(end_date)
+                query += " AND b.appointment_time < %s"
+                params.append(_range_bound(end_date, end=True))
             
             query += " ORDER BY b.appointment_time ASC"
             
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
+            _execute_prepared(cursor, f"get_employee_schedule_{int(bool(start_date))}{int(bool(end_date))}",
+                              query, tuple(params))
             result = []
-            for row in rows:
+            for row in cursor:
                 d = dict(row)
                 # Serialize datetime as ISO string (no timezone) to prevent Flask
                 # from converting to "Fri, 25 Apr 2025 08:00:00 GMT" format
@@ -3195,40 +4015,30 @@ class PostgreSQLDatabaseWrapper:
                     d['appointment_time'] = d['appointment_time'].isoformat()
                 result.append(d)
             return result
-        finally:
-            self.return_connection(conn)
     
     def get_employee_hours_this_week(self, employee_id: int) -> float:
         """Calculate hours worked by an employee this week"""
-        from datetime import timedelta
+        today = datetime.now()
+        start_of_week = today - timedelta(days=today.weekday())
+        start_of_week = start_of_week.replace(hour=0, minute=0, second=0, microsecond=0)
+        end_of_week = start_of_week + timedelta(days=7)
         
-        conn = self.get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        try:
-            today = datetime.now()
-            start_of_week = today - timedelta(days=today.weekday())
-            start_of_week = start_of_week.replace(hour=0, minute=0, second=0, microsecond=0)
-            end_of_week = start_of_week + timedelta(days=7)
-            
-            query = """
-                SELECT COUNT(*) as job_count
-                FROM employee_assignments wa
-                JOIN bookings b ON wa.booking_id = b.id
-                WHERE wa.employee_id = %s
-                AND b.appointment_time >= %s
-                AND b.appointment_time < %s
-                AND b.status = 'completed'
-            """
-            
+        query = """
+            SELECT COUNT(*) as job_count
+            FROM employee_assignments wa
+            JOIN bookings b ON wa.booking_id = b.id
+            WHERE wa.employee_id = %s
+            AND b.appointment_time >= %s
+            AND b.appointment_time < %s
+            AND b.status = 'completed'
+        """
+        with self.acquire_read() as conn:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
             cursor.execute(query, (employee_id, start_of_week.isoformat(), end_of_week.isoformat()))
             result = cursor.fetchone()
-            
-            job_count = result['job_count'] if result else 0
-            hours_worked = job_count * 2.0
-            
-            return hours_worked
-        finally:
-            self.return_connection(conn)
+        
+        job_count = result['job_count'] if result else 0
+        return job_count * 2.0
 
     def get_employees_hours_this_week(self, company_id: int) -> Dict[int, float]:
         """Batch: calculate hours worked this week for all employees in a company.
@@ -3342,14 +4152,8 @@ class PostgreSQLDatabaseWrapper:
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         try:
             # Parse times if strings
-            if isinstance(range_start, str):
-                range_start = datetime.fromisoformat(range_start.replace('Z', '+00:00'))
-            if isinstance(range_end, str):
-                range_end = datetime.fromisoformat(range_end.replace('Z', '+00:00'))
-            if hasattr(range_start, 'tzinfo') and range_start.tzinfo:
-                range_start = range_start.replace(tzinfo=None)
-            if hasattr(range_end, 'tzinfo') and range_end.tzinfo:
-                range_end = range_end.replace(tzinfo=None)
+            range_start = _naive_datetime(range_start)
+            range_end = _naive_datetime(range_end)
 
             # Fetch bookings that START before range_end (they could overlap)
             # We fetch broadly and filter in Python for multi-day job accuracy
@@ -3376,17 +4180,9 @@ class PostgreSQLDatabaseWrapper:
             # Normalize datetimes
             result = []
             for row in rows:
-                appt = row['appointment_time']
-                if isinstance(appt, str):
-                    try:
-                        appt = datetime.fromisoformat(appt.replace('Z', '+00:00'))
-                    except ValueError:
-                        appt = datetime.strptime(appt, '%Y-%m-%d %H:%M:%S')
-                if hasattr(appt, 'tzinfo') and appt.tzinfo:
-                    appt = appt.replace(tzinfo=None)
                 result.append({
                     'id': row['id'],
-                    'appointment_time': appt,
+                    'appointment_time': _naive_datetime(row['appointment_time']),
                     'duration_minutes': row.get('duration_minutes') or 60
                 })
             return result
@@ -3421,16 +4217,8 @@ class PostgreSQLDatabaseWrapper:
         conn = self.get_connection()
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         try:
-            # Parse appointment time if string
-            if isinstance(appointment_time, str):
-                try:
-                    appointment_time = datetime.fromisoformat(appointment_time.replace('Z', '+00:00'))
-                except ValueError:
-                    appointment_time = datetime.strptime(appointment_time, '%Y-%m-%d %H:%M:%S')
-            
-            # Make timezone-naive for comparison
-            if hasattr(appointment_time, 'tzinfo') and appointment_time.tzinfo is not None:
-                appointment_time = appointment_time.replace(tzinfo=None)
+            # Parse appointment time if string, timezone-naive for comparison
+            appointment_time = _naive_datetime(appointment_time)
             
             # --- Check approved time-off first ---
             try:
@@ -3523,7 +4311,10 @@ class PostgreSQLDatabaseWrapper:
                 appointment_time, duration_minutes, start_hour, end_hour, buffer_minutes=0, company_id=company_id
             )
             
-            # Get all active jobs assigned to this employee
+            # Active jobs for this employee that could overlap. Exact end times
+            # need the business-day walk below, so SQL only narrows the window:
+            # a job must start before ours ends, and can't end later than
+            # 7 calendar days per business day it needs (at most a year).
             query = """
                 SELECT b.id, b.appointment_time, b.duration_minutes, b.service_type,
                        c.name as client_name, b.address
@@ -3532,8 +4323,13 @@ class PostgreSQLDatabaseWrapper:
                 LEFT JOIN clients c ON b.client_id = c.id
                 WHERE wa.employee_id = %s
                 AND b.status NOT IN ('completed', 'cancelled')
+                AND b.appointment_time < %s
+                AND b.appointment_time > %s - INTERVAL '366 days'
+                AND b.appointment_time > %s - LEAST(
+                    7 * CEIL(GREATEST(COALESCE(b.duration_minutes, 60), 1440) / 1440.0), 366
+                ) * INTERVAL '1 day'
             """
-            params = [employee_id]
+            params = [employee_id, appointment_end, appointment_time, appointment_time]
             
             if company_id:
                 query += " AND b.company_id = %s"
@@ -3548,16 +4344,7 @@ class PostgreSQLDatabaseWrapper:
             
             conflicts = []
             for job in existing_jobs:
-                job_time = job['appointment_time']
-                if isinstance(job_time, str):
-                    try:
-                        job_time = datetime.fromisoformat(job_time.replace('Z', '+00:00'))
-                    except ValueError:
-                        job_time = datetime.strptime(job_time, '%Y-%m-%d %H:%M:%S')
-                
-                if hasattr(job_time, 'tzinfo') and job_time.tzinfo is not None:
-                    job_time = job_time.replace(tzinfo=None)
-                
+                job_time = _naive_datetime(job['appointment_time'])
                 job_duration = job.get('duration_minutes') or 60
                 
                 # Calculate the TRUE end time of the existing job
@@ -3926,17 +4713,10 @@ class PostgreSQLDatabaseWrapper:
     # Service Categories (per-company)
     # ==========================================
 
+    @_row_dicts
     def get_service_categories(self, company_id: int) -> List[Dict]:
-        conn = self.get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        try:
-            cursor.execute(
-                "SELECT * FROM service_categories WHERE company_id = %s ORDER BY sort_order, name",
-                (company_id,)
-            )
-            return [dict(r) for r in cursor.fetchall()]
-        finally:
-            self.return_connection(conn)
+        return ("SELECT * FROM service_categories WHERE company_id = %s ORDER BY sort_order, name",
+                (company_id,))
 
     def add_service_category(self, company_id: int, name: str, color: str = None) -> bool:
         conn = self.get_connection()
@@ -4194,38 +4974,20 @@ class PostgreSQLDatabaseWrapper:
         finally:
             self.return_connection(conn)
 
+    @_row_dicts(one=True)
     def get_employee_account_by_email(self, email: str) -> Optional[Dict]:
         """Get employee account by email"""
-        conn = self.get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        try:
-            cursor.execute("SELECT * FROM employee_accounts WHERE email = %s", (email,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        finally:
-            self.return_connection(conn)
+        return "SELECT * FROM employee_accounts WHERE email = %s", (email,)
 
+    @_row_dicts(one=True)
     def get_employee_account_by_invite_token(self, token: str) -> Optional[Dict]:
         """Get employee account by invite token"""
-        conn = self.get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        try:
-            cursor.execute("SELECT * FROM employee_accounts WHERE invite_token = %s", (token,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        finally:
-            self.return_connection(conn)
+        return "SELECT * FROM employee_accounts WHERE invite_token = %s", (token,)
 
+    @_row_dicts(one=True)
     def get_employee_account_by_employee_id(self, employee_id: int) -> Optional[Dict]:
         """Get employee account by employee_id"""
-        conn = self.get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        try:
-            cursor.execute("SELECT * FROM employee_accounts WHERE employee_id = %s", (employee_id,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        finally:
-            self.return_connection(conn)
+        return "SELECT * FROM employee_accounts WHERE employee_id = %s", (employee_id,)
 
     def set_employee_account_password(self, account_id: int, password_hash: str) -> bool:
         """Set password for an employee account (first-time setup)"""
@@ -4264,17 +5026,10 @@ class PostgreSQLDatabaseWrapper:
         finally:
             self.return_connection(conn)
 
+    @_row_dicts(one=True)
     def get_employee_account_by_reset_token(self, token: str) -> Optional[Dict]:
         """Get employee account by password reset token"""
-        conn = self.get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        try:
-            cursor.execute("SELECT * FROM employee_accounts WHERE reset_token = %s", (token,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-        finally:
-            cursor.close()
-            self.return_connection(conn)
+        return "SELECT * FROM employee_accounts WHERE reset_token = %s", (token,)
 
     def update_employee_account_reset_token(self, account_id: int, reset_token, reset_token_expires) -> bool:
         """Set or clear the password reset token for an employee account"""
@@ -4696,6 +5451,7 @@ class PostgreSQLDatabaseWrapper:
         conn = self.get_connection()
         cursor = conn.cursor()
         try:
+            cursor.execute(_ASYNC_COMMIT)
             cursor.execute("""
                 INSERT INTO call_logs 
                 (company_id, phone_number, caller_name, address, eircode,
@@ -4729,6 +5485,7 @@ class PostgreSQLDatabaseWrapper:
             if not updates:
                 return False
             params.append(call_log_id)
+            cursor.execute(_ASYNC_COMMIT)
             cursor.execute(f"UPDATE call_logs SET {', '.join(updates)} WHERE id = %s", tuple(params))
             conn.commit()
             return cursor.rowcount > 0
@@ -21,11 +21,34 @@ from src.utils.security import normalize_phone_for_comparison
 from src.utils.industry_config import get_filler_keywords
 from datetime import datetime, timedelta
 
+# Try to import orjson for faster tool-result serialization
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 # Configuration constants
 DEFAULT_APPOINTMENT_DURATION_MINUTES = 1440  # Default duration for AI phone bookings (1 day for trades)
 
 
+def dumps_tool_result(result) -> str:
+    """
+    Serialize a tool result for the "tool" message content.
+    
+    Uses orjson when installed (several times faster than json.dumps on the
+    larger availability/booking payloads), falling back to json.dumps for
+    anything orjson won't encode.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+    return json.dumps(result)
+
+
 def format_for_tts_spelling(text: str) -> str:
     """
     Format text for TTS to read spelled-out content more slowly.
@@ -2373,7 +2396,7 @@ TOOL RULES:
                     "tool_call_id": tool_call["id"],
                     "role": "tool",
                     "name": tool_name,
-                    "content": json.dumps(result)
+                    "content": dumps_tool_result(result)
                 })
                 
                 print(f"   ✅ [TOOL_DONE] Result: {result.get('message', result.get('success'))}")
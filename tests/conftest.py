@@ -23,3 +23,12 @@ def _block_real_openai():
     """Prevent tests from making real OpenAI API calls (client_description_generator)."""
     with patch("src.services.client_description_generator.update_client_description", return_value=True):
         yield
+
+
+@pytest.fixture(autouse=True)
+def _fresh_client_cache():
+    """Don't let a client or employee cached by one test leak into the next."""
+    from src.services.db_postgres_wrapper import _client_cache, _employee_cache
+    _client_cache.clear()
+    _employee_cache.clear()
+    yield
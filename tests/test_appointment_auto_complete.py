@@ -0,0 +1,33 @@
+"""
+Tests for the overdue-appointment auto-complete job.
+
+Whether a booking already has notes comes back with the overdue query, so
+the job doesn't look up notes booking by booking.
+"""
+import sys
+import os
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.services import appointment_auto_complete
+
+
+def test_notes_checked_in_overdue_query():
+    db = Mock()
+    cursor = db.get_connection.return_value.cursor.return_value
+    cursor.fetchall.return_value = [
+        (1, 10, 5, datetime(2030, 3, 14, 10, 0), 'Repair', True),
+        (2, 11, 5, datetime(2030, 3, 14, 12, 0), None, False),
+    ]
+
+    with patch('src.services.database.get_database', return_value=db), \
+            patch.object(appointment_auto_complete, 'update_client_description', return_value=True):
+        assert appointment_auto_complete.auto_complete_overdue_appointments() == 2
+
+    assert 'EXISTS (SELECT 1 FROM appointment_notes' in cursor.execute.call_args.args[0]
+    db.get_appointment_notes.assert_not_called()
+    db.add_appointment_note.assert_called_once()
+    assert db.add_appointment_note.call_args.kwargs['booking_id'] == 2
+    assert db.update_booking.call_count == 2
@@ -0,0 +1,27 @@
+"""
+Tests for the calendar formatting helpers.
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.services.calendar_formatting import fuzzy_match_name
+
+
+class TestFuzzyMatchName:
+    def test_exact_match_beats_first_and_last_name_hit(self):
+        names = ['Mary A Byrne', 'Mary B Byrne']
+        assert fuzzy_match_name('Mary B Byrne', names, stop_at=95) == ('Mary B Byrne', 100, 1)
+
+    def test_exact_match_ignores_accents(self):
+        names = ['Sean A Murphy', 'Seán Murphy']
+        assert fuzzy_match_name('sean murphy', names, stop_at=95) == ('Seán Murphy', 100, 1)
+
+    def test_stop_at_accepts_first_and_last_name_hit(self):
+        names = ['Mary A Byrne', 'Mary B Byrne']
+        assert fuzzy_match_name('Mary Byrne', names, stop_at=95) == ('Mary A Byrne', 95, 0)
+
+    def test_no_candidates(self):
+        assert fuzzy_match_name('Mary Byrne', []) == (None, 0, -1)
@@ -358,11 +358,8 @@ class TestDBCalloutColumn:
 
     def test_update_booking_whitelist_includes_requires_callout(self):
         """update_booking should allow requires_callout in its field whitelist"""
-        import inspect
-        from src.services.db_postgres_wrapper import PostgreSQLDatabaseWrapper
-        # Read the source to verify the whitelist
-        source = inspect.getsource(PostgreSQLDatabaseWrapper.update_booking)
-        assert 'requires_callout' in source
+        from src.services.db_postgres_wrapper import _BOOKING_UPDATE_FIELDS
+        assert 'requires_callout' in _BOOKING_UPDATE_FIELDS
 
     def test_add_service_accepts_requires_callout(self):
         """add_service should accept requires_callout parameter"""
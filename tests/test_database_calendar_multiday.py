@@ -237,3 +237,36 @@ class TestCheckAvailabilityMultiDay:
             mock_dt.side_effect = lambda *a, **kw: datetime(*a, **kw)
             result = svc.check_availability(week3_wed, duration_minutes=60)
         assert result is False
+
+
+class TestFindAppointmentByDetails:
+    """Time-based lookups use the indexed near-time query, not a full scan."""
+
+    def _booking(self, **overrides):
+        booking = {'id': 42, 'appointment_time': '2030-03-14T10:00:00', 'status': 'scheduled',
+                   'service_type': 'Boiler service', 'client_name': 'Mary Byrne'}
+        booking.update(overrides)
+        return booking
+
+    def test_time_lookup_uses_near_time_query(self):
+        svc = make_service()
+        svc.db.get_bookings_near_time.return_value = [self._booking()]
+
+        event = svc.find_appointment_by_details('mary', datetime(2030, 3, 14, 10, 2))
+
+        assert event['id'] == '42'
+        assert event['summary'] == 'Boiler service - Mary Byrne'
+        svc.db.get_bookings_near_time.assert_called_once_with(
+            datetime(2030, 3, 14, 10, 2), company_id=1, tolerance_minutes=5
+        )
+        svc.db.get_all_bookings.assert_not_called()
+
+    def test_name_mismatch_not_returned(self):
+        svc = make_service()
+        svc.db.get_bookings_near_time.return_value = [self._booking()]
+        assert svc.find_appointment_by_details('john', datetime(2030, 3, 14, 10, 0)) is None
+
+    def test_name_only_still_scans(self):
+        svc = make_service([self._booking()])
+        assert svc.find_appointment_by_details('mary')['booking_id'] == 42
+        svc.db.get_bookings_near_time.assert_not_called()
@@ -0,0 +1,1164 @@
+"""
+Query-shape tests for PostgreSQLDatabaseWrapper.
+
+No database is needed: the wrapper is built without running __init__ and
+handed a mock connection, so each test checks the SQL and parameters a
+method sends and how it shapes the rows that come back.
+"""
+import pytest
+import sys
+import os
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.services.db_postgres_wrapper import PostgreSQLDatabaseWrapper, _phone_variants, _group_booking_notes, _naive_datetime
+
+
+@pytest.fixture
+def db():
+    """Wrapper with a mock pool; db.cursor is the cursor every method gets"""
+    wrapper = object.__new__(PostgreSQLDatabaseWrapper)
+    conn = MagicMock()
+    cursor = MagicMock()
+    cursor.fetchall.return_value = []
+    cursor.fetchone.return_value = None
+    # Iterating a psycopg2 cursor yields the same rows fetchall() would
+    cursor.__iter__.side_effect = lambda: iter(cursor.fetchall())
+    conn.cursor.return_value = cursor
+    wrapper.get_connection = MagicMock(return_value=conn)
+    wrapper.return_connection = MagicMock()
+    wrapper.conn = conn
+    wrapper.cursor = cursor
+    return wrapper
+
+
+def executed(cursor):
+    """(sql, params) of the last execute call, with whitespace collapsed"""
+    sql, params = cursor.execute.call_args.args
+    return ' '.join(sql.split()), params
+
+
+class TestPhoneVariants:
+    def test_irish_mobile_formats(self):
+        assert set(_phone_variants('085 123 4567')) == {
+            '085 123 4567', '+353851234567', '0851234567', '353851234567'
+        }
+
+    def test_empty(self):
+        assert _phone_variants('') == []
+        assert _phone_variants(None) == []
+
+
+class TestNaiveDatetime:
+    def test_parses_strings_and_strips_timezone(self):
+        from datetime import datetime, timezone
+        expected = datetime(2030, 3, 14, 10, 0)
+        assert _naive_datetime('2030-03-14T10:00:00Z') == expected
+        assert _naive_datetime('2030-03-14 10:00:00') == expected
+        assert _naive_datetime(expected.replace(tzinfo=timezone.utc)) == expected
+        assert _naive_datetime(expected) is expected
+
+
+class TestLookupClient:
+    def test_name_and_phone_in_one_query(self, db):
+        db.cursor.fetchall.return_value = [{'id': 3, 'name': 'Mary Byrne', 'name_match': True, 'phone_match': True}]
+
+        result = db.lookup_client(name='Mary Byrne ', phone='0851234567', company_id=5)
+
+        assert result[0]['id'] == 3
+        assert db.cursor.execute.call_count == 1
+        sql, params = executed(db.cursor)
+        assert 'name_normalized = %s AS name_match' in sql
+        assert 'phone IN (' in sql and 'AS phone_match' in sql
+        assert 'WHERE name_match OR phone_match' in sql
+        assert sql.index('(name_match AND phone_match) DESC') < sql.index('name_match DESC') < sql.index('updated_at DESC')
+        assert 'LIMIT' not in sql
+        assert params[0] == 'mary byrne' and params[-1] == 5
+        assert sql.count('%s') == len(params)
+        db.return_connection.assert_called_once_with(db.conn)
+
+    def test_name_only(self, db):
+        db.lookup_client(name='Mary', company_id=5)
+        sql, params = executed(db.cursor)
+        assert 'phone IN' not in sql
+        assert 'FALSE AS phone_match' in sql
+        assert params == ('mary', 5)
+
+    def test_phone_only_with_dob(self, db):
+        db.lookup_client(phone='+353851234567', date_of_birth='1980-02-01', company_id=5)
+        sql, params = executed(db.cursor)
+        assert 'name_normalized' not in sql
+        assert 'company_id = %s AND date_of_birth = %s' in sql
+        assert params[-2:] == (5, '1980-02-01')
+        assert sql.count('%s') == len(params)
+
+    def test_limit(self, db):
+        db.lookup_client(name='Mary', company_id=5, limit=5)
+        sql, params = executed(db.cursor)
+        assert 'LIMIT %s' in sql
+        assert params == ('mary', 5, 5)
+
+    def test_nothing_to_search(self, db):
+        assert db.lookup_client(company_id=5) == []
+        db.get_connection.assert_not_called()
+
+
+def joined_row(booking_id, note_id=None, note=None, **booking):
+    """A bookings LEFT JOIN appointment_notes row"""
+    row = {'id': booking_id, 'service_type': 'Repair'}
+    row.update(booking)
+    row.update({'note_id': note_id, 'note_note': note, 'note_created_by': 'system' if note_id else None,
+                'note_created_at': None, 'note_updated_at': None})
+    return row
+
+
+class TestGroupBookingNotes:
+    def test_groups_notes_under_each_booking(self):
+        bookings = _group_booking_notes([
+            joined_row(2, 20, 'second note'),
+            joined_row(2, 19, 'first note'),
+            joined_row(1),
+        ])
+        assert [b['id'] for b in bookings] == [2, 1]
+        assert [n['note'] for n in bookings[0]['notes']] == ['second note', 'first note']
+        assert bookings[0]['notes'][0]['booking_id'] == 2
+        assert bookings[1]['notes'] == []
+        assert not any(k.startswith('note_') for b in bookings for k in b)
+
+
+class TestGetClientBookings:
+    def test_notes_joined_in_one_query(self, db):
+        db.cursor.fetchall.return_value = [joined_row(2, 20, 'note'), joined_row(1)]
+
+        bookings = db.get_client_bookings(7, company_id=5)
+
+        assert [b['id'] for b in bookings] == [2, 1]
+        assert [n['note'] for n in bookings[0]['notes']] == ['note']
+        assert bookings[1]['notes'] == []
+        assert db.cursor.execute.call_count == 1
+        sql, params = executed(db.cursor)
+        assert 'LEFT JOIN appointment_notes an ON an.booking_id = b.id' in sql
+        assert 'ORDER BY b.appointment_time DESC' in sql
+        assert params == (7, 5)
+
+    def test_rows_keyed_by_column_name(self, db):
+        db.cursor.fetchall.return_value = [joined_row(2, 20, 'note', address='1 Main St', eircode=None)]
+
+        booking = db.get_client_bookings(7)[0]
+
+        assert booking['address'] == '1 Main St' and booking['eircode'] is None
+        assert not any(key.startswith('note_') for key in booking)
+        assert executed(db.cursor)[1] == (7,)
+
+
+class TestAddBooking:
+    def test_single_insert_statement(self, db):
+        db.cursor.fetchone.return_value = {'id': 42}
+
+        booking_id = db.add_booking(7, 'evt-1', '2030-03-14 10:00:00', 'Repair',
+                                    phone_number='0851234567', company_id=5)
+
+        assert booking_id == 42
+        assert db.cursor.execute.call_count == 1
+        sql, params = executed(db.cursor)
+        assert 'INSERT INTO bookings' in sql and 'UPDATE clients' not in sql
+        assert 'COALESCE(%s, 0)' in sql
+        assert sql.count('%s') == len(params)
+        assert params[0] == 7 and params[4:10] == (False, 7, '0851234567', False, 7, None)
+        assert params[14] is None and params[16] == 5
+        db.conn.commit.assert_called_once()
+
+    def test_contact_details_fall_back_to_client(self, db):
+        db.cursor.fetchone.return_value = {'id': 42}
+
+        db.add_booking(7, 'evt-1', '2030-03-14 10:00:00', 'Repair', charge=80.0, company_id=5)
+
+        assert db.cursor.execute.call_count == 1
+        sql, params = executed(db.cursor)
+        assert 'CASE WHEN %s THEN (SELECT phone FROM clients WHERE id = %s) ELSE %s END' in sql
+        assert params[4:10] == (True, 7, None, True, 7, None)
+        assert params[14] == 80.0
+
+
+class TestAddBookingsBulk:
+    def test_one_statement_for_all_rows(self, db):
+        db.cursor.connection.encoding = 'UTF8'
+        db.cursor.mogrify.side_effect = lambda template, args: repr(args).encode()
+        db.cursor.fetchall.return_value = [{'id': 41, 'calendar_event_id': 'evt-1'}]
+
+        inserted = db.add_bookings_bulk([
+            {'client_id': 7, 'calendar_event_id': 'evt-1', 'appointment_time': '2030-03-14 10:00:00'},
+            {'client_id': 7, 'calendar_event_id': 'evt-2', 'appointment_time': '2030-03-15 10:00:00',
+             'duration_minutes': 60},
+        ], company_id=5)
+
+        assert inserted == {'evt-1': 41}
+        assert db.cursor.execute.call_count == 1
+        sql = db.cursor.execute.call_args.args[0].decode()
+        assert 'ON CONFLICT (calendar_event_id) DO NOTHING' in sql
+        assert 'UPDATE clients' not in sql
+        template = ' '.join(db.cursor.mogrify.call_args.args[0].split())
+        assert 'CASE WHEN %s THEN (SELECT phone FROM clients WHERE id = %s) ELSE %s END' in template
+        rows = [call.args[1] for call in db.cursor.mogrify.call_args_list]
+        assert rows[0][4:10] == (True, 7, None, True, 7, None)
+        assert rows[0][-2:] == (1440, 5)
+        assert rows[1][-2:] == (60, 5)
+        db.conn.commit.assert_called_once()
+
+    def test_failed_batch_retried_row_by_row(self, db):
+        db.cursor.connection.encoding = 'UTF8'
+        db.cursor.mogrify.side_effect = lambda template, args: repr(args).encode()
+        db.cursor.execute.side_effect = [RuntimeError('invalid input syntax for type timestamp'),
+                                         None, RuntimeError('invalid input syntax for type timestamp')]
+        db.cursor.fetchall.return_value = [{'id': 41, 'calendar_event_id': 'evt-1'}]
+
+        inserted = db.add_bookings_bulk([
+            {'client_id': 7, 'calendar_event_id': 'evt-1', 'appointment_time': '2030-03-14 10:00:00',
+             'phone_number': '0851234567'},
+            {'client_id': 8, 'calendar_event_id': 'evt-2', 'appointment_time': 'not a time'},
+        ], company_id=5)
+
+        assert inserted == {'evt-1': 41, 'evt-2': None}
+        assert db.cursor.execute.call_count == 3
+        assert db.conn.rollback.call_count == 2
+        db.conn.commit.assert_called_once()
+        rows = [call.args[1] for call in db.cursor.mogrify.call_args_list]
+        assert rows[0][4:10] == (False, 7, '0851234567', False, 7, None)
+
+    def test_empty(self, db):
+        assert db.add_bookings_bulk([]) == {}
+        db.get_connection.assert_not_called()
+
+
+class TestAddClientsBulk:
+    def test_one_statement_for_all_rows(self, db):
+        db.cursor.connection.encoding = 'UTF8'
+        db.cursor.mogrify.side_effect = lambda template, args: repr(args).encode()
+        db.cursor.fetchall.return_value = [{'id': 11}, {'id': 12}]
+
+        ids = db.add_clients_bulk([
+            {'name': 'Mary Byrne', 'phone': '+353851234567'},
+            {'name': 'Tom Walsh', 'email': 'tom@example.com', 'address': '1 Main St'},
+        ], company_id=5)
+
+        assert ids == [11, 12]
+        assert db.cursor.execute.call_count == 1
+        sql = db.cursor.execute.call_args.args[0].decode()
+        assert "ON CONFLICT (company_id, name, COALESCE(phone, ''), COALESCE(email, '')) DO NOTHING" in sql
+        rows = [call.args[1] for call in db.cursor.mogrify.call_args_list]
+        assert rows[0] == ('Mary Byrne', '+353851234567', None, None, None, None, None, 5)
+        assert rows[1][-3:] == ('1 Main St', None, 5)
+        db.conn.commit.assert_called_once()
+
+    def test_empty(self, db):
+        assert db.add_clients_bulk([]) == []
+        db.get_connection.assert_not_called()
+
+
+class TestCountClientBookings:
+    def test_count_scoped_to_company(self, db):
+        db.cursor.fetchone.return_value = (3,)
+        assert db.count_client_bookings(7, company_id=5) == 3
+        sql, params = executed(db.cursor)
+        assert sql == "SELECT COUNT(*) FROM bookings WHERE client_id = %s AND company_id = %s"
+        assert params == (7, 5)
+        db.return_connection.assert_called_once_with(db.conn)
+
+
+class TestGetClientWithHistory:
+    def test_client_and_bookings_on_one_connection(self, db):
+        db.cursor.fetchone.return_value = {'id': 7, 'name': 'Mary Byrne'}
+        db.cursor.fetchall.return_value = [joined_row(2, 20, 'note'), joined_row(1)]
+
+        client = db.get_client_with_history(7, company_id=5)
+
+        assert client['name'] == 'Mary Byrne'
+        assert [b['id'] for b in client['bookings']] == [2, 1]
+        assert db.get_connection.call_count == 1
+        assert db.cursor.execute.call_count == 2
+        sql, params = executed(db.cursor)
+        assert 'LEFT JOIN appointment_notes an ON an.booking_id = b.id' in sql
+        assert 'AND b.company_id = %s' in sql
+        assert 'ORDER BY b.appointment_time ASC' in sql
+        assert params == (7, 5)
+
+    def test_lookups_use_autocommit_connection(self, db):
+        db.get_client(7)
+        db.get_client_bookings(7)
+        assert db.get_connection.call_args_list[-2:] == [((), {'autocommit': True})] * 2
+
+    def test_missing_client(self, db):
+        assert db.get_client_with_history(7, company_id=5) is None
+        assert db.cursor.execute.call_count == 1
+        db.return_connection.assert_called_once_with(db.conn)
+
+
+class TestAddClient:
+    def test_duplicate_returns_existing_id_in_one_statement(self, db):
+        db.cursor.fetchone.return_value = {'id': 4}
+
+        client_id = db.add_client('Mary Byrne', phone='0851234567', company_id=5)
+
+        assert client_id == 4
+        assert db.cursor.execute.call_count == 1
+        sql, params = executed(db.cursor)
+        assert ("ON CONFLICT (company_id, name, COALESCE(phone, ''), COALESCE(email, '')) "
+                "DO UPDATE SET updated_at = CURRENT_TIMESTAMP") in sql
+        assert sql.endswith('RETURNING id')
+        assert params[:3] == ('Mary Byrne', '0851234567', None)
+        db.conn.commit.assert_called_once()
+
+    def test_error_rolls_back(self, db):
+        db.cursor.execute.side_effect = RuntimeError('connection lost')
+
+        assert db.add_client('Mary Byrne', phone='0851234567', company_id=5) is None
+        db.conn.rollback.assert_called_once()
+
+
+class TestAssignPhoneNumber:
+    def test_claim_and_assign_in_one_statement(self, db):
+        db.cursor.fetchone.return_value = ('+35312345678',)
+        db.cursor.rowcount = 1
+
+        assert db.assign_phone_number(5) == '+35312345678'
+
+        statements = [' '.join(c.args[0].split()) for c in db.cursor.execute.call_args_list]
+        assert len(statements) == 2
+        assert statements[0].startswith('UPDATE twilio_phone_numbers')
+        assert 'FOR UPDATE SKIP LOCKED ) RETURNING phone_number' in statements[0]
+        assert db.cursor.execute.call_args_list[0].args[1] == (5, None, None)
+        assert statements[1].startswith('UPDATE companies')
+        db.conn.commit.assert_called_once()
+
+    def test_specific_number_taken(self, db):
+        with pytest.raises(Exception, match='not available'):
+            db.assign_phone_number(5, '+35312345678')
+        db.conn.commit.assert_not_called()
+
+
+class TestFindOrCreateClient:
+    def test_conflict_fallback_treats_null_contact_as_empty(self, db):
+        db.cursor.fetchone.return_value = {'id': 6}
+
+        assert db.find_or_create_client('Mary Byrne', email='mary@example.com', company_id=5) == 6
+
+        sql, params = executed(db.cursor)
+        assert "AND COALESCE(phone, '') = COALESCE(%s, '') AND COALESCE(email, '') = COALESCE(%s, '')" in sql
+        assert params[-4:] == (5, 'Mary Byrne', None, 'mary@example.com')
+
+    def test_conflict_without_matching_row_raises(self, db):
+        with pytest.raises(Exception, match='no matching row'):
+            db.find_or_create_client('Mary Byrne', email='mary@example.com', company_id=5)
+        db.conn.rollback.assert_called_once()
+
+    def test_existing_phone_match(self, db):
+        db.cursor.fetchall.return_value = [
+            {'id': 3, 'name': 'Mary Byrne', 'phone': '085 123 4567', 'email': 'mary@example.com', 'date_of_birth': None},
+        ]
+
+        client_id = db.find_or_create_client('Christie', phone='085-123-4567', company_id=5)
+
+        assert client_id == 3
+        statements = [' '.join(c.args[0].split()) for c in db.cursor.execute.call_args_list]
+        assert statements[0].startswith('SELECT pg_advisory_xact_lock(')
+        assert 'phone = ANY(%s)' in statements[1]
+        assert statements[2] == 'SELECT id, name, phone, email, date_of_birth FROM clients WHERE company_id = %s'
+        assert len(statements) == 3
+        db.conn.commit.assert_called_once()
+
+    def test_exact_phone_match_skips_scan(self, db):
+        db.cursor.fetchone.return_value = {'id': 3, 'name': 'Mary Byrne', 'email': 'mary@example.com'}
+
+        client_id = db.find_or_create_client('Christie', phone='085-123-4567', company_id=5)
+
+        assert client_id == 3
+        sql, params = executed(db.cursor)
+        assert sql == 'SELECT id, name, email FROM clients WHERE company_id = %s AND phone = ANY(%s) ORDER BY id LIMIT 1'
+        assert params[0] == 5 and '+353851234567' in params[1]
+        db.cursor.fetchall.assert_not_called()
+
+    def test_miss_inserts_in_same_transaction(self, db):
+        db.cursor.fetchone.side_effect = [None, {'id': 9}]  # phone lookup, insert
+
+        client_id = db.find_or_create_client("John O'Brien", phone='0851234567', company_id=5)
+
+        assert client_id == 9
+        sql, params = executed(db.cursor)
+        assert 'INSERT INTO clients (name, phone, email, date_of_birth, first_visit, company_id)' in sql
+        assert 'ON CONFLICT DO NOTHING' in sql
+        assert params[:3] == ("John O'Brien", '0851234567', None)
+        assert db.get_connection.call_count == 1
+        assert db.cursor.execute.call_count == 4  # lock, phone lookup, scan, insert
+        db.conn.commit.assert_called_once()
+
+
+class TestUpdateWhitelists:
+    def test_update_client_ignores_unknown_fields(self, db):
+        db.update_client(7, name='Mary Burke', total_appointments=99, **{'id = 1; --': 'x'})
+        sql, params = executed(db.cursor)
+        assert sql == 'UPDATE clients SET name = %s, updated_at = %s WHERE id = %s'
+        assert params[0] == 'Mary Burke' and params[-1] == 7
+
+    def test_update_booking_maps_and_filters_fields(self, db):
+        db.update_booking(42, estimated_charge=120, phone='0851234567', client_id=3)
+        sql, params = executed(db.cursor)
+        assert sql == 'UPDATE bookings SET charge = %s, phone_number = %s, updated_at = CURRENT_TIMESTAMP WHERE id = %s'
+        assert params == (120, '0851234567', 42)
+
+
+class TestClientCache:
+    def test_repeat_lookup_skips_database(self, db):
+        db.cursor.fetchone.return_value = {'id': 7, 'company_id': 5, 'name': 'Mary Byrne', 'phone': '0851234567', 'email': None}
+
+        first = db.get_client(7, company_id=5)
+        first['name'] = 'changed by caller'
+        second = db.get_client(7, company_id=5)
+
+        assert second['name'] == 'Mary Byrne'
+        assert db.cursor.execute.call_count == 2  # client + notes, once
+        assert db.get_client(7, company_id=6) is None
+
+    def test_write_invalidates(self, db):
+        db.cursor.fetchone.return_value = {'id': 7, 'company_id': 5, 'name': 'Mary Byrne', 'phone': '0851234567', 'email': None}
+        db.get_client(7)
+        db.find_client_by_phone('0851234567', company_id=5)
+
+        db.update_client(7, name='Mary Burke')
+        db.cursor.execute.reset_mock()
+        db.get_client(7)
+        db.find_client_by_phone('0851234567', company_id=5)
+
+        assert db.cursor.execute.call_count == 3
+
+    def test_misses_not_cached(self, db):
+        assert db.get_client(7) is None
+        assert db.get_client(7) is None
+        assert db.cursor.execute.call_count == 2
+
+
+class TestEmployeeCache:
+    def test_repeat_lookup_skips_database(self, db):
+        db.cursor.fetchone.return_value = {'id': 3, 'company_id': 5, 'name': 'Sean'}
+
+        first = db.get_employee(3, company_id=5)
+        first['name'] = 'changed by caller'
+
+        assert db.get_employee(3, company_id=5)['name'] == 'Sean'
+        assert db.get_employee(3, company_id=6) is None
+        assert db.cursor.execute.call_count == 1
+
+    def test_update_and_delete_invalidate(self, db):
+        db.cursor.fetchone.return_value = {'id': 3, 'company_id': 5, 'name': 'Sean', 'count': 0}
+        db.cursor.rowcount = 1
+        db.get_employee(3)
+        db.update_employee(3, name='Seán')
+        db.get_employee(3)
+        db.delete_employee(3)
+        db.cursor.execute.reset_mock()
+
+        db.get_employee(3)
+
+        assert db.cursor.execute.call_count == 1
+
+
+class TestGetAllClients:
+    def test_projects_list_columns(self, db):
+        db.cursor.fetchall.return_value = [{'id': 1, 'name': 'Mary Byrne', 'phone': '0851234567'}]
+
+        clients = db.get_all_clients(company_id=5)
+
+        sql, params = executed(db.cursor)
+        assert sql.startswith('SELECT id, name, phone, email, first_visit, last_visit, total_appointments, ')
+        assert sql.endswith('FROM clients WHERE company_id = %s ORDER BY created_at DESC')
+        assert params == (5,)
+        assert clients == [{'id': 1, 'name': 'Mary Byrne', 'phone': '0851234567'}]
+        db.get_connection.assert_called_once_with(autocommit=True)
+
+
+class TestNotes:
+    def test_add_note_commits_and_invalidates_client(self, db):
+        db.cursor.fetchone.return_value = {'id': 31}
+        db.invalidate_client_cache = MagicMock()
+
+        assert db.add_note(7, 'Prefers mornings') == 31
+
+        db.conn.commit.assert_called_once()
+        db.return_connection.assert_called_once_with(db.conn)
+        db.invalidate_client_cache.assert_called_once_with(7)
+
+    def test_add_appointment_note_error_returns_none(self, db):
+        db.cursor.execute.side_effect = RuntimeError('connection lost')
+
+        assert db.add_appointment_note(42, 'Gate code 1234') is None
+
+        db.conn.rollback.assert_called_once()
+        db.return_connection.assert_called_once_with(db.conn)
+
+
+class TestGetBookingsNearTime:
+    def test_window_around_time(self, db):
+        from datetime import datetime
+        appt = datetime(2030, 3, 14, 10, 0)
+        db.cursor.fetchall.return_value = [{
+            'id': 42, 'client_id': 7, 'calendar_event_id': None, 'appointment_time': appt,
+            'service_type': 'Repair', 'status': None, 'client_name': 'Mary Byrne',
+        }]
+
+        result = db.get_bookings_near_time(appt, company_id=5, tolerance_minutes=5)
+
+        assert result[0]['appointment_time'] == '2030-03-14T10:00:00'
+        sql, params = executed(db.cursor)
+        assert 'b.appointment_time > %s AND b.appointment_time < %s' in sql
+        assert "COALESCE(b.status, '') NOT IN ('cancelled', 'completed')" in sql
+        assert params == [datetime(2030, 3, 14, 9, 55), datetime(2030, 3, 14, 10, 5), 5]
+        db.get_connection.assert_called_once_with(autocommit=True)
+
+
+class TestConnectionReuse:
+    @pytest.fixture
+    def pooled(self):
+        wrapper = object.__new__(PostgreSQLDatabaseWrapper)
+        wrapper._idle_since = {}
+        wrapper.connection_pool = MagicMock()
+        wrapper.conn = MagicMock(closed=0)
+        wrapper.connection_pool.getconn.return_value = wrapper.conn
+        return wrapper
+
+    def test_pool_connections_start_with_session_options(self, monkeypatch):
+        from src.services import db_postgres_wrapper
+        pool_cls = MagicMock()
+        monkeypatch.setattr(db_postgres_wrapper.psycopg2_pool, 'ThreadedConnectionPool', pool_cls)
+        monkeypatch.setattr(PostgreSQLDatabaseWrapper, 'init_database', lambda self: None)
+
+        PostgreSQLDatabaseWrapper('postgresql://localhost/test')
+
+        options = pool_cls.call_args.kwargs['options']
+        assert '-c lock_timeout=5s' in options
+        assert '-c idle_in_transaction_session_timeout=60s' in options
+        assert '-c jit=off' in options
+
+    def test_pool_bounds_from_settings(self, monkeypatch):
+        from src.services import db_postgres_wrapper
+        pool_cls = MagicMock()
+        monkeypatch.setattr(db_postgres_wrapper.psycopg2_pool, 'ThreadedConnectionPool', pool_cls)
+        monkeypatch.setattr(db_postgres_wrapper, 'DB_POOL_MAX', 25)
+        monkeypatch.setattr(PostgreSQLDatabaseWrapper, 'init_database', lambda self: None)
+
+        PostgreSQLDatabaseWrapper('postgresql://localhost/test')
+
+        assert pool_cls.call_args.kwargs['minconn'] == 2
+        assert pool_cls.call_args.kwargs['maxconn'] == 25
+
+    def test_first_checkout_is_pinged(self, pooled):
+        assert pooled.get_connection() is pooled.conn
+        pooled.conn.cursor.return_value.execute.assert_called_once_with("SELECT 1")
+
+    def test_recently_returned_connection_skips_ping(self, pooled):
+        pooled.return_connection(pooled.conn)
+        assert pooled.get_connection() is pooled.conn
+        pooled.conn.cursor.assert_not_called()
+
+    def test_long_idle_connection_is_pinged(self, pooled):
+        pooled.return_connection(pooled.conn)
+        pooled._idle_since[id(pooled.conn)] -= pooled.PING_AFTER_IDLE_SECONDS + 1
+        pooled.get_connection()
+        pooled.conn.cursor.return_value.execute.assert_called_once_with("SELECT 1")
+
+    def test_closed_connection_is_pinged(self, pooled):
+        pooled.return_connection(pooled.conn)
+        pooled.conn.closed = 1
+        pooled.get_connection()
+        pooled.conn.cursor.assert_called()
+
+    def test_autocommit_read_reset_on_return(self, pooled):
+        pooled.conn.autocommit = False
+        assert pooled.get_connection(autocommit=True) is pooled.conn
+        assert pooled.conn.autocommit is True
+        pooled.return_connection(pooled.conn)
+        assert pooled.conn.autocommit is False
+        pooled.connection_pool.putconn.assert_called_once_with(pooled.conn)
+
+    def test_foreign_connection_closed_and_forgotten(self, pooled):
+        pooled.connection_pool.putconn.side_effect = KeyError
+        pooled.return_connection(pooled.conn)
+        pooled.conn.close.assert_called_once()
+        assert pooled._idle_since == {}
+
+    def test_connection_closed_by_full_pool_forgotten(self, pooled):
+        pooled.connection_pool.putconn.side_effect = lambda conn: setattr(conn, 'closed', 1)
+        pooled.return_connection(pooled.conn)
+        assert pooled._idle_since == {}
+
+    def test_close_tolerates_partly_built_wrapper(self):
+        wrapper = object.__new__(PostgreSQLDatabaseWrapper)
+        wrapper.close()
+
+        wrapper.connection_pool = MagicMock()
+        wrapper.close()
+        wrapper.connection_pool.closeall.assert_called_once()
+
+    def test_acquire_returns_connection_when_block_raises(self, pooled):
+        with pytest.raises(RuntimeError):
+            with pooled.acquire(autocommit=True) as conn:
+                assert conn is pooled.conn and conn.autocommit is True
+                raise RuntimeError
+        pooled.connection_pool.putconn.assert_called_once_with(pooled.conn)
+        assert pooled.conn.autocommit is False
+
+    def test_acquire_write_rolls_back_on_error(self, pooled):
+        with pytest.raises(RuntimeError):
+            with pooled.acquire_write():
+                raise RuntimeError
+        pooled.conn.rollback.assert_called_once()
+        pooled.conn.commit.assert_not_called()
+        pooled.connection_pool.putconn.assert_called_once_with(pooled.conn)
+
+
+
+class TestRowDicts:
+    def test_list_getter_returns_row_dicts(self, db):
+        db.cursor.fetchall.return_value = [{'id': 1, 'note': 'a'}, {'id': 2, 'note': 'b'}]
+        notes = db.get_client_notes(7)
+
+        sql, params = executed(db.cursor)
+        assert sql.startswith("SELECT * FROM notes WHERE client_id = %s")
+        assert params == (7,)
+        assert notes == [{'id': 1, 'note': 'a'}, {'id': 2, 'note': 'b'}]
+        db.get_connection.assert_called_once_with(autocommit=True)
+        db.return_connection.assert_called_once_with(db.conn)
+
+    def test_single_row_getter_returns_dict_or_none(self, db):
+        assert db.get_employee_account_by_email('a@b.c') is None
+        db.cursor.fetchone.return_value = {'id': 3, 'email': 'a@b.c'}
+        assert db.get_employee_account_by_email('a@b.c') == {'id': 3, 'email': 'a@b.c'}
+        assert executed(db.cursor) == ("SELECT * FROM employee_accounts WHERE email = %s", ('a@b.c',))
+
+
+class TestEmployeeQueries:
+    def test_reads_use_autocommit_connection(self, db):
+        db.get_employee(3, company_id=5)
+        db.get_job_employees(9, company_id=5)
+        db.get_employee_jobs(3, company_id=5)
+        db.get_employee_schedule(3, '2030-03-01', '2030-03-31')
+        assert db.get_connection.call_args_list == [((), {'autocommit': True})] * 4
+        assert db.return_connection.call_count == 4
+
+    def test_job_employees_bulk_groups_by_booking(self, db):
+        db.cursor.fetchall.return_value = [
+            {'booking_id': 9, 'id': 3, 'name': 'Sean'},
+            {'booking_id': 9, 'id': 4, 'name': 'Aoife'},
+        ]
+
+        result = db.get_job_employees_bulk([9, 10, 9, None], company_id=5)
+
+        assert result == {9: [{'id': 3, 'name': 'Sean'}, {'id': 4, 'name': 'Aoife'}], 10: []}
+        assert db.cursor.execute.call_count == 1
+        sql, params = executed(db.cursor)
+        assert 'wa.booking_id = ANY(%s) AND b.company_id = %s' in sql
+        assert sorted(params[0]) == [9, 10] and params[1] == 5
+
+    def test_schedule_rows_read_off_cursor(self, db):
+        from datetime import datetime
+        db.cursor.fetchall.return_value = [{'id': 8, 'appointment_time': datetime(2030, 3, 14, 10, 0)}]
+
+        assert db.get_employee_schedule(3) == [{'id': 8, 'appointment_time': '2030-03-14T10:00:00'}]
+        db.cursor.__iter__.assert_called_once()
+
+    def test_schedule_range_half_open(self, db):
+        from datetime import datetime, date
+        db.get_employee_schedule(3, start_date='2030-03-01', end_date=date(2030, 3, 31))
+
+        sql, params = executed(db.cursor)
+        assert 'AND b.appointment_time >= %s AND b.appointment_time < %s' in sql
+        assert params == (3, datetime(2030, 3, 1), datetime(2030, 4, 1))
+
+        db.get_employee_schedule(3, end_date='2030-03-31T12:00:00Z')
+        assert executed(db.cursor)[1] == (3, datetime(2030, 3, 31, 12, 0))
+
+    def test_job_employees_bulk_empty(self, db):
+        assert db.get_job_employees_bulk([]) == {}
+        db.get_connection.assert_not_called()
+
+    def test_get_employee_names_its_columns(self, db):
+        db.cursor.fetchone.return_value = {'id': 3, 'name': 'Sean', 'work_schedule': None}
+
+        assert db.get_employee(3, company_id=5) == {'id': 3, 'name': 'Sean', 'work_schedule': None}
+        sql, params = executed(db.cursor)
+        assert sql.startswith('SELECT id, company_id, name,') and 'work_schedule' in sql
+        assert 'SELECT *' not in sql
+        assert params == (3, 5)
+
+    def test_replica_reads_opt_in(self, db):
+        db.read_pool = MagicMock()
+        replica = db.read_pool.getconn.return_value
+        replica.closed = 0
+        replica.autocommit = False
+        replica.cursor.return_value = db.cursor
+
+        db.get_employee_jobs(3, company_id=5)
+        db.get_connection.assert_called_once_with(autocommit=True)
+
+        db.get_employee_jobs(3, company_id=5, use_replica=True)
+        assert db.get_connection.call_count == 1
+        assert replica.autocommit is True
+        assert db.cursor.execute.call_args_list[-2].args == ("SELECT 1",)
+        db.read_pool.putconn.assert_called_once_with(replica, close=False)
+
+    def test_replica_pool_exhausted_falls_back_to_primary(self, db):
+        from psycopg2 import pool as psycopg2_pool
+        db.read_pool = MagicMock()
+        db.read_pool.getconn.side_effect = psycopg2_pool.PoolError('exhausted')
+
+        db.get_employee_schedule(3, use_replica=True)
+
+        db.get_connection.assert_called_once_with(autocommit=True)
+        db.read_pool.putconn.assert_not_called()
+
+    def test_unreachable_replica_falls_back_to_primary(self, db):
+        import psycopg2
+        db.read_pool = MagicMock()
+        db.read_pool.getconn.side_effect = psycopg2.OperationalError('could not connect to server')
+
+        db.get_employee_jobs(3, company_id=5, use_replica=True)
+
+        db.get_connection.assert_called_once_with(autocommit=True)
+        db.read_pool.putconn.assert_not_called()
+
+    def test_replica_pool_uses_primary_connect_options(self, monkeypatch):
+        from unittest.mock import patch
+        monkeypatch.setenv('DATABASE_READ_URL', 'postgresql://replica/app')
+        with patch('src.services.db_postgres_wrapper.psycopg2_pool.ThreadedConnectionPool') as pool, \
+                patch.object(PostgreSQLDatabaseWrapper, 'init_database'):
+            PostgreSQLDatabaseWrapper('postgresql://primary/app')
+
+        primary_dsn, replica_dsn = (c.kwargs['dsn'] for c in pool.call_args_list)
+        assert replica_dsn.startswith('postgresql://replica/app?')
+        assert replica_dsn.split('?')[1] == primary_dsn.split('?')[1]
+        assert 'keepalives=1' in replica_dsn
+
+    def test_dead_replica_connection_dropped_and_primary_used(self, db):
+        import psycopg2
+        db.read_pool = MagicMock()
+        replica = db.read_pool.getconn.return_value
+        replica.autocommit = True
+        replica.cursor.return_value.execute.side_effect = psycopg2.OperationalError('server closed the connection')
+
+        db.get_employee_jobs(3, company_id=5, use_replica=True)
+
+        db.read_pool.putconn.assert_called_once_with(replica, close=True)
+        db.get_connection.assert_called_once_with(autocommit=True)
+
+    def test_assign_commits_on_pooled_connection(self, db):
+        from datetime import datetime
+        db.cursor.fetchone.return_value = {'id': 12, 'assigned_at': datetime(2030, 3, 14, 10, 0)}
+        result = db.assign_employee_to_job(9, 3)
+        assert result['assignment_id'] == 12
+        assert result['assigned_at'] == '2030-03-14T10:00:00'
+        assert 'RETURNING id, assigned_at' in executed(db.cursor)[0]
+        db.get_connection.assert_called_once_with(autocommit=False)
+        db.conn.commit.assert_called_once()
+        db.return_connection.assert_called_once_with(db.conn)
+
+    def test_assign_duplicate_reported_without_error(self, db):
+        result = db.assign_employee_to_job(9, 3)
+        assert result == {"success": False, "error": "Employee is already assigned to this job"}
+        assert 'ON CONFLICT (booking_id, employee_id) DO NOTHING' in executed(db.cursor)[0]
+        db.conn.rollback.assert_not_called()
+
+    def test_bulk_assign_one_statement_one_commit(self, db):
+        db.cursor.connection.encoding = 'UTF8'
+        db.cursor.mogrify.side_effect = lambda template, args: repr(args).encode()
+        db.cursor.fetchall.return_value = [{'booking_id': 9, 'employee_id': 3}]
+
+        result = db.assign_employees_bulk([(9, 3), (9, '4'), (9, 3)])
+
+        assert result == {'success': True, 'assigned': [(9, 3)]}
+        assert db.cursor.execute.call_count == 1
+        sql = db.cursor.execute.call_args.args[0].decode()
+        assert 'ON CONFLICT (booking_id, employee_id) DO NOTHING' in sql
+        assert [c.args[1] for c in db.cursor.mogrify.call_args_list] == [(9, 3), (9, 4)]
+        db.conn.commit.assert_called_once()
+
+    def test_bulk_assign_empty(self, db):
+        assert db.assign_employees_bulk([]) == {'success': True, 'assigned': []}
+        db.get_connection.assert_not_called()
+
+    def test_failed_write_rolled_back(self, db):
+        db.cursor.execute.side_effect = RuntimeError('deadlock detected')
+        assert db.remove_employee_from_job(9, 3) is False
+        assert db.delete_employee(3, company_id=5)['success'] is False
+        assert db.conn.rollback.call_count == 2
+        db.conn.commit.assert_not_called()
+        assert db.return_connection.call_count == 2
+
+    def test_update_without_known_fields_skips_database(self, db):
+        db.update_employee(3, shoe_size=9)
+        db.get_connection.assert_not_called()
+
+    def test_update_sql_stable_across_argument_order(self, db):
+        db.update_employee(3, status='active', specialty='Plumber', shoe_size=9)
+        first_sql, params = executed(db.cursor)
+        db.update_employee(4, specialty='Electrician', status='inactive')
+        second_sql, _ = executed(db.cursor)
+
+        assert first_sql == second_sql == \
+            'UPDATE employees SET trade_specialty = %s, status = %s, updated_at = CURRENT_TIMESTAMP WHERE id = %s'
+        assert params == ('Plumber', 'active', 3)
+
+    def test_availability_window_pushed_into_query(self, db):
+        from datetime import datetime
+        db.cursor.fetchall.return_value = [{
+            'id': 8, 'appointment_time': datetime(2030, 3, 14, 10, 0), 'duration_minutes': 120,
+            'service_type': 'Repair', 'client_name': 'Mary Byrne', 'address': '',
+        }]
+
+        result = db.check_employee_availability(3, datetime(2030, 3, 14, 11, 0), duration_minutes=60)
+
+        assert result['available'] is False
+        assert [c['booking_id'] for c in result['conflicts']] == [8]
+        sql, params = executed(db.cursor)
+        assert 'AND b.appointment_time < %s' in sql
+        assert params[:2] == (3, datetime(2030, 3, 14, 12, 0))
+
+
+class TestCallLogAsyncCommit:
+    def test_create_call_log_skips_wal_flush_wait(self, db):
+        db.cursor.fetchone.return_value = (11,)
+        assert db.create_call_log(company_id=5, phone_number='0851234567') == 11
+        first_sql = db.cursor.execute.call_args_list[0].args[0]
+        assert first_sql == "SET LOCAL synchronous_commit = off"
+        sql, params = executed(db.cursor)
+        assert sql.startswith('INSERT INTO call_logs')
+        db.conn.commit.assert_called_once()
+
+    def test_update_call_log_skips_wal_flush_wait(self, db):
+        db.cursor.rowcount = 1
+        assert db.update_call_log(11, recording_url='https://example.com/r.mp3') is True
+        assert db.cursor.execute.call_args_list[0].args[0] == "SET LOCAL synchronous_commit = off"
+
+
+class TestSchemaVersion:
+    def test_applied_schema_skips_init(self, db):
+        db.cursor.fetchone.return_value = {'fingerprint': db._schema_fingerprint()}
+
+        db.init_database()
+
+        statements = [' '.join(c.args[0].split()) for c in db.cursor.execute.call_args_list]
+        assert len(statements) == 2
+        assert statements[1].endswith('SELECT fingerprint FROM schema_version WHERE id = 1')
+        db.conn.commit.assert_called_once()
+        db.return_connection.assert_called_once_with(db.conn)
+
+    def test_changed_schema_runs_and_records(self, db):
+        db.cursor.fetchone.return_value = {'fingerprint': 'old'}
+
+        db.init_database()
+
+        sql, params = executed(db.cursor)
+        assert sql.startswith('INSERT INTO schema_version')
+        assert params == (db._schema_fingerprint(),)
+        assert any('CREATE TABLE IF NOT EXISTS bookings' in c.args[0] for c in db.cursor.execute.call_args_list)
+
+    def test_failed_client_identity_index_keeps_old_target_and_retries(self, db):
+        db.cursor.fetchone.return_value = {'fingerprint': 'old'}
+
+        def execute(sql, params=None):
+            if 'CREATE UNIQUE INDEX IF NOT EXISTS idx_clients_identity' in sql:
+                raise RuntimeError('could not create unique index')
+        db.cursor.execute.side_effect = execute
+
+        db.init_database()
+
+        statements = [c.args[0] for c in db.cursor.execute.call_args_list]
+        assert 'ROLLBACK TO SAVEPOINT sp_client_identity' in statements
+        assert not any(sql.strip().startswith('INSERT INTO schema_version') for sql in statements)
+        db.conn.commit.assert_called_once()
+
+        db.cursor.execute.side_effect = None
+        db.cursor.fetchone.return_value = {'id': 4}
+        db.add_client('Mary Byrne', company_id=5)
+        sql, _ = executed(db.cursor)
+        assert 'ON CONFLICT (company_id, name, phone, email) DO UPDATE' in sql
+
+    def test_schema_applied_while_waiting_for_lock_skips_init(self, db):
+        db.cursor.fetchone.side_effect = [{'fingerprint': 'old'}, {'fingerprint': db._schema_fingerprint()}]
+
+        db.init_database()
+
+        statements = [' '.join(c.args[0].split()) for c in db.cursor.execute.call_args_list]
+        assert len(statements) == 3
+        assert "pg_advisory_xact_lock(hashtext('init_database'))" in statements[2]
+        db.conn.commit.assert_called_once()
+
+    def test_service_columns_added_in_one_alter(self, db):
+        db.cursor.fetchone.return_value = None
+
+        db.init_database()
+
+        statements = [' '.join(c.args[0].split()) for c in db.cursor.execute.call_args_list]
+        alters = [sql for sql in statements if sql.startswith('ALTER TABLE services ADD COLUMN IF NOT EXISTS')]
+        assert len(alters) == 1
+        assert alters[0].startswith('ALTER TABLE services ADD COLUMN IF NOT EXISTS package_only BOOLEAN DEFAULT FALSE, ')
+        assert 'ADD COLUMN IF NOT EXISTS follow_up_service_id TEXT DEFAULT NULL' in alters[0]
+
+    def test_partial_index_for_available_numbers(self, db):
+        db.cursor.fetchone.return_value = None
+
+        db.init_database()
+
+        statements = [' '.join(c.args[0].split()) for c in db.cursor.execute.call_args_list]
+        sql = next(sql for sql in statements if 'idx_twilio_phone_available' in sql)
+        assert "ON twilio_phone_numbers(created_at) WHERE status = 'available'" in sql
+        assert 'DROP INDEX IF EXISTS idx_twilio_phone_status' in sql
+
+    def test_client_identity_index_replaces_unique_constraint(self, db):
+        db.cursor.fetchone.return_value = None
+
+        db.init_database()
+
+        statements = [' '.join(c.args[0].split()) for c in db.cursor.execute.call_args_list]
+        create = next(sql for sql in statements if 'CREATE TABLE IF NOT EXISTS clients' in sql)
+        assert 'UNIQUE' not in create
+        i = next(i for i, sql in enumerate(statements) if 'idx_clients_identity' in sql)
+        assert statements[i - 1] == 'SAVEPOINT sp_client_identity'
+        assert "ON clients (company_id, name, COALESCE(phone, ''), COALESCE(email, ''))" in statements[i]
+        assert 'DROP CONSTRAINT IF EXISTS clients_company_id_name_phone_email_key' in statements[i]
+        assert statements[i + 1] == 'RELEASE SAVEPOINT sp_client_identity'
+
+    def test_composite_indexes_replace_single_column_ones(self, db):
+        db.cursor.fetchone.return_value = None
+
+        db.init_database()
+
+        statements = [c.args[0] for c in db.cursor.execute.call_args_list]
+        batch = next(sql for sql in statements if 'idx_bookings_appt_status' in sql)
+        assert 'ON bookings(appointment_time, status)' in batch
+        assert 'ON employee_assignments(employee_id, booking_id)' in batch
+        assert 'DROP INDEX IF EXISTS idx_bookings_appointment_time' in batch
+        assert 'ON bookings(client_id, appointment_time)' in batch
+        assert 'DROP INDEX IF EXISTS idx_bookings_client_id' in batch
+        assert 'DROP INDEX IF EXISTS idx_bookings_calendar_event_id' in batch
+        assert 'ANALYZE employee_assignments' in statements[-5]
+        assert statements[-4] == 'SAVEPOINT sp_autovacuum'
+        assert 'ALTER TABLE employee_assignments SET (autovacuum_analyze_scale_factor = 0.02' in \
+            ' '.join(statements[-3].split())
+
+
+class TestRunMigrations:
+    def test_columns_read_once(self, db):
+        existing = [('bookings', 'company_id'), ('clients', 'company_id'), ('companies', 'trial_end')]
+        db.cursor.fetchall.return_value = [{'table_name': t, 'column_name': c} for t, c in existing]
+
+        db._run_migrations(db.cursor)
+
+        statements = [' '.join(c.args[0].split()) for c in db.cursor.execute.call_args_list]
+        assert sum('information_schema.columns' in sql for sql in statements) == 1
+        assert 'WHERE table_schema = current_schema() AND table_name = ANY(%s)' in statements[0]
+        alters = [sql for sql in statements if sql.startswith('ALTER TABLE')]
+        assert 'ALTER TABLE notes ADD COLUMN company_id BIGINT REFERENCES companies(id) ON DELETE CASCADE' in alters
+        assert not any(sql.startswith(('ALTER TABLE clients ADD COLUMN company_id',
+                                       'ALTER TABLE bookings ADD COLUMN company_id',
+                                       'ALTER TABLE companies ADD COLUMN trial_end')) for sql in alters)
+        assert len(alters) == len(set(alters))
+
+    def test_booking_stats_created_once(self, db):
+        db._run_migrations(db.cursor)
+        statements = [' '.join(c.args[0].split()) for c in db.cursor.execute.call_args_list]
+        assert any(sql.startswith('CREATE TRIGGER trg_booking_stats_monthly') for sql in statements)
+        assert any(sql.startswith('INSERT INTO booking_stats_monthly') for sql in statements)
+
+        db.cursor.execute.reset_mock()
+        db.cursor.fetchall.return_value = [{'table_name': 'booking_stats_monthly', 'column_name': 'month'}]
+        db._run_migrations(db.cursor)
+        statements = [' '.join(c.args[0].split()) for c in db.cursor.execute.call_args_list]
+        assert not any('booking_stats_monthly' in sql for sql in statements[1:])
+
+    def test_client_booking_triggers_created_once(self, db):
+        db.cursor.fetchone.return_value = None
+        db._run_migrations(db.cursor)
+        statements = [' '.join(c.args[0].split()) for c in db.cursor.execute.call_args_list]
+        created = [sql for sql in statements if sql.startswith('CREATE TRIGGER trg_client_booking_stats')]
+        assert len(created) == 3
+        assert all('FOR EACH STATEMENT' in sql for sql in created)
+
+        db.cursor.execute.reset_mock()
+        db.cursor.fetchone.return_value = (1,)
+        db._run_migrations(db.cursor)
+        statements = [' '.join(c.args[0].split()) for c in db.cursor.execute.call_args_list]
+        assert not any('client_booking_stats_sync' in sql for sql in statements)
+
+
+class TestGetAllBookings:
+    def test_rows_map_onto_selected_columns(self, db):
+        from datetime import datetime
+        db.cursor.description = [('id',), ('appointment_time',), ('created_at',), ('phone',), ('service',)]
+        db.cursor.fetchall.return_value = [(1, datetime(2030, 3, 14, 10, 0), None, '0851234567', 'Repair')]
+
+        bookings = db.get_all_bookings(company_id=5, limit=10)
+
+        assert bookings == [{'id': 1, 'appointment_time': '2030-03-14T10:00:00', 'created_at': None,
+                             'phone': '0851234567', 'service': 'Repair'}]
+        sql, params = executed(db.cursor)
+        assert "COALESCE(NULLIF(b.phone_number, ''), c.phone) AS phone" in sql
+        assert 'b.service_type AS service' in sql
+        assert params == [5, 10, 0]
+        db.conn.cursor.assert_called_once_with()
+
+
+class TestGetFinancialStats:
+    def test_one_statement_demuxed_by_kind(self, db):
+        db.cursor.fetchall.return_value = [
+            {'kind': 'total', 'label': None, 'revenue': 450, 'appointments': 4},
+            {'kind': 'payment_status', 'label': 'paid', 'revenue': 300, 'appointments': 2},
+            {'kind': 'payment_status', 'label': None, 'revenue': 150, 'appointments': 2},
+            {'kind': 'month', 'label': '2030-02', 'revenue': 100, 'appointments': 1},
+            {'kind': 'month', 'label': '2030-03', 'revenue': 350, 'appointments': 3},
+            {'kind': 'payment_method', 'label': 'card', 'revenue': 300, 'appointments': 2},
+        ]
+
+        stats = db.get_financial_stats(company_id=5)
+
+        assert db.cursor.execute.call_count == 1
+        sql, params = executed(db.cursor)
+        assert 'FROM booking_stats_monthly WHERE company_id = %s' in sql
+        assert 'FROM bookings' not in sql
+        assert params == (5,)
+        assert stats == {
+            'total_revenue': 450.0,
+            'payment_breakdown': {'paid': 300.0, 'unpaid': 150.0},
+            'monthly_revenue': [
+                {'month': '2030-03', 'revenue': 350.0, 'appointments': 3},
+                {'month': '2030-02', 'revenue': 100.0, 'appointments': 1},
+            ],
+            'payment_methods': {'card': 300.0},
+        }
+
+
+class TestPreparedStatements:
+    def test_disabled_by_default(self, db):
+        db.get_booking(42)
+        sql, params = executed(db.cursor)
+        assert sql == 'SELECT * FROM bookings WHERE id = %s'
+        assert params == (42,)
+
+    def test_prepared_once_per_connection(self, db, monkeypatch):
+        from src.services import db_postgres_wrapper
+        monkeypatch.setattr(db_postgres_wrapper, 'USE_PREPARED_STATEMENTS', True)
+        db.cursor.connection.prepared_statements = set()
+
+        db.get_booking(42, company_id=5)
+        db.get_booking(43, company_id=5)
+
+        statements = [c.args for c in db.cursor.execute.call_args_list]
+        assert statements == [
+            ('PREPARE get_booking_for_company AS SELECT * FROM bookings WHERE id = $1 AND company_id = $2',),
+            ('EXECUTE get_booking_for_company (%s, %s)', (42, 5)),
+            ('EXECUTE get_booking_for_company (%s, %s)', (43, 5)),
+        ]
+
+    def test_employee_update_prepared_per_column_set(self, db, monkeypatch):
+        from src.services import db_postgres_wrapper
+        monkeypatch.setattr(db_postgres_wrapper, 'USE_PREPARED_STATEMENTS', True)
+        db.cursor.connection.prepared_statements = set()
+
+        db.update_employee(3, name='Sean')
+        db.update_employee(4, name='Aoife')
+
+        statements = [c.args[0] for c in db.cursor.execute.call_args_list]
+        assert statements == [
+            'PREPARE update_employee_1 AS UPDATE employees SET name = $1, updated_at = CURRENT_TIMESTAMP WHERE id = $2',
+            'EXECUTE update_employee_1 (%s, %s)',
+            'EXECUTE update_employee_1 (%s, %s)',
+        ]
+
+    def test_client_update_one_statement_per_column_set(self, db, monkeypatch):
+        from src.services import db_postgres_wrapper
+        monkeypatch.setattr(db_postgres_wrapper, 'USE_PREPARED_STATEMENTS', True)
+        db.cursor.connection.prepared_statements = set()
+
+        db.update_client(7, phone='0851234567', name='Mary Burke')
+        db.update_client(8, name='Sean Walsh', phone='0867654321')
+
+        calls = [c.args for c in db.cursor.execute.call_args_list]
+        assert [c[0] for c in calls] == [
+            'PREPARE update_client_96 AS UPDATE clients SET name = $1, phone = $2, updated_at = $3 WHERE id = $4',
+            'EXECUTE update_client_96 (%s, %s, %s, %s)',
+            'EXECUTE update_client_96 (%s, %s, %s, %s)',
+        ]
+        assert calls[2][1][:2] == ('Sean Walsh', '0867654321') and calls[2][1][-1] == 8
+
+    def test_booking_update_kwarg_order_shares_statement(self, db, monkeypatch):
+        from src.services import db_postgres_wrapper
+        monkeypatch.setattr(db_postgres_wrapper, 'USE_PREPARED_STATEMENTS', True)
+        db.cursor.connection.prepared_statements = set()
+
+        db.update_booking(42, status='completed', estimated_charge=120)
+        db.update_booking(43, charge=90, status='scheduled')
+
+        calls = [c.args for c in db.cursor.execute.call_args_list]
+        assert calls[0][0].endswith('AS UPDATE bookings SET charge = $1, status = $2, '
+                                    'updated_at = CURRENT_TIMESTAMP WHERE id = $3')
+        assert calls[1][0] == calls[2][0] == f'EXECUTE {calls[0][0].split()[1]} (%s, %s, %s)'
+        assert calls[1][1] == (120, 'completed', 42)
+        assert calls[2][1] == (90, 'scheduled', 43)
+
+    def test_company_lookups_prepared(self, db, monkeypatch):
+        from src.services import db_postgres_wrapper
+        monkeypatch.setattr(db_postgres_wrapper, 'USE_PREPARED_STATEMENTS', True)
+        db.cursor.connection.prepared_statements = set()
+        db.cursor.fetchone.return_value = {'id': 5, 'email': 'owner@example.com'}
+
+        assert db.get_company_by_email('owner@example.com') == {'id': 5, 'email': 'owner@example.com'}
+        db.get_company(5)
+
+        statements = [c.args[0] for c in db.cursor.execute.call_args_list]
+        assert statements == [
+            'PREPARE get_company_by_email AS SELECT * FROM companies WHERE email = $1',
+            'EXECUTE get_company_by_email (%s)',
+            'PREPARE get_company_by_id AS SELECT * FROM companies WHERE id = $1',
+            'EXECUTE get_company_by_id (%s)',
+        ]
+        db.get_connection.assert_called_with(autocommit=True)
+
+    def test_filter_variants_prepared_separately(self, db, monkeypatch):
+        from src.services import db_postgres_wrapper
+        monkeypatch.setattr(db_postgres_wrapper, 'USE_PREPARED_STATEMENTS', True)
+        db.cursor.connection.prepared_statements = set()
+
+        db.get_employee_schedule(3)
+        db.get_employee_schedule(3, start_date='2030-03-01')
+        db.get_employee_schedule(4, start_date='2030-04-01')
+
+        statements = [c.args[0].split(' AS ')[0] for c in db.cursor.execute.call_args_list]
+        assert statements == [
+            'PREPARE get_employee_schedule_00',
+            'EXECUTE get_employee_schedule_00 (%s)',
+            'PREPARE get_employee_schedule_10',
+            'EXECUTE get_employee_schedule_10 (%s, %s)',
+            'EXECUTE get_employee_schedule_10 (%s, %s)',
+        ]
+
+    def test_phone_lookup_one_statement_for_any_variant_count(self, db, monkeypatch):
+        from src.services import db_postgres_wrapper
+        monkeypatch.setattr(db_postgres_wrapper, 'USE_PREPARED_STATEMENTS', True)
+        db.cursor.connection.prepared_statements = set()
+
+        db.find_client_by_phone('0851234567', company_id=5)
+        db.find_client_by_phone('+44 20 7946 0958', company_id=5)
+
+        calls = [c.args for c in db.cursor.execute.call_args_list]
+        prepare = ' '.join(calls[0][0].split())
+        assert prepare.startswith('PREPARE find_client_by_phone_for_company AS SELECT id, company_id, name, phone, email, ')
+        assert 'FROM clients WHERE company_id = $1 AND phone = ANY($2)' in prepare
+        assert [c[0] for c in calls[1:]] == ['EXECUTE find_client_by_phone_for_company (%s, %s)'] * 2
+        assert '+353851234567' in calls[1][1][1]
+
+    def test_untracked_connection_falls_back(self, db, monkeypatch):
+        from src.services import db_postgres_wrapper
+        monkeypatch.setattr(db_postgres_wrapper, 'USE_PREPARED_STATEMENTS', True)
+        db.cursor.connection = object()
+
+        db.get_booking(42)
+
+        assert executed(db.cursor) == ('SELECT * FROM bookings WHERE id = %s', (42,))
@@ -50,6 +50,7 @@ def make_mock_db(existing_bookings=None, employees=None, company_id=1):
     db.add_booking.return_value = 100
     db.add_appointment_note.return_value = True
     db.assign_employee_to_job.return_value = {'success': True}
+    db.assign_employees_bulk.return_value = {'success': True, 'assigned': []}
     db.get_client.return_value = {'id': 1, 'name': 'Test Client', 'phone': '0851234567'}
     db.get_company.return_value = {
         'id': company_id, 'company_name': 'Test Co',
@@ -0,0 +1,101 @@
+"""
+Tests for the modify_job tool.
+
+The confirmation lookup returns the calendar event_id; passing it back on the
+follow-up call should resolve the booking directly rather than searching the
+calendar and scanning every booking a second time.
+"""
+import pytest
+import sys
+import os
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.services.calendar_tools import execute_tool_call, _booking_for_event_id
+
+APPT = datetime(2030, 3, 14, 10, 0)
+
+
+def make_booking(**overrides):
+    booking = {
+        'id': 42, 'client_id': 7, 'status': 'scheduled', 'calendar_event_id': 'gcal-abc',
+        'appointment_time': APPT.isoformat(), 'urgency': 'scheduled',
+        'service_type': 'Boiler service', 'address': '1 Main St',
+    }
+    booking.update(overrides)
+    return booking
+
+
+def make_services(booking=None):
+    db = Mock()
+    db.get_booking_by_calendar_event_id.return_value = booking
+    db.get_booking.return_value = booking
+    db.update_booking.return_value = True
+    calendar = Mock()
+    calendar.find_appointment_by_details.return_value = {'id': 'gcal-abc', 'summary': 'Boiler service - Mary Byrne'}
+    db.get_all_bookings.return_value = [dict(make_booking(), calendar_event_id='gcal-abc')]
+    return {'google_calendar': calendar, 'db': db, 'company_id': 1}
+
+
+class TestBookingForEventId:
+    def test_google_event_id(self):
+        db = make_services(make_booking())['db']
+        assert _booking_for_event_id(db, 'gcal-abc', APPT, company_id=1)['id'] == 42
+        db.get_booking.assert_not_called()
+
+    def test_database_calendar_uses_booking_id(self):
+        db = make_services(make_booking())['db']
+        db.get_booking_by_calendar_event_id.return_value = None
+        assert _booking_for_event_id(db, '42', APPT, company_id=1)['id'] == 42
+        db.get_booking.assert_called_once_with(42, company_id=1)
+
+    @pytest.mark.parametrize('overrides', [
+        {'status': 'cancelled'},
+        {'appointment_time': datetime(2030, 3, 14, 11, 0).isoformat()},
+    ])
+    def test_stale_event_id_rejected(self, overrides):
+        db = make_services(make_booking(**overrides))['db']
+        assert _booking_for_event_id(db, 'gcal-abc', APPT, company_id=1) is None
+
+
+class TestModifyJobEventIdReuse:
+    @pytest.fixture(autouse=True)
+    def _parse_datetime(self):
+        # parse_datetime goes through OpenAI first; pin it for these tests
+        with patch('src.services.calendar_tools.parse_datetime', return_value=APPT):
+            yield
+
+    def _modify(self, services, **extra):
+        args = {'appointment_datetime': APPT.isoformat(), 'customer_name': 'Mary Byrne', 'new_phone': '0871234567'}
+        args.update(extra)
+        return execute_tool_call('modify_job', args, services)
+
+    def test_confirmation_returns_event_id(self):
+        services = make_services(make_booking())
+        result = execute_tool_call('modify_job', {'appointment_datetime': APPT.isoformat()}, services)
+        assert result['requires_confirmation'] is True
+        assert result['event_id'] == 'gcal-abc'
+
+    def test_event_id_skips_calendar_search(self):
+        services = make_services(make_booking())
+        result = self._modify(services, event_id='gcal-abc')
+
+        assert result['success'] is True
+        services['google_calendar'].find_appointment_by_details.assert_not_called()
+        services['db'].get_all_bookings.assert_not_called()
+        services['db'].update_booking.assert_called_once_with(42, company_id=1, phone_number='0871234567')
+
+    def test_without_event_id_searches(self):
+        services = make_services(make_booking())
+        result = self._modify(services)
+
+        assert result['success'] is True
+        services['google_calendar'].find_appointment_by_details.assert_called_once()
+        services['db'].update_booking.assert_called_once_with(42, company_id=1, phone_number='0871234567')
+
+    def test_stale_event_id_falls_back_to_search(self):
+        services = make_services(make_booking(status='cancelled'))
+        self._modify(services, event_id='gcal-abc')
+        services['google_calendar'].find_appointment_by_details.assert_called_once()
@@ -123,6 +123,33 @@ class TestPackageOnlyFiltering:
         assert result['matched_name'] == 'Toilet Leak Repair'
 
 
+class TestSeasonalFiltering:
+    """match_issue drops seasonal services outside their active months"""
+
+    def _match(self, seasonal_months):
+        from unittest.mock import MagicMock, patch
+        from src.services.calendar_tools import execute_tool_call
+        svc = {'name': 'Gutter Cleaning', 'description': 'Clear blocked gutters and downpipes',
+               'duration_minutes': 60, 'price': 80, 'seasonal': True,
+               'seasonal_months': seasonal_months}
+        mgr = MagicMock()
+        mgr.get_services.return_value = [svc]
+        mgr.get_packages.return_value = []
+        with patch('src.services.settings_manager.get_settings_manager', return_value=mgr):
+            result = execute_tool_call('match_issue', {'issue_description': 'gutter cleaning'},
+                                       {'db': MagicMock(), 'company_id': 1})
+        return [m['name'] for m in result['matches']]
+
+    def test_out_of_season_json_months_excluded(self):
+        from datetime import datetime
+        other_month = (datetime.now().month) % 12  # 0-indexed next month
+        assert self._match(f'[{other_month}]') == []
+
+    def test_in_season_json_months_kept(self):
+        from datetime import datetime
+        assert self._match(f'[{datetime.now().month - 1}]') == ['Gutter Cleaning']
+
+
 # ============================================================
 # Confidence Tier Classification
 # ============================================================
@@ -0,0 +1,44 @@
+"""
+Tests for dumps_tool_result - the serializer for tool results sent back to
+the LLM as "tool" messages.
+"""
+import json
+import pytest
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services import llm_stream
+from src.services.llm_stream import dumps_tool_result
+
+
+RESULT = {
+    "success": True,
+    "message": "I have availability on Monday at 9 am – costs €120",
+    "available_slots": ["09:00 AM", "10:30 AM"],
+    "customer_info": {"id": 7, "name": "Mary Byrne", "email": None},
+    "charge": 120.5,
+}
+
+
+class TestDumpsToolResult:
+    def test_round_trips(self):
+        assert json.loads(dumps_tool_result(RESULT)) == RESULT
+
+    def test_returns_str(self):
+        assert isinstance(dumps_tool_result(RESULT), str)
+
+    def test_stdlib_fallback_when_orjson_missing(self):
+        with patch.object(llm_stream, 'ORJSON_AVAILABLE', False):
+            assert dumps_tool_result(RESULT) == json.dumps(RESULT)
+
+    def test_falls_back_for_values_orjson_rejects(self):
+        # orjson only handles 64-bit ints; json.dumps copes with anything
+        result = {"success": True, "big": 2 ** 70}
+        assert json.loads(dumps_tool_result(result)) == result
+
+    def test_unserializable_still_raises(self):
+        with pytest.raises(TypeError):
+            dumps_tool_result({"success": True, "obj": object()})
@@ -0,0 +1,61 @@
+"""
+Tests for the update_customer_info tool.
+
+When several customers share a name and the caller's phone doesn't match any
+of them, the tool must not guess which account to change - it returns the
+candidates so the customer can confirm, then takes the chosen customer_id.
+"""
+import sys
+import os
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.services.calendar_tools import execute_tool_call
+
+
+def client(client_id, name_match=True, phone_match=False, **fields):
+    row = {'id': client_id, 'name': 'Mary Byrne', 'address': f'{client_id} Main St',
+           'name_match': name_match, 'phone_match': phone_match}
+    row.update(fields)
+    return row
+
+
+def run(db, **arguments):
+    arguments = {'customer_name': 'Mary Byrne', 'new_email': 'mary@example.com', **arguments}
+    services = {'db': db, 'company_id': 1, 'call_state': SimpleNamespace(phone_number='0851234567')}
+    return execute_tool_call('update_customer_info', arguments, services)
+
+
+class TestUpdateCustomerInfo:
+    def test_single_name_match_updates(self):
+        db = Mock()
+        db.lookup_client.return_value = [client(3)]
+        result = run(db)
+        assert result['success'] is True
+        db.update_client.assert_called_once_with(3, email='mary@example.com')
+
+    def test_ambiguous_name_only_matches_not_updated(self):
+        db = Mock()
+        db.lookup_client.return_value = [client(3), client(4)]
+        result = run(db)
+        assert result['success'] is False
+        assert result['ambiguous'] is True
+        assert [m['id'] for m in result['matches']] == [3, 4]
+        db.update_client.assert_not_called()
+
+    def test_phone_match_resolves_shared_name(self):
+        db = Mock()
+        db.lookup_client.return_value = [client(4, phone_match=True), client(3)]
+        result = run(db)
+        assert result['success'] is True
+        db.update_client.assert_called_once_with(4, email='mary@example.com')
+
+    def test_customer_id_picks_match(self):
+        db = Mock()
+        db.lookup_client.return_value = [client(3), client(4)]
+        result = run(db, customer_id=4)
+        assert result['success'] is True
+        db.update_client.assert_called_once_with(4, email='mary@example.com')
+        assert db.lookup_client.call_args.kwargs['limit'] is None